@@ -0,0 +1,492 @@
+"""
+Benchmark das queries dos dashboards e teste de carga com sessões concorrentes.
+
+As queries são extraídas diretamente do código de streamlit/app.py e de
+streamlit/pages/Dashboard_*.py (atribuições a variáveis e chamadas de
+run_query/get_metric_value com SQL literal). Queries montadas com f-string
+são preenchidas com os valores de --parametros; os trechos de filtros
+globais (compilar_filtros) são renderizados sem filtros ativos, e as
+chamadas da camada semântica (consultar/valor) são compiladas com
+camada_semantica.compilar.
+
+Cada sessão simulada executa todas as queries de todas as páginas, na
+ordem em que aparecem, como faz um rerun do Streamlit. Por padrão cada
+query abre uma conexão nova (mesmo comportamento de db_utils.run_query);
+com --pool N as sessões compartilham um pool de N conexões.
+
+Relatório: latência p50/p95/p99 por query e por página, conexões abertas
+pelo benchmark e pico de conexões no servidor (pg_stat_activity).
+
+ATENÇÃO: --semear apaga e recria os dados do schema dw com dados
+sintéticos. Use um Postgres local.
+
+Uso:
+    python benchmark/benchmark_dashboards.py --semear --escala 5
+    python benchmark/benchmark_dashboards.py --concorrencia 20 --sessoes 100
+    python benchmark/benchmark_dashboards.py --concorrencia 20 --pool 5
+"""
+
+import argparse
+import ast
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import psycopg2.pool
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(RAIZ)
+from db.db_conexao import DB_CONFIG, obter_conexao, obter_cursor
+from populando_tabelas.dim_pesquisador import HASH_LINHA
+from populando_tabelas.particoes import TABELAS_PARTICIONADAS, criar_particoes
+from populando_tabelas.referencia import TIPOS_PRODUCAO
+
+PASTA_STREAMLIT = os.path.join(RAIZ, 'streamlit')
+sys.path.append(PASTA_STREAMLIT)
+from camada_semantica import compilar
+from filtros_globais import sql_filtros
+PASTA_RESULTADOS = os.path.join(os.path.dirname(__file__), 'resultados')
+
+# Valores usados para preencher as queries montadas com f-string
+PARAMETROS_PADRAO = {
+    'ano_ini': 2010,
+    'ano_fim': 2024,
+    'termo_busca': 'UFES',
+}
+
+FUNCOES_CONSULTA = {'run_query', 'get_metric_value'}
+FUNCOES_SEMANTICAS = {'consultar', 'valor'}
+
+
+def _parece_sql(texto):
+    return texto.lstrip().upper().startswith(('SELECT', 'WITH'))
+
+
+def _variaveis_filtros(arvore):
+    """
+    Trechos SQL dos filtros globais usados nas f-strings da página.
+
+    Para cada `filtro_sql, params = compilar_filtros(filtros, colunas)`,
+    devolve o SQL sem filtros ativos (o que a página executa quando o
+    usuário não escolheu nenhum filtro).
+    """
+    variaveis = {}
+    for no in ast.walk(arvore):
+        if (isinstance(no, ast.Assign) and len(no.targets) == 1
+                and isinstance(no.targets[0], ast.Tuple) and no.targets[0].elts
+                and isinstance(no.targets[0].elts[0], ast.Name)
+                and isinstance(no.value, ast.Call) and isinstance(no.value.func, ast.Name)
+                and no.value.func.id == 'compilar_filtros'):
+            variaveis[no.targets[0].elts[0].id] = sql_filtros(set(), {})
+    return variaveis
+
+
+def _compilar_semantica(no):
+    """SQL de uma chamada consultar(metricas, agrupar_por, ...) ou valor(metrica, ...)."""
+    argumentos = [ast.literal_eval(arg) for arg in no.args[:2 if no.func.id == 'consultar' else 1]]
+    if no.func.id == 'valor':
+        argumentos = [argumentos]
+    _, sql, _ = compilar(*argumentos)
+    return sql
+
+
+def _renderizar(no, parametros):
+    """Converte um nó de string (literal ou f-string) em SQL executável."""
+    if isinstance(no, ast.Constant) and isinstance(no.value, str):
+        return no.value
+    if isinstance(no, ast.JoinedStr):
+        partes = []
+        for valor in no.values:
+            if isinstance(valor, ast.Constant):
+                partes.append(valor.value)
+            else:
+                expressao = ast.Expression(valor.value)
+                codigo = compile(expressao, '<query>', 'eval')
+                partes.append(str(eval(codigo, {'int': int, 'str': str}, dict(parametros))))
+        return ''.join(partes)
+    return None
+
+
+def extrair_queries(caminho, parametros):
+    """
+    Extrai as queries SQL de um arquivo de página do Streamlit.
+
+    Args:
+        caminho (str): Arquivo .py da página
+        parametros (dict): Valores para as expressões das f-strings
+
+    Returns:
+        list: Lista de dicts {'nome', 'linha', 'sql'} na ordem do arquivo
+    """
+    with open(caminho, 'r', encoding='utf-8') as f:
+        arvore = ast.parse(f.read(), filename=caminho)
+
+    parametros = {**parametros, **_variaveis_filtros(arvore)}
+    queries = []
+    vistos = set()
+    for no in ast.walk(arvore):
+        candidatos = []
+        if (isinstance(no, ast.Call) and isinstance(no.func, ast.Name)
+                and no.func.id in FUNCOES_SEMANTICAS and no.args and no.lineno not in vistos):
+            try:
+                sql = _compilar_semantica(no)
+            except ValueError as e:
+                print(f"Ignorando {os.path.basename(caminho)}:{no.lineno} ({e})")
+                continue
+            vistos.add(no.lineno)
+            queries.append({'nome': f"{no.func.id}@{no.lineno}", 'linha': no.lineno, 'sql': sql})
+            continue
+        if isinstance(no, ast.Assign) and len(no.targets) == 1 and isinstance(no.targets[0], ast.Name):
+            candidatos.append((no.targets[0].id, no.value))
+        elif (isinstance(no, ast.Call) and isinstance(no.func, ast.Name)
+              and no.func.id in FUNCOES_CONSULTA and no.args):
+            candidatos.append((f"{no.func.id}@{no.lineno}", no.args[0]))
+
+        for nome, valor in candidatos:
+            try:
+                sql = _renderizar(valor, parametros)
+            except NameError as e:
+                print(f"Ignorando {os.path.basename(caminho)}:{valor.lineno} ({e})")
+                continue
+            if sql and _parece_sql(sql) and valor.lineno not in vistos:
+                vistos.add(valor.lineno)
+                if any(q['nome'] == nome for q in queries):
+                    nome = f"{nome}@{valor.lineno}"
+                queries.append({'nome': nome, 'linha': valor.lineno, 'sql': sql})
+
+    return sorted(queries, key=lambda q: q['linha'])
+
+
+def extrair_paginas(parametros):
+    """
+    Extrai as queries da home e dos dashboards.
+
+    Returns:
+        dict: {nome da página: [queries]}
+    """
+    arquivos = [os.path.join(PASTA_STREAMLIT, 'app.py')]
+    pasta_paginas = os.path.join(PASTA_STREAMLIT, 'pages')
+    arquivos += sorted(
+        os.path.join(pasta_paginas, f) for f in os.listdir(pasta_paginas)
+        if f.startswith('Dashboard_') and f.endswith('.py')
+    )
+    return {
+        os.path.splitext(os.path.basename(arquivo))[0]: extrair_queries(arquivo, parametros)
+        for arquivo in arquivos
+    }
+
+
+def semear(escala):
+    """
+    Apaga o schema dw e o preenche com dados sintéticos.
+
+    Args:
+        escala (int): Multiplicador do volume (escala 1 = 1.000 pesquisadores)
+    """
+    pesquisadores = 1000 * escala
+    comandos = [
+        """
+        TRUNCATE dw.fato_pesquisador_producoes, dw.fato_pesquisador_area_atuacao,
+                 dw.fato_pesquisador_linha_pesquisa, dw.fato_pesquisador_producao_localizacao,
+                 dw.dim_pesquisador, dw.dim_area, dw.dim_linha_pesquisa, dw.dim_tempo,
+                 dw.dim_tipo_producao, dw.dim_localizacao_trabalhos
+        RESTART IDENTITY CASCADE;
+        """,
+        "INSERT INTO dw.dim_tempo (id_tempo) SELECT generate_series(1950, 2025);",
+        "INSERT INTO dw.dim_tipo_producao (id_tipo_producao, tipo_producao) VALUES "
+        + ", ".join(f"({id_tipo}, '{tipo}')" for id_tipo, tipo, _ in TIPOS_PRODUCAO) + ";",
+        f"""
+        INSERT INTO dw.dim_pesquisador (id_lattes, nome, atuacao_profissional, hash_linha)
+        SELECT id_lattes, nome, atuacao_profissional, {HASH_LINHA}
+        FROM (
+            SELECT LPAD(g::TEXT, 16, '0') AS id_lattes,
+                   'Pesquisador ' || g AS nome,
+                   CASE WHEN random() < 0.6 THEN 'Universidade Federal do Espírito Santo'
+                        ELSE 'Instituição ' || (g %% 50) END AS atuacao_profissional
+            FROM generate_series(1, %(n)s) g
+        ) p;
+        """,
+        """
+        INSERT INTO dw.dim_area (grande_area, area)
+        SELECT 'GRANDE AREA ' || ga, 'Área ' || ga || '.' || a
+        FROM generate_series(1, 9) ga, generate_series(1, 10) a;
+        """,
+        """
+        INSERT INTO dw.dim_linha_pesquisa (linha_pesquisa)
+        SELECT 'Linha de Pesquisa ' || g FROM generate_series(1, %(n)s / 2) g;
+        """,
+        """
+        INSERT INTO dw.fato_pesquisador_area_atuacao (id_pesquisador, id_area)
+        SELECT p, 1 + FLOOR(random() * 90)::INT
+        FROM generate_series(1, %(n)s) p, generate_series(1, 3) k
+        ON CONFLICT DO NOTHING;
+        """,
+        """
+        INSERT INTO dw.fato_pesquisador_linha_pesquisa (id_pesquisador, id_linha_pesquisa)
+        SELECT p, 1 + FLOOR(random() * (%(n)s / 2))::INT
+        FROM generate_series(1, %(n)s) p, generate_series(1, 4) k
+        WHERE random() < 0.7
+        ON CONFLICT DO NOTHING;
+        """,
+        """
+        INSERT INTO dw.fato_pesquisador_producoes (id_pesquisador, id_tempo, id_tipo_producao, qtd_producoes)
+        SELECT p, dt.id_tempo, dtp.id_tipo_producao, 1 + FLOOR(random() * 10)::INT
+        FROM generate_series(1, %(n)s) p
+        CROSS JOIN dw.dim_tempo dt
+        CROSS JOIN dw.dim_tipo_producao dtp
+        WHERE dt.ano >= 1990 AND random() < 0.15;
+        """,
+        """
+        INSERT INTO dw.dim_localizacao_trabalhos (id_lattes, pais, instituicao)
+        SELECT dp.id_lattes,
+               (ARRAY['Brasil', 'Brasil', 'Brasil', 'Portugal', 'Estados Unidos', 'França', 'Argentina'])
+                   [1 + FLOOR(random() * 7)::INT],
+               (ARRAY['Universidade Federal do Espírito Santo', 'Universidade de São Paulo',
+                      'Universidade de Lisboa', 'Não se aplica.'])[1 + FLOOR(random() * 4)::INT]
+        FROM dw.dim_pesquisador dp, generate_series(1, 3) k
+        ON CONFLICT DO NOTHING;
+        """,
+        """
+        INSERT INTO dw.fato_pesquisador_producao_localizacao (
+            id_pesquisador, id_tempo, id_tipo_producao, id_localizacao_trabalhos, qtd_producoes
+        )
+        SELECT dp.id_pesquisador, dt.id_tempo, dtp.id_tipo_producao,
+               dlt.id_localizacao_trabalhos, 1 + FLOOR(random() * 5)::INT
+        FROM dw.dim_localizacao_trabalhos dlt
+        JOIN dw.dim_pesquisador dp ON dp.id_lattes = dlt.id_lattes
+        CROSS JOIN dw.dim_tempo dt
+        JOIN dw.dim_tipo_producao dtp
+          ON dtp.tipo_producao IN ('Apresentação de Trabalho', 'Trabalho em Evento')
+        WHERE dt.ano >= 2000 AND random() < 0.1
+        ON CONFLICT DO NOTHING;
+        """,
+        "ANALYZE;",
+    ]
+    with obter_cursor() as cursor:
+        for tabela in TABELAS_PARTICIONADAS:
+            criar_particoes(cursor, tabela)
+        for comando in comandos:
+            cursor.execute(comando, {'n': pesquisadores})
+    print(f"✓ Schema dw semeado com {pesquisadores:,} pesquisadores sintéticos")
+
+
+def percentil(valores, p):
+    """Percentil por posição mais próxima (valores já ordenados)."""
+    if not valores:
+        return None
+    indice = max(0, min(len(valores) - 1, int(round(p / 100 * len(valores) + 0.5)) - 1))
+    return valores[indice]
+
+
+def resumir(latencias):
+    ordenadas = sorted(latencias)
+    return {
+        'execucoes': len(ordenadas),
+        'p50_ms': round(percentil(ordenadas, 50), 2) if ordenadas else None,
+        'p95_ms': round(percentil(ordenadas, 95), 2) if ordenadas else None,
+        'p99_ms': round(percentil(ordenadas, 99), 2) if ordenadas else None,
+        'max_ms': round(ordenadas[-1], 2) if ordenadas else None,
+    }
+
+
+class MonitorConexoes(threading.Thread):
+    """Amostra pg_stat_activity periodicamente e guarda o maior valor visto."""
+
+    def __init__(self, intervalo=0.2):
+        super().__init__(daemon=True)
+        self.intervalo = intervalo
+        self.pico = 0
+        self._parar = threading.Event()
+
+    def run(self):
+        conn = obter_conexao()
+        conn.autocommit = True
+        cursor = conn.cursor()
+        try:
+            while not self._parar.is_set():
+                cursor.execute(
+                    "SELECT COUNT(*) FROM pg_stat_activity WHERE datname = current_database();"
+                )
+                self.pico = max(self.pico, cursor.fetchone()[0])
+                self._parar.wait(self.intervalo)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+
+
+def executar_carga(paginas, concorrencia, sessoes, tamanho_pool=None, parametros=None):
+    """
+    Executa `sessoes` sessões simuladas com até `concorrencia` simultâneas.
+
+    `parametros` preenche os %(nome)s das queries (padrão: PARAMETROS_PADRAO).
+
+    Returns:
+        dict: Estatísticas por query, por página e de conexões
+    """
+    parametros = parametros or PARAMETROS_PADRAO
+    latencias_query = defaultdict(list)
+    latencias_pagina = defaultdict(list)
+    erros = defaultdict(int)
+    conexoes_abertas = [0]
+    trava = threading.Lock()
+
+    pool = None
+    if tamanho_pool:
+        pool = psycopg2.pool.ThreadedConnectionPool(1, tamanho_pool, **DB_CONFIG)
+
+    def executar(sql):
+        # Queries da página com %(nome)s (ou %% literal) vão com os parâmetros,
+        # como em run_query(query, params)
+        params = parametros if '%(' in sql or '%%' in sql else None
+        if pool:
+            conn = pool.getconn()
+        else:
+            conn = obter_conexao()
+            with trava:
+                conexoes_abertas[0] += 1
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            cursor.fetchall()
+            cursor.close()
+            conn.rollback()
+        finally:
+            if pool:
+                pool.putconn(conn)
+            else:
+                conn.close()
+
+    def sessao(_):
+        for pagina, queries in paginas.items():
+            inicio_pagina = time.perf_counter()
+            for query in queries:
+                chave = f"{pagina}:{query['nome']}"
+                inicio = time.perf_counter()
+                try:
+                    executar(query['sql'])
+                except Exception:
+                    with trava:
+                        erros[chave] += 1
+                    continue
+                decorrido = (time.perf_counter() - inicio) * 1000
+                with trava:
+                    latencias_query[chave].append(decorrido)
+            with trava:
+                latencias_pagina[pagina].append((time.perf_counter() - inicio_pagina) * 1000)
+
+    monitor = MonitorConexoes()
+    monitor.start()
+    inicio = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+            list(executor.map(sessao, range(sessoes)))
+    finally:
+        duracao = time.perf_counter() - inicio
+        monitor.parar()
+        if pool:
+            conexoes_abertas[0] = tamanho_pool
+            pool.closeall()
+
+    return {
+        'duracao_s': round(duracao, 2),
+        'sessoes_por_s': round(sessoes / duracao, 2) if duracao > 0 else None,
+        'conexoes_abertas': conexoes_abertas[0],
+        'pico_conexoes_servidor': monitor.pico,
+        'por_query': {chave: dict(resumir(v), erros=erros.get(chave, 0))
+                      for chave, v in latencias_query.items()},
+        'erros': dict(erros),
+        'por_pagina': {pagina: resumir(v) for pagina, v in latencias_pagina.items()},
+    }
+
+
+def imprimir_relatorio(resultado):
+    print(f"\n{'Página':<42} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print("-" * 72)
+    for pagina, s in resultado['por_pagina'].items():
+        print(f"{pagina:<42} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f}")
+
+    print(f"\n{'Query':<60} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print("-" * 90)
+    ordenadas = sorted(resultado['por_query'].items(), key=lambda item: -item[1]['p95_ms'])
+    for chave, s in ordenadas:
+        print(f"{chave[:60]:<60} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f}")
+
+    for chave, qtd in resultado['erros'].items():
+        print(f"✗ {chave}: {qtd} erro(s)")
+
+    print(f"\nDuração: {resultado['duracao_s']}s | Sessões/s: {resultado['sessoes_por_s']}")
+    print(f"Conexões abertas pelo benchmark: {resultado['conexoes_abertas']:,}")
+    print(f"Pico de conexões no servidor: {resultado['pico_conexoes_servidor']}")
+
+
+def _ler_parametros(pares):
+    parametros = dict(PARAMETROS_PADRAO)
+    for par in pares or []:
+        chave, _, valor = par.partition('=')
+        parametros[chave] = int(valor) if valor.lstrip('-').isdigit() else valor
+    return parametros
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das queries dos dashboards")
+    parser.add_argument('--concorrencia', type=int, default=10, help="Sessões simultâneas")
+    parser.add_argument('--sessoes', type=int, default=50, help="Total de sessões simuladas")
+    parser.add_argument('--pool', type=int, default=None,
+                        help="Usa um pool com N conexões em vez de uma conexão por query")
+    parser.add_argument('--parametros', nargs='*',
+                        help="Valores das f-strings, ex: ano_ini=2000 termo_busca=UFES")
+    parser.add_argument('--semear', action='store_true', help="Recria o schema dw com dados sintéticos")
+    parser.add_argument('--escala', type=int, default=1, help="Escala da semeadura (1 = 1.000 pesquisadores)")
+    parser.add_argument('--listar', action='store_true', help="Apenas lista as queries extraídas")
+    parser.add_argument('--saida', default=None, help="Arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    parametros = _ler_parametros(args.parametros)
+    paginas = extrair_paginas(parametros)
+    if args.listar:
+        for pagina, queries in paginas.items():
+            print(f"\n{pagina}")
+            for query in queries:
+                print(f"   linha {query['linha']:>4}: {query['nome']}")
+        return 0
+
+    if args.semear:
+        if DB_CONFIG['host'] not in ('localhost', '127.0.0.1'):
+            print(f"Recusando semear {DB_CONFIG['host']}: a semeadura apaga o schema dw.")
+            return 2
+        semear(args.escala)
+
+    total_queries = sum(len(q) for q in paginas.values())
+    print(f"Executando {args.sessoes} sessões ({total_queries} queries cada), "
+          f"concorrência {args.concorrencia}, "
+          f"{'pool de ' + str(args.pool) if args.pool else 'uma conexão por query'}")
+    resultado = executar_carga(paginas, args.concorrencia, args.sessoes, args.pool, parametros)
+    resultado.update({
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'concorrencia': args.concorrencia,
+        'sessoes': args.sessoes,
+        'pool': args.pool,
+    })
+    imprimir_relatorio(resultado)
+
+    os.makedirs(PASTA_RESULTADOS, exist_ok=True)
+    saida = args.saida or os.path.join(
+        PASTA_RESULTADOS, f"dashboards_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"\n✓ Resultados salvos em {saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Benchmark do ETL: stage, dimensões, fatos e pipeline completo.
+
+Para cada tamanho de corpus, o benchmark:
+1. Monta uma pasta temporária com os N primeiros currículos (links simbólicos)
+2. Limpa todas as tabelas dos schemas stg e dw
+3. Executa cada etapa de executar_pipeline.ETAPAS em um subprocesso próprio,
+   medindo tempo total, tempo dentro do banco, pico de memória (RSS) e
+   linhas gravadas na tabela de destino
+4. Limpa as tabelas de novo e executa o pipeline completo em um único processo
+
+Os resultados vão para um arquivo JSON e podem ser comparados com uma
+baseline salva anteriormente. Uma etapa é considerada regressão quando o
+tempo ou o pico de memória passam da baseline por mais que o limiar.
+
+ATENÇÃO: o benchmark apaga os dados de stg e dw. Use um Postgres local.
+
+Uso:
+    python benchmark/benchmark_etl.py --tamanhos 100 1000 5000
+    python benchmark/benchmark_etl.py --tamanhos 1000 --salvar-baseline
+    python benchmark/benchmark_etl.py --tamanhos 1000 --limiar 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(RAIZ)
+from db.db_conexao import DB_CONFIG, obter_cursor, obter_tempo_banco, zerar_tempo_banco
+from executar_pipeline import ETAPAS, executar_etapa, executar_pipeline, obter_etapa
+from stage.fonte_curriculos import obter_pasta_json
+
+PASTA_RESULTADOS = os.path.join(os.path.dirname(__file__), 'resultados')
+BASELINE_PADRAO = os.path.join(os.path.dirname(__file__), 'baseline.json')
+PIPELINE_COMPLETO = 'pipeline_completo'
+
+
+def pico_rss_mb():
+    """Pico de memória residente deste processo, em MB."""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB, macOS em bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(pico / divisor, 2)
+
+
+def contar_linhas(tabelas):
+    """Soma o número de registros das tabelas informadas."""
+    with obter_cursor() as cursor:
+        total = 0
+        for tabela in tabelas:
+            cursor.execute(f"SELECT COUNT(*) FROM {tabela};")
+            total += cursor.fetchone()[0]
+        return total
+
+
+def limpar_stg_dw():
+    """Remove todos os registros das tabelas dos schemas stg e dw."""
+    with obter_cursor() as cursor:
+        cursor.execute("""
+            SELECT table_schema || '.' || table_name
+            FROM information_schema.tables
+            WHERE table_schema IN ('stg', 'dw')
+              AND table_type = 'BASE TABLE';
+        """)
+        tabelas = [linha[0] for linha in cursor.fetchall()]
+        if tabelas:
+            cursor.execute(f"TRUNCATE TABLE {', '.join(tabelas)} RESTART IDENTITY CASCADE;")
+
+
+def montar_corpus(tamanho, destino):
+    """
+    Cria em `destino` links simbólicos para os `tamanho` primeiros currículos.
+
+    Returns:
+        int: Quantidade real de currículos (pode ser menor que `tamanho`)
+    """
+    origem = obter_pasta_json()
+    arquivos = sorted(f for f in os.listdir(origem) if f.endswith('.json'))[:tamanho]
+    os.makedirs(destino, exist_ok=True)
+    for nome in arquivos:
+        os.symlink(os.path.join(origem, nome), os.path.join(destino, nome))
+    return len(arquivos)
+
+
+def medir_no_processo(nome_etapa):
+    """
+    Executa uma etapa (ou o pipeline completo) no processo atual e mede.
+    Chamado pelo subprocesso criado em medir_etapa().
+
+    Returns:
+        dict: Medidas da etapa
+    """
+    zerar_tempo_banco()
+    inicio = time.perf_counter()
+    if nome_etapa == PIPELINE_COMPLETO:
+        executar_pipeline()
+        tabelas = [etapa[3] for etapa in ETAPAS]
+    else:
+        executar_etapa(nome_etapa)
+        tabelas = [obter_etapa(nome_etapa)[3]]
+    tempo = time.perf_counter() - inicio
+    tempo_banco = obter_tempo_banco()
+
+    linhas = contar_linhas(tabelas)
+    return {
+        'etapa': nome_etapa,
+        'tempo_s': round(tempo, 4),
+        'tempo_banco_s': round(tempo_banco['segundos'], 4),
+        'comandos_banco': tempo_banco['comandos'],
+        'linhas': linhas,
+        'linhas_por_s': round(linhas / tempo, 2) if tempo > 0 else None,
+        'pico_rss_mb': pico_rss_mb(),
+    }
+
+
+def medir_etapa(nome_etapa, pasta_corpus):
+    """
+    Roda a etapa em um subprocesso isolado para que o pico de RSS seja só dela.
+
+    Returns:
+        dict: Medidas da etapa
+    """
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as tmp:
+        caminho_saida = tmp.name
+    try:
+        env = dict(os.environ, LATTES_PASTA_JSON=pasta_corpus)
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--executar-etapa', nome_etapa,
+             '--saida-etapa', caminho_saida],
+            env=env, cwd=RAIZ, check=True, stdout=subprocess.DEVNULL,
+        )
+        with open(caminho_saida, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(caminho_saida)
+
+
+def versao_postgres():
+    with obter_cursor() as cursor:
+        cursor.execute("SHOW server_version;")
+        return cursor.fetchone()[0]
+
+
+def executar_benchmark(tamanhos, etapas, pipeline_completo=True):
+    """
+    Executa o benchmark para cada tamanho de corpus.
+
+    Returns:
+        dict: Documento de resultados (pronto para salvar em JSON)
+    """
+    resultados = []
+    pasta_tmp = tempfile.mkdtemp(prefix='benchmark_etl_')
+    try:
+        for tamanho in tamanhos:
+            pasta_corpus = os.path.join(pasta_tmp, str(tamanho))
+            curriculos = montar_corpus(tamanho, pasta_corpus)
+            print(f"\n📦 Corpus com {curriculos} currículos (pedido: {tamanho})")
+
+            limpar_stg_dw()
+            for nome in etapas:
+                medida = medir_etapa(nome, pasta_corpus)
+                medida.update({'tamanho_corpus': tamanho, 'curriculos': curriculos})
+                resultados.append(medida)
+                print(f"   {nome:<45} {medida['tempo_s']:>9.2f}s  "
+                      f"{medida['linhas']:>10,} linhas  {medida['pico_rss_mb']:>8.1f} MB")
+
+            if pipeline_completo:
+                limpar_stg_dw()
+                medida = medir_etapa(PIPELINE_COMPLETO, pasta_corpus)
+                medida.update({'tamanho_corpus': tamanho, 'curriculos': curriculos})
+                resultados.append(medida)
+                print(f"   {PIPELINE_COMPLETO:<45} {medida['tempo_s']:>9.2f}s  "
+                      f"{medida['linhas']:>10,} linhas  {medida['pico_rss_mb']:>8.1f} MB")
+    finally:
+        shutil.rmtree(pasta_tmp, ignore_errors=True)
+
+    return {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'ambiente': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'postgres': versao_postgres(),
+        },
+        'resultados': resultados,
+    }
+
+
+def comparar_com_baseline(atual, baseline, limiar):
+    """
+    Compara tempo e pico de memória de cada etapa com a baseline.
+
+    Args:
+        atual (dict): Documento de resultados atual
+        baseline (dict): Documento de resultados da baseline
+        limiar (float): Piora relativa tolerada (0.10 = 10%)
+
+    Returns:
+        list: Regressões encontradas, uma string por métrica/etapa
+    """
+    base = {(r['tamanho_corpus'], r['etapa']): r for r in baseline['resultados']}
+    regressoes = []
+    for r in atual['resultados']:
+        anterior = base.get((r['tamanho_corpus'], r['etapa']))
+        if not anterior:
+            continue
+        for metrica in ('tempo_s', 'pico_rss_mb'):
+            if not anterior[metrica]:
+                continue
+            variacao = (r[metrica] - anterior[metrica]) / anterior[metrica]
+            if variacao > limiar:
+                regressoes.append(
+                    f"{r['etapa']} (corpus {r['tamanho_corpus']}): {metrica} "
+                    f"{anterior[metrica]} -> {r[metrica]} ({variacao:+.1%})"
+                )
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do ETL de produções científicas")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[100, 1000],
+                        help="Tamanhos de corpus (número de currículos)")
+    parser.add_argument('--etapas', nargs='+', default=[etapa[0] for etapa in ETAPAS],
+                        help="Etapas a medir (padrão: todas)")
+    parser.add_argument('--sem-pipeline-completo', action='store_true',
+                        help="Não mede o pipeline completo em um único processo")
+    parser.add_argument('--saida', default=None, help="Arquivo JSON de resultados")
+    parser.add_argument('--baseline', default=BASELINE_PADRAO, help="Arquivo JSON da baseline")
+    parser.add_argument('--limiar', type=float, default=0.10,
+                        help="Piora relativa tolerada antes de acusar regressão (padrão: 0.10)")
+    parser.add_argument('--salvar-baseline', action='store_true',
+                        help="Grava os resultados como nova baseline")
+    parser.add_argument('--permitir-remoto', action='store_true',
+                        help="Permite rodar contra um host diferente de localhost")
+    # Uso interno: execução de uma única etapa dentro do subprocesso
+    parser.add_argument('--executar-etapa', help=argparse.SUPPRESS)
+    parser.add_argument('--saida-etapa', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar_etapa:
+        medida = medir_no_processo(args.executar_etapa)
+        with open(args.saida_etapa, 'w', encoding='utf-8') as f:
+            json.dump(medida, f)
+        return 0
+
+    if DB_CONFIG['host'] not in ('localhost', '127.0.0.1') and not args.permitir_remoto:
+        print(f"Recusando rodar contra {DB_CONFIG['host']}: o benchmark apaga stg e dw. "
+              "Use --permitir-remoto se for intencional.")
+        return 2
+
+    resultado = executar_benchmark(args.tamanhos, args.etapas, not args.sem_pipeline_completo)
+
+    os.makedirs(PASTA_RESULTADOS, exist_ok=True)
+    saida = args.saida or os.path.join(
+        PASTA_RESULTADOS, f"etl_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"\n✓ Resultados salvos em {saida}")
+
+    if args.salvar_baseline:
+        shutil.copyfile(saida, args.baseline)
+        print(f"✓ Baseline atualizada em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Nenhuma baseline encontrada; use --salvar-baseline para criar uma.")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressoes = comparar_com_baseline(resultado, baseline, args.limiar)
+    if regressoes:
+        print(f"\n✗ {len(regressoes)} regressão(ões) acima de {args.limiar:.0%}:")
+        for regressao in regressoes:
+            print(f"   - {regressao}")
+        return 1
+
+    print(f"\n✓ Nenhuma regressão acima de {args.limiar:.0%} em relação à baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Verifica e compara os decodificadores JSON usados pelo stage.
+
+Decodifica cada currículo com todos os backends instalados (orjson,
+simdjson e o json da biblioteca padrão), confere se o resultado é idêntico
+ao do json padrão e mede o tempo de cada um. Roda sem banco de dados.
+
+Sai com código 1 se algum backend divergir em algum arquivo.
+
+Uso:
+    python benchmark/verificar_decodificadores.py
+    python benchmark/verificar_decodificadores.py --pasta /dados/curriculos --limite 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from stage.fonte_curriculos import BACKENDS_JSON, listar_arquivos_json, ler_curriculo, obter_backend_json
+
+
+def verificar(arquivos):
+    """
+    Decodifica os arquivos com cada backend e compara com o json padrão.
+
+    Args:
+        arquivos (list): Caminhos dos currículos
+
+    Returns:
+        tuple: ({backend: segundos}, [divergências como strings])
+    """
+    tempos = {backend: 0.0 for backend in BACKENDS_JSON}
+    divergencias = []
+    for caminho in arquivos:
+        inicio = time.perf_counter()
+        referencia = ler_curriculo(caminho, 'json')
+        tempos['json'] += time.perf_counter() - inicio
+
+        for backend in BACKENDS_JSON:
+            if backend == 'json':
+                continue
+            inicio = time.perf_counter()
+            resultado = ler_curriculo(caminho, backend)
+            tempos[backend] += time.perf_counter() - inicio
+            if resultado != referencia:
+                divergencias.append(f"{backend}: {os.path.basename(caminho)}")
+    return tempos, divergencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica os decodificadores JSON do stage")
+    parser.add_argument('--pasta', default=None, help="Pasta de currículos (padrão: a do stage)")
+    parser.add_argument('--limite', type=int, default=None, help="Número máximo de arquivos")
+    args = parser.parse_args()
+
+    arquivos = listar_arquivos_json(args.pasta)[:args.limite]
+    if not arquivos:
+        print("Nenhum currículo encontrado.")
+        return 0
+
+    megabytes = sum(os.path.getsize(a) for a in arquivos) / 1024 / 1024
+    print(f"📦 {len(arquivos)} currículos ({megabytes:.1f} MB)")
+    print(f"   Backend em uso pelo stage: {obter_backend_json()}\n")
+
+    tempos, divergencias = verificar(arquivos)
+    for backend, segundos in sorted(tempos.items(), key=lambda item: item[1]):
+        velocidade = megabytes / segundos if segundos else 0
+        print(f"   {backend:<10} {segundos:>8.2f}s  {velocidade:>8.1f} MB/s  "
+              f"{tempos['json'] / segundos if segundos else 0:>5.1f}x")
+
+    if divergencias:
+        print(f"\n✗ {len(divergencias)} divergência(s) em relação ao json padrão:")
+        for divergencia in divergencias[:20]:
+            print(f"   - {divergencia}")
+        return 1
+
+    print("\n✓ Todos os backends produziram resultados idênticos ao json padrão")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,63 @@
+import os
+import time
 import psycopg2
+import psycopg2.extensions
 from contextlib import contextmanager
 
+# Valores padrão do ambiente local; podem ser sobrescritos pelas mesmas
+# variáveis de ambiente usadas em streamlit/db_utils.py
 DB_CONFIG = {
-    'dbname': 'postgres',
-    'user': 'marianacunha',
-    'password': '',  
-    'host': 'localhost',
-    'port': '5432'
+    'dbname': os.getenv('DB_NAME', 'postgres'),
+    'user': os.getenv('DB_USER', 'marianacunha'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'port': os.getenv('DB_PORT', '5432')
 }
 
+# Tempo acumulado (em segundos) gasto dentro do banco por este processo
+_tempo_banco = {'segundos': 0.0, 'comandos': 0}
+
+
+class CursorCronometrado(psycopg2.extensions.cursor):
+    """
+    Cursor que acumula o tempo gasto em execute/executemany/copy_expert.
+    Usado pelo benchmark para separar o tempo de banco do tempo de Python.
+    """
+
+    def _cronometrar(self, metodo, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return metodo(self, *args, **kwargs)
+        finally:
+            _tempo_banco['segundos'] += time.perf_counter() - inicio
+            _tempo_banco['comandos'] += 1
+
+    def execute(self, query, vars=None):
+        return self._cronometrar(psycopg2.extensions.cursor.execute, query, vars)
+
+    def executemany(self, query, vars_list):
+        return self._cronometrar(psycopg2.extensions.cursor.executemany, query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        return self._cronometrar(psycopg2.extensions.cursor.copy_expert, sql, file, size)
+
+
+def obter_tempo_banco():
+    """
+    Retorna o tempo acumulado dentro do banco desde o último zerar_tempo_banco().
+
+    Returns:
+        dict: {'segundos': float, 'comandos': int}
+    """
+    return dict(_tempo_banco)
+
+
+def zerar_tempo_banco():
+    """Zera o acumulador de tempo de banco."""
+    _tempo_banco['segundos'] = 0.0
+    _tempo_banco['comandos'] = 0
+
+
 def obter_conexao():
     """
     Cria e retorna uma conexão com o banco de dados PostgreSQL.
@@ -20,7 +69,7 @@ def obter_conexao():
         psycopg2.Error: Se houver erro ao conectar com o banco
     """
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
+        conn = psycopg2.connect(**DB_CONFIG, cursor_factory=CursorCronometrado)
         return conn
     except psycopg2.Error as e:
         print(f"Erro ao conectar ao banco de dados: {e}")
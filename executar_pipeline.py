@@ -0,0 +1,133 @@
+"""
+Execução do pipeline completo: stage (JSON -> stg) e carga do DW (stg -> dw).
+
+Uso:
+    python executar_pipeline.py                 # pipeline completo
+    python executar_pipeline.py stage.artigos   # apenas as etapas informadas
+    python executar_pipeline.py --perfil cpu,explain dw.fato_pesquisador_producoes
+    python executar_pipeline.py --decadas 2020 dw.fato_pesquisador_producoes
+    python executar_pipeline.py --congelar-antes-de 2010   # não recarrega décadas < 2010
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# (nome da etapa, módulo, função, tabela de destino)
+ETAPAS_STAGE = [
+    ('stage.pesquisador', 'stage.pesquisador', 'main', 'stg.pesquisador'),
+    ('stage.linha_pesquisa', 'stage.linha_pesquisa', 'main', 'stg.linha_pesquisa'),
+    ('stage.areas_atuacao', 'stage.areas_atuacao', 'main', 'stg.areas_atuacao'),
+    ('stage.projetos_pesquisa', 'stage.projetos_pesquisa', 'main', 'stg.projetos_pesquisa'),
+    ('stage.artigos', 'stage.artigos', 'main', 'stg.artigos'),
+    ('stage.livros', 'stage.livros', 'main', 'stg.livros'),
+    ('stage.capitulos_livros', 'stage.capitulos_livros', 'main', 'stg.capitulos_livros'),
+    ('stage.textos_jornais', 'stage.textos_jornais', 'main', 'stg.textos_jornais'),
+    ('stage.trabalhos_eventos', 'stage.trabalhos_eventos', 'main', 'stg.trabalhos_eventos'),
+    ('stage.apresentacoes_trabalho', 'stage.apresentacoes_trabalho', 'main', 'stg.apresentacoes_trabalho'),
+    ('stage.outras_producoes', 'stage.outras_producoes', 'main', 'stg.outras_producoes'),
+    # Perfil de todas as tabelas stg, em paralelo, logo depois da carga
+    ('stg.perfil', 'stage.perfil_dados', 'perfilar_stg', 'dq.perfil_stg'),
+]
+
+ETAPAS_DW = [
+    ('dw.dim_pesquisador', 'populando_tabelas.dim_pesquisador', 'popular_dim_pesquisador', 'dw.dim_pesquisador'),
+    ('dw.dim_area', 'populando_tabelas.dim_area', 'popular_dim_area', 'dw.dim_area'),
+    ('dw.dim_linha_pesquisa', 'populando_tabelas.dim_linha_pesquisa', 'popular_dim_linha_pesquisa', 'dw.dim_linha_pesquisa'),
+    ('dw.dim_tempo', 'populando_tabelas.dim_tempo', 'popular_dim_tempo', 'dw.dim_tempo'),
+    ('dw.dim_tipo_producao', 'populando_tabelas.dim_tipo_producao', 'popular_dim_tipo_producao', 'dw.dim_tipo_producao'),
+    ('dw.dim_localizacao_trabalhos', 'populando_tabelas.dim_localizacao_trabalhos', 'popular_dim_localizacao_trabalhos', 'dw.dim_localizacao_trabalhos'),
+    ('dw.producao_canonica', 'populando_tabelas.producao_canonica', 'popular_producao_canonica', 'dw.producao_canonica'),
+    ('dw.fato_pesquisador_producoes', 'populando_tabelas.fato_pesquisador_producoes', 'popular_fato_pesquisador_producoes', 'dw.fato_pesquisador_producoes'),
+    ('dw.fato_pesquisador_area_atuacao', 'populando_tabelas.fato_pesquisador_area_atuacao', 'popular_fato_pesquisador_area_atuacao', 'dw.fato_pesquisador_area_atuacao'),
+    ('dw.fato_pesquisador_linha_pesquisa', 'populando_tabelas.fato_pesquisador_linha_pesquisa', 'popular_fato_pesquisador_linha_pesquisa', 'dw.fato_pesquisador_linha_pesquisa'),
+    ('dw.fato_pesquisador_producao_localizacao', 'populando_tabelas.fato_pesquisador_producao_localizacao', 'popular_fato_pesquisador_producao_localizacao', 'dw.fato_pesquisador_producao_localizacao'),
+    ('dw.fato_coautoria', 'populando_tabelas.fato_coautoria', 'popular_fato_coautoria', 'dw.fato_coautoria'),
+    # Verificações de qualidade: uma reprovação interrompe o pipeline antes dos
+    # agregados, que ficam com a última carga aprovada. Dimensões e fatos já
+    # foram recarregados e não são revertidos
+    ('dq.validacao', 'populando_tabelas.qualidade_dados', 'validar_qualidade', 'dq.resultados'),
+    ('dw.resumo_pesquisador', 'populando_tabelas.resumo_pesquisador', 'popular_resumo_pesquisador', 'dw.resumo_pesquisador'),
+    ('dw.cubo_producoes', 'populando_tabelas.cubo_producoes', 'popular_cubo_producoes', 'dw.cubo_producoes'),
+    ('dw.metricas_coautoria_pesquisador', 'populando_tabelas.metricas_coautoria', 'popular_metricas_coautoria', 'dw.metricas_coautoria_pesquisador'),
+]
+
+ETAPAS = ETAPAS_STAGE + ETAPAS_DW
+
+
+def obter_etapa(nome):
+    """
+    Busca a definição de uma etapa pelo nome.
+
+    Args:
+        nome (str): Nome da etapa (ex: 'stage.artigos', 'dw.dim_tempo')
+
+    Returns:
+        tuple: (nome, módulo, função, tabela de destino)
+
+    Raises:
+        KeyError: Se a etapa não existir
+    """
+    for etapa in ETAPAS:
+        if etapa[0] == nome:
+            return etapa
+    raise KeyError(f"Etapa desconhecida: {nome}")
+
+
+def executar_etapa(nome):
+    """
+    Importa o módulo da etapa e executa a sua função de entrada.
+
+    Args:
+        nome (str): Nome da etapa
+    """
+    _, modulo, funcao, _ = obter_etapa(nome)
+    getattr(importlib.import_module(modulo), funcao)()
+
+
+def executar_pipeline(etapas=None):
+    """
+    Executa as etapas informadas (ou todas) na ordem do pipeline.
+
+    Args:
+        etapas (list, optional): Nomes das etapas. Padrão: todas.
+    """
+    nomes = etapas or [etapa[0] for etapa in ETAPAS]
+    for nome in nomes:
+        print(f"\n===== {nome} =====")
+        executar_etapa(nome)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline de produções científicas")
+    parser.add_argument('etapas', nargs='*', help="Etapas a executar (padrão: todas)")
+    parser.add_argument('--perfil', metavar='MODOS',
+                        help="Perfis a aplicar em cada etapa: cpu, amostragem, memoria, "
+                             "explain ou tudo (separados por vírgula)")
+    parser.add_argument('--perfil-pasta', metavar='PASTA',
+                        help="Pasta dos artefatos de perfil (padrão: logs/perfis/<execução>)")
+    parser.add_argument('--decadas', metavar='DECADAS',
+                        help="Décadas a recarregar nas fatos particionadas, separadas por "
+                             "vírgula (ex: 2010,2020; padrão: todas)")
+    parser.add_argument('--congelar-antes-de', metavar='ANO',
+                        help="Não recarrega as partições das décadas anteriores a ANO")
+    args = parser.parse_args()
+
+    # Repassado por variável de ambiente para valer também dentro de cada etapa
+    if args.perfil:
+        os.environ['ETL_PERFIL'] = args.perfil
+    if args.perfil_pasta:
+        os.environ['ETL_PERFIL_PASTA'] = args.perfil_pasta
+    if args.decadas:
+        os.environ['ETL_DECADAS'] = args.decadas
+    if args.congelar_antes_de:
+        os.environ['ETL_CONGELAR_ANTES_DE'] = args.congelar_antes_de
+
+    executar_pipeline(args.etapas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Métricas estruturadas das etapas do ETL.
+
+Cada etapa (script de stage ou de carga do DW) registra linhas lidas,
+gravadas e rejeitadas, bytes lidos, duração de cada fase e pico de memória.
+Ao final da etapa as métricas são gravadas como uma linha JSON no log de
+execuções e, opcionalmente, exportadas no formato texto do Prometheus.
+
+Variáveis de ambiente:
+    ETL_METRICAS_ARQUIVO     Log JSON-lines (padrão: logs/execucoes_etl.jsonl)
+    ETL_METRICAS_PROMETHEUS  Pasta do textfile collector; grava <etapa>.prom
+    ETL_EXECUCAO_ID          Identificador da execução (agrupa as etapas)
+    ETL_DIAGNOSTICO          '1' habilita as queries de diagnóstico dos scripts
+    ETL_PERFIL               Perfis a aplicar em cada etapa (ver perfilamento.py)
+
+Uso:
+    with medir_etapa('stage.artigos') as metricas:
+        with metricas.fase('extracao'):
+            ...
+        metricas.linhas_gravadas += n
+"""
+
+import json
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ARQUIVO_PADRAO = os.path.join(RAIZ, 'logs', 'execucoes_etl.jsonl')
+
+_ID_EXECUCAO_PADRAO = datetime.now().strftime('%Y%m%dT%H%M%S') + f"-{os.getpid()}"
+
+
+def id_execucao():
+    """Identificador da execução atual (compartilhado pelas etapas do pipeline)."""
+    return os.getenv('ETL_EXECUCAO_ID', _ID_EXECUCAO_PADRAO)
+
+
+def diagnostico_ativo():
+    """
+    Indica se as queries de diagnóstico (estatísticas, amostras, top-N)
+    devem rodar. Desligado por padrão para não pagar scans extras.
+    """
+    return os.getenv('ETL_DIAGNOSTICO', '').lower() in ('1', 'true', 'sim')
+
+
+def pico_memoria_mb():
+    """Pico de memória residente do processo, em MB."""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB, macOS em bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(pico / divisor, 2)
+
+
+class MetricasEtapa:
+    """Contadores e tempos de uma etapa do ETL."""
+
+    def __init__(self, etapa):
+        self.etapa = etapa
+        self.linhas_lidas = 0
+        self.linhas_gravadas = 0
+        self.linhas_rejeitadas = 0
+        self.bytes_lidos = 0
+        self.fases = {}
+        self.extras = {}
+
+    @contextmanager
+    def fase(self, nome):
+        """Mede a duração de uma fase (acumula se a fase se repetir)."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases[nome] = round(self.fases.get(nome, 0.0) + time.perf_counter() - inicio, 4)
+
+    def registrar(self, **valores):
+        """Guarda valores adicionais específicos da etapa."""
+        self.extras.update(valores)
+
+    def como_dict(self):
+        return {
+            'etapa': self.etapa,
+            'linhas_lidas': self.linhas_lidas,
+            'linhas_gravadas': self.linhas_gravadas,
+            'linhas_rejeitadas': self.linhas_rejeitadas,
+            'bytes_lidos': self.bytes_lidos,
+            'fases_s': self.fases,
+            **self.extras,
+        }
+
+
+def _gravar_jsonl(registro):
+    caminho = os.getenv('ETL_METRICAS_ARQUIVO', ARQUIVO_PADRAO)
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+
+def _gravar_prometheus(registro, pasta):
+    """Grava <pasta>/<etapa>.prom de forma atômica (textfile collector)."""
+    etapa = registro['etapa']
+    rotulo = f'etapa="{etapa}"'
+    linhas = [
+        '# TYPE etl_linhas_lidas gauge',
+        f"etl_linhas_lidas{{{rotulo}}} {registro['linhas_lidas']}",
+        '# TYPE etl_linhas_gravadas gauge',
+        f"etl_linhas_gravadas{{{rotulo}}} {registro['linhas_gravadas']}",
+        '# TYPE etl_linhas_rejeitadas gauge',
+        f"etl_linhas_rejeitadas{{{rotulo}}} {registro['linhas_rejeitadas']}",
+        '# TYPE etl_bytes_lidos gauge',
+        f"etl_bytes_lidos{{{rotulo}}} {registro['bytes_lidos']}",
+        '# TYPE etl_duracao_segundos gauge',
+        f"etl_duracao_segundos{{{rotulo}}} {registro['duracao_s']}",
+        '# TYPE etl_pico_memoria_mb gauge',
+        f"etl_pico_memoria_mb{{{rotulo}}} {registro['pico_memoria_mb']}",
+        '# TYPE etl_sucesso gauge',
+        f"etl_sucesso{{{rotulo}}} {1 if registro['status'] == 'ok' else 0}",
+        '# TYPE etl_ultima_execucao_timestamp gauge',
+        f"etl_ultima_execucao_timestamp{{{rotulo}}} {int(time.time())}",
+        '# TYPE etl_fase_duracao_segundos gauge',
+    ]
+    for fase, duracao in registro['fases_s'].items():
+        linhas.append(f'etl_fase_duracao_segundos{{{rotulo},fase="{fase}"}} {duracao}')
+
+    os.makedirs(pasta, exist_ok=True)
+    destino = os.path.join(pasta, f"{etapa}.prom")
+    temporario = destino + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(linhas) + '\n')
+    os.replace(temporario, destino)
+
+
+@contextmanager
+def medir_etapa(etapa):
+    """
+    Context manager que mede uma etapa e grava as métricas ao final,
+    inclusive quando a etapa falha. Com ETL_PERFIL definido, a etapa
+    também é perfilada (ver monitoramento/perfilamento.py).
+
+    Args:
+        etapa (str): Nome da etapa (ex: 'stage.artigos', 'dw.dim_tempo')
+
+    Yields:
+        MetricasEtapa: Objeto onde a etapa registra seus contadores
+    """
+    # Import local: perfilamento depende deste módulo
+    from monitoramento.perfilamento import perfilar_etapa
+
+    metricas = MetricasEtapa(etapa)
+    inicio_wall = datetime.now()
+    inicio = time.perf_counter()
+    status = 'ok'
+    try:
+        with perfilar_etapa(etapa) as pasta_perfil:
+            if pasta_perfil:
+                metricas.registrar(perfil=pasta_perfil)
+            yield metricas
+    except BaseException:
+        status = 'erro'
+        raise
+    finally:
+        registro = {
+            'execucao': id_execucao(),
+            'inicio': inicio_wall.isoformat(timespec='seconds'),
+            'status': status,
+            'duracao_s': round(time.perf_counter() - inicio, 4),
+            'pico_memoria_mb': pico_memoria_mb(),
+            **metricas.como_dict(),
+        }
+        _gravar_jsonl(registro)
+        pasta_prometheus = os.getenv('ETL_METRICAS_PROMETHEUS')
+        if pasta_prometheus:
+            _gravar_prometheus(registro, pasta_prometheus)
+
+        simbolo = '✓' if status == 'ok' else '✗'
+        print(f"{simbolo} {etapa}: {registro['linhas_lidas']} lidas, "
+              f"{registro['linhas_gravadas']} gravadas, {registro['linhas_rejeitadas']} rejeitadas "
+              f"em {registro['duracao_s']:.2f}s")
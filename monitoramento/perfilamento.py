@@ -0,0 +1,223 @@
+"""
+Perfilamento das etapas do ETL.
+
+Liga, sem editar os scripts, os perfis que ajudam a achar o trecho lento
+de uma etapa. Cada etapa que roda dentro de medir_etapa() é perfilada
+automaticamente quando ETL_PERFIL está definido:
+
+    cpu         cProfile determinístico (<etapa>.prof + <etapa>.cpu.txt)
+    amostragem  Amostrador de pilhas em thread separada, com overhead baixo
+                (<etapa>.amostras.txt no formato "collapsed" do flamegraph)
+    memoria     Snapshot do tracemalloc ao final (<etapa>.memoria.txt)
+    explain     EXPLAIN (ANALYZE, BUFFERS) dos INSERT ... SELECT do DW
+                (<etapa>.explain.txt)
+    tudo        Todos os anteriores
+
+Variáveis de ambiente:
+    ETL_PERFIL             Modos separados por vírgula (ex: 'cpu,explain')
+    ETL_PERFIL_PASTA       Pasta dos artefatos (padrão: logs/perfis/<execução>)
+    ETL_PERFIL_INTERVALO   Intervalo do amostrador em segundos (padrão: 0.005)
+
+Pela linha de comando:
+    python executar_pipeline.py --perfil cpu,memoria stage.artigos
+    ETL_PERFIL=explain python populando_tabelas/fato_pesquisador_producoes.py
+
+Para abrir os artefatos:
+    python -m pstats logs/perfis/<execução>/stage.artigos.prof
+    flamegraph.pl logs/perfis/<execução>/stage.artigos.amostras.txt > artigos.svg
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from monitoramento.metricas import RAIZ, id_execucao
+
+MODOS = ('cpu', 'amostragem', 'memoria', 'explain')
+
+
+def modos_ativos():
+    """
+    Modos de perfilamento habilitados em ETL_PERFIL.
+
+    Returns:
+        set: Subconjunto de MODOS (vazio quando o perfilamento está desligado)
+    """
+    valor = os.getenv('ETL_PERFIL', '').lower()
+    modos = {m.strip() for m in valor.split(',') if m.strip()}
+    if 'tudo' in modos:
+        return set(MODOS)
+    desconhecidos = modos - set(MODOS)
+    if desconhecidos:
+        raise ValueError(f"Modo(s) de perfil desconhecido(s): {', '.join(sorted(desconhecidos))}")
+    return modos
+
+
+def pasta_perfis():
+    """Pasta onde os artefatos da execução atual são gravados."""
+    pasta = os.getenv('ETL_PERFIL_PASTA') or os.path.join(RAIZ, 'logs', 'perfis', id_execucao())
+    os.makedirs(pasta, exist_ok=True)
+    return pasta
+
+
+def _caminho(etapa, sufixo):
+    return os.path.join(pasta_perfis(), f"{etapa}.{sufixo}")
+
+
+@contextmanager
+def _perfil_cpu(etapa):
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        yield
+    finally:
+        perfil.disable()
+        perfil.dump_stats(_caminho(etapa, 'prof'))
+        texto = io.StringIO()
+        pstats.Stats(perfil, stream=texto).sort_stats('cumulative').print_stats(40)
+        with open(_caminho(etapa, 'cpu.txt'), 'w', encoding='utf-8') as f:
+            f.write(texto.getvalue())
+
+
+class AmostradorPilhas(threading.Thread):
+    """
+    Amostra periodicamente a pilha de uma thread e conta as pilhas vistas.
+
+    O resultado sai no formato "collapsed" (uma pilha por linha, quadros
+    separados por ';', seguida da contagem), aceito por flamegraph.pl e
+    pelo speedscope.
+    """
+
+    def __init__(self, id_thread, intervalo):
+        super().__init__(daemon=True)
+        self.id_thread = id_thread
+        self.intervalo = intervalo
+        self.pilhas = Counter()
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            frame = sys._current_frames().get(self.id_thread)
+            quadros = []
+            while frame is not None:
+                codigo = frame.f_code
+                arquivo = os.path.relpath(codigo.co_filename, RAIZ) \
+                    if codigo.co_filename.startswith(RAIZ) else os.path.basename(codigo.co_filename)
+                quadros.append(f"{codigo.co_name} ({arquivo}:{codigo.co_firstlineno})")
+                frame = frame.f_back
+            if quadros:
+                self.pilhas[';'.join(reversed(quadros))] += 1
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+
+    def gravar(self, caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for pilha, contagem in self.pilhas.most_common():
+                f.write(f"{pilha} {contagem}\n")
+
+
+@contextmanager
+def _perfil_amostragem(etapa):
+    intervalo = float(os.getenv('ETL_PERFIL_INTERVALO', '0.005'))
+    amostrador = AmostradorPilhas(threading.get_ident(), intervalo)
+    amostrador.start()
+    try:
+        yield
+    finally:
+        amostrador.parar()
+        amostrador.gravar(_caminho(etapa, 'amostras.txt'))
+
+
+@contextmanager
+def _perfil_memoria(etapa):
+    ja_ativo = tracemalloc.is_tracing()
+    if not ja_ativo:
+        tracemalloc.start(10)
+    tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        atual, pico = tracemalloc.get_traced_memory()
+        if not ja_ativo:
+            tracemalloc.stop()
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, pstats.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        snapshot.dump(_caminho(etapa, 'tracemalloc'))
+        with open(_caminho(etapa, 'memoria.txt'), 'w', encoding='utf-8') as f:
+            f.write(f"Memória rastreada ao final: {atual / 1024 / 1024:.2f} MB\n")
+            f.write(f"Pico rastreado na etapa:    {pico / 1024 / 1024:.2f} MB\n\n")
+            f.write("Maiores alocações vivas por linha:\n")
+            for estatistica in snapshot.statistics('lineno')[:30]:
+                f.write(f"{estatistica}\n")
+
+
+@contextmanager
+def perfilar_etapa(etapa):
+    """
+    Aplica os perfis habilitados em ETL_PERFIL ao bloco. Sem ETL_PERFIL,
+    não faz nada. Chamado por medir_etapa(), então cobre todos os main()
+    de stage/ e as funções popular_* de populando_tabelas/.
+
+    Args:
+        etapa (str): Nome da etapa (usado nos nomes dos artefatos)
+
+    Yields:
+        str | None: Pasta dos artefatos, ou None se o perfilamento estiver desligado
+    """
+    modos = modos_ativos()
+    if not modos & {'cpu', 'amostragem', 'memoria'}:
+        yield pasta_perfis() if modos else None
+        return
+
+    with ExitStack() as pilha:
+        # Memória primeiro, para não rastrear as estruturas dos outros perfis
+        if 'memoria' in modos:
+            pilha.enter_context(_perfil_memoria(etapa))
+        if 'amostragem' in modos:
+            pilha.enter_context(_perfil_amostragem(etapa))
+        if 'cpu' in modos:
+            pilha.enter_context(_perfil_cpu(etapa))
+        yield pasta_perfis()
+
+
+def executar_com_plano(cursor, query, etapa):
+    """
+    Executa a query; com o modo 'explain' ativo, captura antes o plano real
+    via EXPLAIN (ANALYZE, BUFFERS) dentro de um savepoint desfeito em seguida.
+
+    O EXPLAIN ANALYZE executa o comando de fato, então a query roda duas
+    vezes e as sequences SERIAL avançam na primeira (os ids da dimensão
+    ficam com lacunas). Use só em execuções de diagnóstico.
+
+    Args:
+        cursor: Cursor aberto (dentro da transação da etapa)
+        query (str): Comando INSERT ... SELECT (sem parâmetros)
+        etapa (str): Nome da etapa (usado no nome do artefato)
+    """
+    if 'explain' in modos_ativos():
+        cursor.execute("SAVEPOINT perfil_explain;")
+        inicio = time.perf_counter()
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, VERBOSE) {query}")
+            plano = '\n'.join(linha[0] for linha in cursor.fetchall())
+        finally:
+            cursor.execute("ROLLBACK TO SAVEPOINT perfil_explain;")
+        duracao = time.perf_counter() - inicio
+        with open(_caminho(etapa, 'explain.txt'), 'a', encoding='utf-8') as f:
+            f.write(f"-- {etapa} ({duracao:.2f}s)\n{query.strip()}\n\n{plano}\n\n")
+
+    cursor.execute(query)
@@ -0,0 +1,132 @@
+"""
+Construção do cubo de produções (dw.cubo_producoes).
+
+Pré-calcula, com GROUP BY ... CUBE, a quantidade de produções e de
+pesquisadores distintos para todas as combinações de (ano, tipo_producao)
+em três níveis da hierarquia de áreas:
+
+    nível 0   sem área (todas as produções)
+    nível 1   grande_area
+    nível 2   grande_area, area
+
+As produções não têm área própria: são atribuídas às áreas de atuação do
+pesquisador. Cada nível usa os pares distintos (pesquisador, grande área)
+ou (pesquisador, grande área, área), para que um pesquisador com várias
+áreas na mesma grande área não seja contado mais de uma vez nela.
+
+Consultas ao cubo: streamlit/cubo.py.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from monitoramento.perfilamento import executar_com_plano
+
+GRANDE_AREA = "COALESCE(NULLIF(TRIM(da.grande_area), ''), 'Não informada')"
+AREA = "COALESCE(NULLIF(TRIM(da.area), ''), 'Não informada')"
+
+# (dimensões de área fixas no nível, expressões SQL de cada uma)
+NIVEIS_AREA = [
+    ((), ()),
+    (('grande_area',), (GRANDE_AREA,)),
+    (('grande_area', 'area'), (GRANDE_AREA, AREA)),
+]
+
+
+def gerar_query_nivel(dimensoes_area, expressoes):
+    """
+    Gera o INSERT de um nível de área do cubo.
+
+    Args:
+        dimensoes_area (tuple): Nomes das dimensões de área agrupadas
+        expressoes (tuple): Expressão SQL (sobre dim_area 'da') de cada dimensão
+
+    Returns:
+        str: Comando INSERT ... SELECT ... GROUP BY ..., CUBE (ano, tipo).
+            O ano é lido de f.id_tempo (chave de dw.dim_tempo é o próprio ano)
+    """
+    colunas_area = [f"pa.{nome}" for nome in dimensoes_area]
+    juncao_area = ""
+    if dimensoes_area:
+        selecao = ', '.join(f"{expressao} AS {nome}" for nome, expressao in zip(dimensoes_area, expressoes))
+        juncao_area = f"""
+        JOIN (
+            SELECT DISTINCT
+                faa.id_pesquisador,
+                {selecao}
+            FROM dw.fato_pesquisador_area_atuacao faa
+            JOIN dw.dim_area da
+                ON da.id_area = faa.id_area
+        ) pa
+            ON pa.id_pesquisador = f.id_pesquisador"""
+
+    rotulos = [f"'{nome}'" for nome in dimensoes_area] + [
+        "CASE WHEN GROUPING(f.id_tempo) = 0 THEN 'ano' END",
+        "CASE WHEN GROUPING(dtp.tipo_producao) = 0 THEN 'tipo_producao' END",
+    ]
+    grande_area = "pa.grande_area" if 'grande_area' in dimensoes_area else "NULL"
+    area = "pa.area" if 'area' in dimensoes_area else "NULL"
+
+    return f"""
+        INSERT INTO dw.cubo_producoes (
+            agrupamento,
+            grande_area,
+            area,
+            ano,
+            tipo_producao,
+            qtd_producoes,
+            qtd_pesquisadores
+        )
+        SELECT
+            concat_ws(',', {', '.join(rotulos)}) AS agrupamento,
+            {grande_area} AS grande_area,
+            {area} AS area,
+            f.id_tempo AS ano,
+            dtp.tipo_producao,
+            SUM(f.qtd_producoes) AS qtd_producoes,
+            COUNT(DISTINCT f.id_pesquisador) AS qtd_pesquisadores
+        FROM dw.fato_pesquisador_producoes f
+        JOIN dw.dim_tipo_producao dtp
+            ON dtp.id_tipo_producao = f.id_tipo_producao{juncao_area}
+        GROUP BY
+            {''.join(coluna + ', ' for coluna in colunas_area)}CUBE (f.id_tempo, dtp.tipo_producao);
+        """
+
+
+def popular_cubo_producoes():
+    """
+    Reconstrói dw.cubo_producoes a partir de fato_pesquisador_producoes e
+    fato_pesquisador_area_atuacao.
+    """
+
+    try:
+        with medir_etapa('dw.cubo_producoes') as metricas, obter_cursor() as cursor:
+            cursor.execute("TRUNCATE dw.cubo_producoes;")
+            gravadas = 0
+            for nivel, (dimensoes_area, expressoes) in enumerate(NIVEIS_AREA):
+                with metricas.fase(f'nivel_{nivel}'):
+                    executar_com_plano(cursor, gerar_query_nivel(dimensoes_area, expressoes),
+                                       f'dw.cubo_producoes.nivel_{nivel}')
+                gravadas += cursor.rowcount
+            metricas.linhas_gravadas = gravadas
+
+            if diagnostico_ativo():
+                cursor.execute("""
+                    SELECT agrupamento, COUNT(*)
+                    FROM dw.cubo_producoes
+                    GROUP BY agrupamento
+                    ORDER BY agrupamento;
+                """)
+                print("\nCélulas do cubo por agrupamento:")
+                for agrupamento, total in cursor.fetchall():
+                    print(f"   • {agrupamento or '(total geral)'}: {total}")
+
+    except Exception as e:
+        print(f"Erro ao popular cubo_producoes: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    popular_cubo_producoes()
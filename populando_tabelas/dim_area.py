@@ -2,11 +2,14 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from monitoramento.perfilamento import executar_com_plano
 
 def popular_dim_area():
     """
     Popula a tabela dw.dim_area com dados da tabela stg.areas_atuacao.
-    Extrai áreas de conhecimento únicas dos pesquisadores.
+    Extrai áreas de conhecimento únicas dos pesquisadores; áreas já
+    cadastradas são mantidas (mesmo id), então a carga pode ser repetida.
     """
     
     try:
@@ -19,32 +22,23 @@ def popular_dim_area():
             nome_grande_area AS grande_area,
             nome_area        AS area
         FROM stg.areas_atuacao
-        WHERE nome_area IS NOT NULL;
+        WHERE nome_area IS NOT NULL
+        ON CONFLICT (COALESCE(grande_area, ''), area) DO NOTHING;
         """
         
-        with obter_cursor() as cursor:
-            cursor.execute(query)
-            registros_inseridos = cursor.rowcount
+        with medir_etapa('dw.dim_area') as metricas, obter_cursor() as cursor:
+            with metricas.fase('insercao'):
+                executar_com_plano(cursor, query, 'dw.dim_area')
+            metricas.linhas_gravadas = cursor.rowcount
             
-            print(f"Tabela dw.dim_area populada com sucesso!")
-            print(f"Total de registros inseridos: {registros_inseridos}")
-            
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    COUNT(grande_area) as com_grande_area,
-                    COUNT(area) as com_area
-                FROM dw.dim_area;
-            """)
-            
-            cursor.execute("""
-                SELECT grande_area, area
-                FROM dw.dim_area
-                LIMIT 5;
-            """)
-            
-            amostra = cursor.fetchall()
-            if amostra:
+            if diagnostico_ativo():
+                cursor.execute("""
+                    SELECT grande_area, area
+                    FROM dw.dim_area
+                    LIMIT 5;
+                """)
+                
+                amostra = cursor.fetchall()
                 for i, (ga, a) in enumerate(amostra, 1):
                     print(f"   {i}. Grande Área: {ga or 'N/A'}")
                     print(f"      Área: {a or 'N/A'}")
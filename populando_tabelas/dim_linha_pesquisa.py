@@ -2,6 +2,8 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from monitoramento.perfilamento import executar_com_plano
 
 
 def _normalizar_linha_pesquisa_sql() -> str:
@@ -87,12 +89,13 @@ def _filtros_validacao_sql() -> str:
 def inserir_linhas_normalizadas(cursor) -> int:
     """
     Insere linhas de pesquisa normalizadas na tabela dimensional.
+    Linhas já cadastradas são mantidas (mesmo id).
     
     Args:
         cursor: Cursor do banco de dados
         
     Returns:
-        int: Número de registros inseridos
+        int: Número de registros novos
     """
     normalizacao_sql = _normalizar_linha_pesquisa_sql()
     filtros_sql = _filtros_validacao_sql()
@@ -102,10 +105,11 @@ def inserir_linhas_normalizadas(cursor) -> int:
         SELECT DISTINCT
             {normalizacao_sql} AS linha_pesquisa_normalizada
         FROM stg.linha_pesquisa
-        {filtros_sql};
+        {filtros_sql}
+        ON CONFLICT (linha_pesquisa) DO NOTHING;
     """
     
-    cursor.execute(query)
+    executar_com_plano(cursor, query, 'dw.dim_linha_pesquisa')
     return cursor.rowcount
 
 
@@ -223,17 +227,25 @@ def popular_dim_linha_pesquisa():
     """
     try:
         
-        with obter_cursor() as cursor:
-            registros_inseridos = inserir_linhas_normalizadas(cursor)
+        with medir_etapa('dw.dim_linha_pesquisa') as metricas, obter_cursor() as cursor:
+            with metricas.fase('insercao'):
+                metricas.linhas_gravadas = inserir_linhas_normalizadas(cursor)
             
-            stats_dim = obter_estatisticas_dimensao(cursor)
-            stats_stage = obter_estatisticas_stage(cursor)
-            
-            amostra = obter_amostra_linhas(cursor, limite=10)
-            removidos = obter_dados_removidos(cursor, limite=5)
-            
-        
-        print("Processo finalizado com sucesso!\n")
+            if diagnostico_ativo():
+                stats_dim = obter_estatisticas_dimensao(cursor)
+                stats_stage = obter_estatisticas_stage(cursor)
+                
+                print("\nEstatísticas da dim_linha_pesquisa:")
+                print(f"   Linhas na stage: {stats_stage['total_origem']} ({stats_stage['pesquisadores']} pesquisadores)")
+                print(f"   Linhas normalizadas: {stats_dim['total']} (tamanho médio: {stats_dim['tamanho_medio']})")
+                
+                print("\nAmostra de linhas normalizadas:")
+                for linha, tamanho in obter_amostra_linhas(cursor, limite=10):
+                    print(f"   • {linha} ({tamanho})")
+                
+                print("\nExemplos de linhas removidas:")
+                for (linha,) in obter_dados_removidos(cursor, limite=5):
+                    print(f"   • {linha}")
         
     except Exception as e:
         print(f"Erro ao popular dim_linha_pesquisa: {e}")
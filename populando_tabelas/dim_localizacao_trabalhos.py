@@ -1,25 +1,111 @@
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from db.db_conexao import obter_cursor, executar_query
+from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from monitoramento.perfilamento import executar_com_plano
+
+NAO_SE_APLICA = "'Não se aplica.'"
+
+# Limpeza da instituição promotora; {c} é a coluna de origem
+_INSTITUICAO_CANONICA = r"""CASE
+                -- Valores nulos ou inválidos (PRIMEIRO)
+                WHEN {c} IS NULL THEN 'Não se aplica.'
+                WHEN TRIM({c}) = '' THEN 'Não se aplica.'
+                WHEN TRIM({c}) ~* '^&quot' THEN 'Não se aplica.'
+                WHEN {c} ~* 'www\.' THEN 'Não se aplica.'
+                WHEN {c} ~* '\.br' THEN 'Não se aplica.'
+                -- Padronização: Universidade Federal do Espírito Santo
+                WHEN ({c} ~* 'federal do esp[ií]rito santo'
+                      OR {c} ~* 'ufes'
+                      OR {c} ~* 'ceunes/ufes')
+                     AND {c} !~* 'instituto'
+                     AND {c} !~* 'regional'
+                     AND {c} !~* 'justiça'
+                     AND {c} !~* 'associa[cç][aã]o' 
+                THEN 'Universidade Federal do Espírito Santo'
+                -- Limpeza de caracteres especiais e HTML entities
+                ELSE 
+                    CASE 
+                        WHEN TRIM(REGEXP_REPLACE(
+                            REGEXP_REPLACE(
+                                REGEXP_REPLACE(
+                                    REGEXP_REPLACE(
+                                        REGEXP_REPLACE({c}, '&#\d+;', '', 'g'),
+                                        '&[a-z]+;', '', 'gi'
+                                    ),
+                                    '^[,\.\?!;\-\s]+', '', 'g'
+                                ),
+                                '\s+', ' ', 'g'
+                            ),
+                            '[^\x20-\x7E]', '', 'g'
+                        )) = '' THEN 'Não se aplica.'
+                        ELSE TRIM(REGEXP_REPLACE(
+                            REGEXP_REPLACE(
+                                REGEXP_REPLACE(
+                                    REGEXP_REPLACE(
+                                        REGEXP_REPLACE({c}, '&#\d+;', '', 'g'),
+                                        '&[a-z]+;', '', 'gi'
+                                    ),
+                                    '^[,\.\?!;\-\s]+', '', 'g'
+                                ),
+                                '\s+', ' ', 'g'
+                            ),
+                            '[^\x20-\x7E]', '', 'g'
+                        ))
+                    END
+            END"""
+
+
+def pais_canonico(coluna):
+    """Expressão SQL do país como gravado na dimensão."""
+    return f"COALESCE(NULLIF(TRIM({coluna}), ''), {NAO_SE_APLICA})"
+
+
+def instituicao_canonica(coluna):
+    """Expressão SQL da instituição como gravada na dimensão."""
+    return _INSTITUICAO_CANONICA.format(c=coluna)
+
+
+def hash_localizacao(id_lattes, pais, instituicao):
+    """
+    Expressão SQL da chave de uma localização: md5 de (id_lattes, país,
+    instituição) já canônicos. É a mesma expressão da coluna gerada
+    dw.dim_localizacao_trabalhos.hash_localizacao, então a fato encontra a
+    localização calculando o hash sobre a linha stg.
+
+    Args:
+        id_lattes (str): Expressão SQL do id Lattes
+        pais (str): Expressão SQL do país canônico (ver pais_canonico)
+        instituicao (str): Expressão SQL da instituição canônica
+
+    Returns:
+        str: Expressão SQL
+    """
+    return f"md5({id_lattes} || '|' || {pais} || '|' || {instituicao})"
+
 
 def popular_dim_localizacao_trabalhos():
     """
     Popula a dimensão dw.dim_localizacao_trabalhos com informações de localização 
-    geográfica e institucional das apresentações de trabalho científico.
+    geográfica e institucional das apresentações de trabalho científico e
+    dos trabalhos em eventos.
     
-    TABELA DE ORIGEM:
+    TABELAS DE ORIGEM:
     - stg.apresentacoes_trabalho (pais, instituicao_promotora)
+    - stg.trabalhos_eventos (pais_evento; instituição "Não se aplica.")
     
     ESTRUTURA DA DIMENSÃO:
     - id_localizacao_trabalhos (PK) - Chave surrogate gerada automaticamente
     - id_lattes - ID do pesquisador no Lattes (natural key)
     - pais - País onde a apresentação foi realizada
     - instituicao - Instituição promotora/organizadora do evento
+    - hash_localizacao - md5 de (id_lattes, pais, instituicao), coluna gerada
+      e única (ver hash_localizacao)
     
     MAPEAMENTO DE CAMPOS:
     - id_lattes → id_lattes (identificador do pesquisador)
-    - pais → pais (país do evento)
+    - pais / pais_evento → pais (país do evento)
     - instituicao_promotora → instituicao (instituição organizadora, com limpeza e padronização)
     
     TRANSFORMAÇÕES APLICADAS:
@@ -38,9 +124,10 @@ def popular_dim_localizacao_trabalhos():
     - Valores NULL, vazios ou inválidos → "Não se aplica."
     
     REGRAS DE NEGÓCIO:
-    - Remove duplicatas com SELECT DISTINCT
+    - Remove duplicatas com UNION
     - Filtra apenas registros com id_lattes válido (NOT NULL)
-    - Mantém combinações únicas de (id_lattes, pais, instituicao)
+    - Mantém combinações únicas de (id_lattes, pais, instituicao): localizações
+      já cadastradas são ignoradas (ON CONFLICT em hash_localizacao)
     
     CASOS DE USO:
     Esta dimensão permite análises sobre:
@@ -51,100 +138,65 @@ def popular_dim_localizacao_trabalhos():
     """
 
     try:
-        query = r"""
+        query = f"""
         INSERT INTO dw.dim_localizacao_trabalhos (id_lattes, pais, instituicao)
-        
+
         -- APRESENTAÇÕES DE TRABALHO
-        SELECT DISTINCT
-            id_lattes AS id_lattes,
-            COALESCE(NULLIF(TRIM(pais), ''), 'Não se aplica.') AS pais,
-            CASE 
-                -- Valores nulos ou inválidos (PRIMEIRO)
-                WHEN instituicao_promotora IS NULL THEN 'Não se aplica.'
-                WHEN TRIM(instituicao_promotora) = '' THEN 'Não se aplica.'
-                WHEN TRIM(instituicao_promotora) ~* '^&quot' THEN 'Não se aplica.'
-                WHEN instituicao_promotora ~* 'www\.' THEN 'Não se aplica.'
-                WHEN instituicao_promotora ~* '\.br' THEN 'Não se aplica.'
-                -- Padronização: Universidade Federal do Espírito Santo
-                WHEN (instituicao_promotora ~* 'federal do esp[ií]rito santo'
-                      OR instituicao_promotora ~* 'ufes'
-                      OR instituicao_promotora ~* 'ceunes/ufes')
-                     AND instituicao_promotora !~* 'instituto'
-                     AND instituicao_promotora !~* 'regional'
-                     AND instituicao_promotora !~* 'justiça'
-                     AND instituicao_promotora !~* 'associa[cç][aã]o' 
-                THEN 'Universidade Federal do Espírito Santo'
-                -- Limpeza de caracteres especiais e HTML entities
-                ELSE 
-                    CASE 
-                        WHEN TRIM(REGEXP_REPLACE(
-                            REGEXP_REPLACE(
-                                REGEXP_REPLACE(
-                                    REGEXP_REPLACE(
-                                        REGEXP_REPLACE(instituicao_promotora, '&#\d+;', '', 'g'),
-                                        '&[a-z]+;', '', 'gi'
-                                    ),
-                                    '^[,\.\?!;\-\s]+', '', 'g'
-                                ),
-                                '\s+', ' ', 'g'
-                            ),
-                            '[^\x20-\x7E]', '', 'g'
-                        )) = '' THEN 'Não se aplica.'
-                        ELSE TRIM(REGEXP_REPLACE(
-                            REGEXP_REPLACE(
-                                REGEXP_REPLACE(
-                                    REGEXP_REPLACE(
-                                        REGEXP_REPLACE(instituicao_promotora, '&#\d+;', '', 'g'),
-                                        '&[a-z]+;', '', 'gi'
-                                    ),
-                                    '^[,\.\?!;\-\s]+', '', 'g'
-                                ),
-                                '\s+', ' ', 'g'
-                            ),
-                            '[^\x20-\x7E]', '', 'g'
-                        ))
-                    END
-            END AS instituicao
+        SELECT
+            id_lattes,
+            {pais_canonico('pais')} AS pais,
+            {instituicao_canonica('instituicao_promotora')} AS instituicao
         FROM stg.apresentacoes_trabalho
-        WHERE id_lattes IS NOT NULL;
+        WHERE id_lattes IS NOT NULL
+
+        UNION
+
+        -- TRABALHOS EM EVENTOS (só o país; sem instituição)
+        SELECT
+            id_lattes,
+            {pais_canonico('pais_evento')} AS pais,
+            {NAO_SE_APLICA} AS instituicao
+        FROM stg.trabalhos_eventos
+        WHERE id_lattes IS NOT NULL
+
+        ON CONFLICT (hash_localizacao) DO NOTHING;
         """
         
-        with obter_cursor() as cursor:
-            cursor.execute(query)
-            registros_inseridos = cursor.rowcount
-            
-            print(f"Tabela dw.dim_localizacao_trabalhos populada com sucesso!")
-            print(f"Total de registros inseridos: {registros_inseridos}")
+        with medir_etapa('dw.dim_localizacao_trabalhos') as metricas, obter_cursor() as cursor:
+            with metricas.fase('insercao'):
+                executar_com_plano(cursor, query, 'dw.dim_localizacao_trabalhos')
+            metricas.linhas_gravadas = cursor.rowcount
             
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    COUNT(pais) as com_pais,
-                    COUNT(instituicao) as com_instituicao
-                FROM dw.dim_localizacao_trabalhos;
-            """)
+            if diagnostico_ativo():
+                cursor.execute("""
+                    SELECT 
+                        COUNT(*) as total,
+                        COUNT(pais) as com_pais,
+                        COUNT(instituicao) as com_instituicao
+                    FROM dw.dim_localizacao_trabalhos;
+                """)
             
-            stats = cursor.fetchone()
-            print("\nEstatísticas da dim_localizacao_trabalhos:")
-            print(f"   Total de localizações: {stats[0]}")
-            print(f"   Com país: {stats[1]}")
-            print(f"   Com instituição: {stats[2]}")
+                stats = cursor.fetchone()
+                print("\nEstatísticas da dim_localizacao_trabalhos:")
+                print(f"   Total de localizações: {stats[0]}")
+                print(f"   Com país: {stats[1]}")
+                print(f"   Com instituição: {stats[2]}")
             
-            cursor.execute("""
-                SELECT 
-                    id_lattes,
-                    pais,
-                    instituicao
-                FROM dw.dim_localizacao_trabalhos
-                LIMIT 5;
-            """)
+                cursor.execute("""
+                    SELECT 
+                        id_lattes,
+                        pais,
+                        instituicao
+                    FROM dw.dim_localizacao_trabalhos
+                    LIMIT 5;
+                """)
             
-            amostra = cursor.fetchall()
-            if amostra:
-                for i, (id_lattes, pais, instituicao) in enumerate(amostra, 1):
-                    print(f"   {i}. ID Lattes: {id_lattes}")
-                    print(f"      País: {pais or 'N/A'} | Instituição: {instituicao or 'N/A'}")
-                    print()
+                amostra = cursor.fetchall()
+                if amostra:
+                    for i, (id_lattes, pais, instituicao) in enumerate(amostra, 1):
+                        print(f"   {i}. ID Lattes: {id_lattes}")
+                        print(f"      País: {pais or 'N/A'} | Instituição: {instituicao or 'N/A'}")
+                        print()
         
     except Exception as e:
         print(f"Erro ao popular dim_localizacao_trabalhos: {e}")
@@ -2,78 +2,153 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from monitoramento.perfilamento import executar_com_plano
+
+# Atributos rastreados: uma mudança em qualquer um gera nova versão
+ATRIBUTOS = ['nome', 'atuacao_profissional']
+HASH_LINHA = "md5(" + " || '|' || ".join(ATRIBUTOS) + ")"
+
 
 def popular_dim_pesquisador():
     """
-    Popula a tabela dw.dim_pesquisador com dados da tabela stg.pesquisador.
-    Extrai informações básicas dos pesquisadores (id_lattes, nome, atuação profissional).
+    Atualiza a tabela dw.dim_pesquisador (dimensão de mudança lenta tipo 2)
+    com os dados da tabela stg.pesquisador.
+
+    Estratégia:
+    - Uma linha por versão do pesquisador (chave natural: id_lattes).
+      id_pesquisador é a chave durável, a mesma em todas as versões, e é a
+      que as fatos guardam; a versão vigente tem atual = TRUE
+    - hash_linha (md5 dos ATRIBUTOS já padronizados) é comparado com o da
+      versão vigente: só pesquisadores novos ou alterados geram escrita
+    - Alterados: a versão vigente é encerrada (valido_ate, atual = FALSE) e
+      uma nova é inserida com o mesmo id_pesquisador
+    - Pesquisadores que saíram do staging têm a versão vigente encerrada
+      (exceto se o staging estiver vazio)
     """
     
     try:
-        query = """
+        origem = f"""
+        CREATE TEMP TABLE pesquisador_origem ON COMMIT DROP AS
+        SELECT
+            id_lattes,
+            nome,
+            atuacao_profissional,
+            {HASH_LINHA} AS hash_linha
+        FROM (
+            SELECT DISTINCT ON (id_lattes)
+                id_lattes,
+                CASE 
+                    WHEN nome IS NULL THEN 'Não se aplica.'
+                    WHEN TRIM(nome) = '' THEN 'Não se aplica.'
+                    WHEN TRIM(nome) = '.' THEN 'Não se aplica.'
+                    WHEN TRIM(nome) = '...' THEN 'Não se aplica.'
+                    ELSE TRIM(nome)
+                END as nome,
+                CASE 
+                    -- Padronização: Universidade Federal do Espírito Santo
+                    WHEN (atuacao_profissional ~* 'federal do esp[ií]rito santo'
+                          OR atuacao_profissional ~* 'ufes')
+                         AND atuacao_profissional !~* 'instituto'
+                         AND atuacao_profissional !~* 'regional'
+                         AND atuacao_profissional !~* 'justiça'
+                         AND atuacao_profissional !~* 'associa[cç][aã]o' 
+                    THEN 'Universidade Federal do Espírito Santo'
+                    -- Valores nulos ou inválidos
+                    WHEN atuacao_profissional IS NULL THEN 'Não se aplica.'
+                    WHEN TRIM(atuacao_profissional) = '' THEN 'Não se aplica.'
+                    WHEN TRIM(atuacao_profissional) = '.' THEN 'Não se aplica.'
+                    WHEN TRIM(atuacao_profissional) = '...' THEN 'Não se aplica.'
+                    -- Mantém valor original
+                    ELSE TRIM(atuacao_profissional)
+                END as atuacao_profissional
+            FROM stg.pesquisador
+            WHERE id_lattes IS NOT NULL
+            ORDER BY id_lattes, nome, atuacao_profissional
+        ) p;
+        """
+
+        # Encerra a versão vigente de quem mudou ou saiu do staging
+        encerramento = """
+        UPDATE dw.dim_pesquisador dp
+        SET valido_ate = NOW(),
+            atual = FALSE
+        WHERE dp.atual
+          AND NOT EXISTS (
+              SELECT 1
+              FROM pesquisador_origem o
+              WHERE o.id_lattes = dp.id_lattes
+                AND o.hash_linha = dp.hash_linha
+          )
+          AND EXISTS (SELECT 1 FROM pesquisador_origem);
+        """
+
+        # Nova versão para quem não tem versão vigente (novos e alterados)
+        insercao = """
         INSERT INTO dw.dim_pesquisador (
+            id_pesquisador,
             id_lattes,
             nome,
-            atuacao_profissional
+            atuacao_profissional,
+            hash_linha,
+            valido_de
         )
-        SELECT DISTINCT
-            id_lattes,
-            CASE 
-                WHEN nome IS NULL THEN 'Não se aplica.'
-                WHEN TRIM(nome) = '' THEN 'Não se aplica.'
-                WHEN TRIM(nome) = '.' THEN 'Não se aplica.'
-                WHEN TRIM(nome) = '...' THEN 'Não se aplica.'
-                ELSE TRIM(nome)
-            END as nome,
-            CASE 
-                -- Padronização: Universidade Federal do Espírito Santo
-                WHEN (atuacao_profissional ~* 'federal do esp[ií]rito santo'
-                      OR atuacao_profissional ~* 'ufes')
-                     AND atuacao_profissional !~* 'instituto'
-                     AND atuacao_profissional !~* 'regional'
-                     AND atuacao_profissional !~* 'justiça'
-                     AND atuacao_profissional !~* 'associa[cç][aã]o' 
-                THEN 'Universidade Federal do Espírito Santo'
-                -- Valores nulos ou inválidos
-                WHEN atuacao_profissional IS NULL THEN 'Não se aplica.'
-                WHEN TRIM(atuacao_profissional) = '' THEN 'Não se aplica.'
-                WHEN TRIM(atuacao_profissional) = '.' THEN 'Não se aplica.'
-                WHEN TRIM(atuacao_profissional) = '...' THEN 'Não se aplica.'
-                -- Mantém valor original
-                ELSE TRIM(atuacao_profissional)
-            END as atuacao_profissional
-        FROM stg.pesquisador
-        WHERE id_lattes IS NOT NULL;
+        SELECT
+            COALESCE(anterior.id_pesquisador, nextval('dw.dim_pesquisador_id_pesquisador_seq')),
+            o.id_lattes,
+            o.nome,
+            o.atuacao_profissional,
+            o.hash_linha,
+            NOW()
+        FROM pesquisador_origem o
+        LEFT JOIN (
+            SELECT DISTINCT id_lattes, id_pesquisador
+            FROM dw.dim_pesquisador
+        ) anterior
+            ON anterior.id_lattes = o.id_lattes
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM dw.dim_pesquisador dp
+            WHERE dp.atual
+              AND dp.id_lattes = o.id_lattes
+        );
         """
         
-        with obter_cursor() as cursor:
-            cursor.execute(query)
-            registros_inseridos = cursor.rowcount
-            
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    COUNT(id_lattes) as com_id_lattes,
-                    COUNT(nome) as com_nome,
-                    COUNT(CASE WHEN atuacao_profissional != 'Não se aplica.' THEN 1 END) as com_atuacao_real,
-                    COUNT(CASE WHEN atuacao_profissional = 'Não se aplica.' THEN 1 END) as sem_atuacao
-                FROM dw.dim_pesquisador;
-            """)
-            
-            stats = cursor.fetchone()
-            
-            cursor.execute("""
-                SELECT id_lattes, nome, 
-                       CASE 
-                           WHEN LENGTH(atuacao_profissional) > 60 
-                           THEN LEFT(atuacao_profissional, 60) || '...'
-                           ELSE atuacao_profissional
-                       END as atuacao_resumida
-                FROM dw.dim_pesquisador
-                ORDER BY nome
-                LIMIT 10;
-            """)
+        with medir_etapa('dw.dim_pesquisador') as metricas, obter_cursor() as cursor:
+            with metricas.fase('origem'):
+                cursor.execute(origem)
+            metricas.linhas_lidas = cursor.rowcount
+            with metricas.fase('encerramento'):
+                executar_com_plano(cursor, encerramento, 'dw.dim_pesquisador.encerramento')
+            metricas.registrar(versoes_encerradas=cursor.rowcount)
+            with metricas.fase('insercao'):
+                executar_com_plano(cursor, insercao, 'dw.dim_pesquisador')
+            metricas.linhas_gravadas = cursor.rowcount
             
+            if diagnostico_ativo():
+                cursor.execute("""
+                    SELECT 
+                        COUNT(*) as total,
+                        COUNT(CASE WHEN atuacao_profissional != 'Não se aplica.' THEN 1 END) as com_atuacao_real,
+                        COUNT(CASE WHEN atuacao_profissional = 'Não se aplica.' THEN 1 END) as sem_atuacao
+                    FROM dw.dim_pesquisador
+                    WHERE atual;
+                """)
+                
+                total, com_atuacao, sem_atuacao = cursor.fetchone()
+                print("\nEstatísticas da dim_pesquisador:")
+                print(f"   Total de pesquisadores: {total}")
+                print(f"   Com atuação profissional: {com_atuacao}")
+                print(f"   Sem atuação profissional: {sem_atuacao}")
+
+                cursor.execute("""
+                    SELECT COUNT(*), COUNT(DISTINCT id_pesquisador)
+                    FROM dw.dim_pesquisador
+                    WHERE NOT atual;
+                """)
+                versoes, pesquisadores = cursor.fetchone()
+                print(f"   Versões encerradas (histórico): {versoes} de {pesquisadores} pesquisadores")
+                print(f"   Versões encerradas nesta execução: {metricas.extras.get('versoes_encerradas', 0)}")
         
     except Exception as e:
         print(f"Erro ao popular dim_pesquisador: {e}")
@@ -2,129 +2,95 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from populando_tabelas.referencia import TIPOS_PRODUCAO, VERSAO_TIPOS_PRODUCAO, registrar_versao, versao_semeada
 
-def popular_dim_tipo_producao():
+
+def popular_dim_tipo_producao(somente_com_dados=False):
     """
-    Popula a tabela dw.dim_tipo_producao com tipos de produções científicas.
-    
-    Tabelas de origem (staging):
-    - stg.artigos - 'Artigo'
-    - stg.trabalhos_eventos - 'Trabalho em Evento'
-    - stg.textos_jornais - 'Texto em Jornal'
-    - stg.apresentacoes_trabalho - 'Apresentação de Trabalho'
-    - stg.outras_producoes - 'Outras Produções'
-    - stg.capitulos_livros - 'Capítulo de Livro'
-    - stg.livros - 'Livro'
-    - stg.projetos_pesquisa - 'projetos pesquisa'
-    
+    Semeia a tabela dw.dim_tipo_producao a partir de referencia.TIPOS_PRODUCAO.
+
     Estratégia:
-    - Classifica cada registro pelo tipo da tabela de origem
-    - Gera tipos padronizados de produção científica
-    - Remove duplicatas com DISTINCT
-    - Usa EXISTS para tabelas sem necessidade de filtros adicionais
+    - Cada tipo entra com o id fixo da definição (as fatos usam esses ids
+      diretamente); rótulos alterados são atualizados (ON CONFLICT)
+    - Nenhuma tabela stg é lida: se a versão registrada em
+      dw.versao_referencia já é a atual, nada é feito
+
+    Args:
+        somente_com_dados (bool): Semeia só os tipos cuja tabela stg de
+            origem tem algum registro (um EXISTS ... LIMIT 1 por tipo)
     """
     
     try:
-        query = """
-        INSERT INTO dw.dim_tipo_producao (tipo_producao)
-        
-        SELECT DISTINCT
-            'Artigo' AS tipo_producao
-        FROM stg.artigos
-        
-        UNION
-        
-        -- TRABALHOS EM EVENTOS
-        SELECT DISTINCT
-            'Trabalho em Evento' AS tipo_producao
-        FROM stg.trabalhos_eventos
-        
-        UNION
-        
-        -- TEXTOS EM JORNAIS
-        SELECT DISTINCT
-            'Texto em Jornal' AS tipo_producao
-        FROM stg.textos_jornais
-        
-        UNION
-        
-        -- APRESENTAÇÕES DE TRABALHO
-        SELECT DISTINCT
-            'Apresentação de Trabalho' AS tipo_producao
-        FROM stg.apresentacoes_trabalho
-        
-        UNION
-        
-        -- OUTRAS PRODUÇÕES
-        SELECT DISTINCT
-            'Outras Produções' AS tipo_producao
-        FROM stg.outras_producoes
-        
-        UNION
-        
-        -- CAPÍTULOS DE LIVROS
-        SELECT DISTINCT
-            'Capítulo de Livro' AS tipo_producao
-        FROM stg.capitulos_livros
-        
-        UNION
-        
-        -- LIVROS
-        SELECT 
-            'Livro' AS tipo_producao
-        WHERE EXISTS (SELECT 1 FROM stg.livros)
-        
-        UNION
-        
-        -- PROJETOS DE PESQUISA
-        SELECT 
-            'projetos pesquisa' AS tipo_producao
-        WHERE EXISTS (SELECT 1 FROM stg.projetos_pesquisa);
+        with medir_etapa('dw.dim_tipo_producao') as metricas, obter_cursor() as cursor:
+            if not somente_com_dados and versao_semeada(cursor, 'dw.dim_tipo_producao') == VERSAO_TIPOS_PRODUCAO:
+                print(f"dim_tipo_producao já está na versão {VERSAO_TIPOS_PRODUCAO}")
+                return
+
+            if somente_com_dados:
+                selecao = "\n        UNION ALL\n".join(
+                    f"""        SELECT %s, %s
+        WHERE EXISTS (SELECT 1 FROM {tabela} LIMIT 1)"""
+                    for _, _, tabela in TIPOS_PRODUCAO
+                )
+            else:
+                selecao = "        VALUES " + ", ".join("(%s, %s)" for _ in TIPOS_PRODUCAO)
+            params = [valor for id_tipo, tipo, _ in TIPOS_PRODUCAO for valor in (id_tipo, tipo)]
+
+            query = f"""
+        INSERT INTO dw.dim_tipo_producao (id_tipo_producao, tipo_producao)
+{selecao}
+        ON CONFLICT (id_tipo_producao) DO UPDATE SET
+            tipo_producao = EXCLUDED.tipo_producao
+        WHERE dw.dim_tipo_producao.tipo_producao IS DISTINCT FROM EXCLUDED.tipo_producao;
         """
-        
-        with obter_cursor() as cursor:
-            cursor.execute(query)
-            registros_inseridos = cursor.rowcount
+
+            with metricas.fase('insercao'):
+                cursor.execute(query, params)
+            metricas.linhas_gravadas = cursor.rowcount
+            if not somente_com_dados:
+                registrar_versao(cursor, 'dw.dim_tipo_producao', VERSAO_TIPOS_PRODUCAO)
             
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    COUNT(DISTINCT tipo_producao) as tipos_unicos
-                FROM dw.dim_tipo_producao;
-            """)
+            if diagnostico_ativo():
+                cursor.execute("""
+                    SELECT 
+                        COUNT(*) as total,
+                        COUNT(DISTINCT tipo_producao) as tipos_unicos
+                    FROM dw.dim_tipo_producao;
+                """)
             
-            stats = cursor.fetchone()
-            print("\nEstatísticas da dim_tipo_producao:")
-            print(f"   Total de combinações: {stats[0]}")
-            print(f"   Tipos únicos de produção: {stats[1]}")
+                stats = cursor.fetchone()
+                print("\nEstatísticas da dim_tipo_producao:")
+                print(f"   Total de combinações: {stats[0]}")
+                print(f"   Tipos únicos de produção: {stats[1]}")
             
-            cursor.execute("""
-                SELECT 
-                    tipo_producao,
-                    COUNT(*) as quantidade
-                FROM dw.dim_tipo_producao
-                GROUP BY tipo_producao
-                ORDER BY quantidade DESC;
-            """)
+                cursor.execute("""
+                    SELECT 
+                        tipo_producao,
+                        COUNT(*) as quantidade
+                    FROM dw.dim_tipo_producao
+                    GROUP BY tipo_producao
+                    ORDER BY quantidade DESC;
+                """)
             
-            tipos = cursor.fetchall()
-            if tipos:
-                print("\nDistribuição por tipo de produção:")
-                for tipo, quantidade in tipos:
-                    print(f"   • {tipo}: {quantidade} quantidade(s)")
+                tipos = cursor.fetchall()
+                if tipos:
+                    print("\nDistribuição por tipo de produção:")
+                    for tipo, quantidade in tipos:
+                        print(f"   • {tipo}: {quantidade} quantidade(s)")
             
-            cursor.execute("""
-                SELECT tipo_producao
-                FROM dw.dim_tipo_producao
-                ORDER BY tipo_producao
-                LIMIT 15;
-            """)
+                cursor.execute("""
+                    SELECT tipo_producao
+                    FROM dw.dim_tipo_producao
+                    ORDER BY tipo_producao
+                    LIMIT 15;
+                """)
             
-            amostra = cursor.fetchall()
-            if amostra:
-                print("\nAmostra de tipos de produção cadastrados:")
-                for tipo in amostra:
-                    print(f"   • {tipo}")
+                amostra = cursor.fetchall()
+                if amostra:
+                    print("\nAmostra de tipos de produção cadastrados:")
+                    for tipo in amostra:
+                        print(f"   • {tipo}")
         
     except Exception as e:
         print(f"Erro ao popular dim_tipo_producao: {e}")
@@ -0,0 +1,141 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from monitoramento.perfilamento import executar_com_plano
+from populando_tabelas.dim_tempo import ANO_INICIAL, ANO_FINAL
+from populando_tabelas.referencia import ID_TIPO_POR_ORIGEM
+
+
+def popular_fato_coautoria():
+    """
+    Popula a tabela dw.fato_coautoria a partir de stg.autoria.
+
+    Um coautor é ligado à dim_pesquisador pelo NRO-ID-CNPQ informado na
+    lista de autores (é o próprio id Lattes). Cada par é gravado uma única
+    vez, com o menor id_pesquisador em id_pesquisador_a.
+
+    Uma produção em comum costuma aparecer no currículo dos dois
+    pesquisadores; por isso a quantidade do par é o maior número de
+    produções visto a partir de um dos lados, e não a soma.
+
+    A tabela é recalculada por inteiro a cada execução (TRUNCATE + INSERT
+    numa transação).
+    """
+
+    try:
+        # Tipos com lista de autores em stg.autoria (projetos não têm)
+        valores_tipos = ',\n                '.join(
+            f"('{tabela}', {id_tipo})"
+            for tabela, id_tipo in ID_TIPO_POR_ORIGEM.items()
+            if tabela != 'stg.projetos_pesquisa'
+        )
+        query = f"""
+        WITH tipos (tabela_origem, id_tipo_producao) AS (
+            VALUES
+                {valores_tipos}
+        ),
+        pares AS (
+            SELECT
+                dp_autor.id_pesquisador AS id_autor,
+                dp_coautor.id_pesquisador AS id_coautor,
+                au.tabela_origem,
+                au.ano::INT AS ano,
+                COUNT(DISTINCT au.hash_producao) AS qtd_producoes
+            FROM stg.autoria au
+            JOIN dw.dim_pesquisador dp_autor
+                ON dp_autor.id_lattes = au.id_lattes
+               AND dp_autor.atual
+            JOIN dw.dim_pesquisador dp_coautor
+                ON dp_coautor.id_lattes = au.nro_id_cnpq
+               AND dp_coautor.atual
+            WHERE
+                au.nro_id_cnpq IS NOT NULL
+                AND au.ano ~ '^[0-9]{{4}}$'
+                AND dp_coautor.id_pesquisador <> dp_autor.id_pesquisador
+            GROUP BY
+                dp_autor.id_pesquisador,
+                dp_coautor.id_pesquisador,
+                au.tabela_origem,
+                au.ano
+        )
+        INSERT INTO dw.fato_coautoria (
+            id_pesquisador_a,
+            id_pesquisador_b,
+            id_tempo,
+            id_tipo_producao,
+            qtd_producoes
+        )
+        SELECT
+            LEAST(p.id_autor, p.id_coautor) AS id_pesquisador_a,
+            GREATEST(p.id_autor, p.id_coautor) AS id_pesquisador_b,
+            p.ano AS id_tempo,
+            t.id_tipo_producao,
+            MAX(p.qtd_producoes) AS qtd_producoes
+        FROM pares p
+        JOIN tipos t
+            ON t.tabela_origem = p.tabela_origem
+        WHERE
+            p.ano BETWEEN {ANO_INICIAL} AND {ANO_FINAL}
+        GROUP BY
+            LEAST(p.id_autor, p.id_coautor),
+            GREATEST(p.id_autor, p.id_coautor),
+            p.ano,
+            t.id_tipo_producao;
+        """
+
+        with medir_etapa('dw.fato_coautoria') as metricas, obter_cursor() as cursor:
+            # Recarga completa na mesma transação: se o INSERT falhar, a
+            # fato anterior é mantida
+            with metricas.fase('limpeza'):
+                cursor.execute("TRUNCATE dw.fato_coautoria;")
+            with metricas.fase('insercao'):
+                executar_com_plano(cursor, query, 'dw.fato_coautoria')
+            metricas.linhas_gravadas = cursor.rowcount
+
+            if diagnostico_ativo():
+                cursor.execute("""
+                    SELECT
+                        COUNT(*) AS total_registros,
+                        COUNT(DISTINCT (id_pesquisador_a, id_pesquisador_b)) AS total_pares,
+                        SUM(qtd_producoes) AS total_producoes
+                    FROM dw.fato_coautoria;
+                """)
+
+                stats = cursor.fetchone()
+                print("\nEstatísticas da fato_coautoria:")
+                print(f"   Total de registros: {stats[0]}")
+                print(f"   Pares de coautores: {stats[1]}")
+                print(f"   Produções em coautoria: {stats[2]}")
+
+                cursor.execute("""
+                    SELECT
+                        dpa.nome,
+                        dpb.nome,
+                        SUM(fc.qtd_producoes) AS total
+                    FROM dw.fato_coautoria fc
+                    JOIN dw.dim_pesquisador dpa
+                        ON dpa.id_pesquisador = fc.id_pesquisador_a
+                       AND dpa.atual
+                    JOIN dw.dim_pesquisador dpb
+                        ON dpb.id_pesquisador = fc.id_pesquisador_b
+                       AND dpb.atual
+                    GROUP BY dpa.nome, dpb.nome
+                    ORDER BY total DESC
+                    LIMIT 5;
+                """)
+
+                top_pares = cursor.fetchall()
+                if top_pares:
+                    print("\nTop 5 pares de coautores:")
+                    for i, (nome_a, nome_b, total) in enumerate(top_pares, 1):
+                        print(f"   {i}. {nome_a} & {nome_b}: {total} produções")
+
+    except Exception as e:
+        print(f"Erro ao popular fato_coautoria: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    popular_fato_coautoria()
@@ -2,6 +2,8 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from monitoramento.perfilamento import executar_com_plano
 
 
 def popular_fato_pesquisador_linha_pesquisa():
@@ -26,6 +28,7 @@ def popular_fato_pesquisador_linha_pesquisa():
         FROM stg.linha_pesquisa lp
         JOIN dw.dim_pesquisador dp
             ON dp.id_lattes = lp.id_lattes
+           AND dp.atual
         JOIN dw.dim_linha_pesquisa dlp
             ON dlp.linha_pesquisa = TRIM(
                 REGEXP_REPLACE(
@@ -70,44 +73,43 @@ def popular_fato_pesquisador_linha_pesquisa():
         ON CONFLICT (id_pesquisador, id_linha_pesquisa) DO NOTHING;
         """
 
-        with obter_cursor() as cursor:
-            cursor.execute(query)
-            registros_inseridos = cursor.rowcount
+        with medir_etapa('dw.fato_pesquisador_linha_pesquisa') as metricas, obter_cursor() as cursor:
+            with metricas.fase('insercao'):
+                executar_com_plano(cursor, query, 'dw.fato_pesquisador_linha_pesquisa')
+            metricas.linhas_gravadas = cursor.rowcount
+            
+            if diagnostico_ativo():
+                cursor.execute("""
+                    SELECT
+                        COUNT(*) as total_relacoes,
+                        COUNT(DISTINCT id_pesquisador) as pesquisadores_distintos,
+                        COUNT(DISTINCT id_linha_pesquisa) as linhas_distintas
+                    FROM dw.fato_pesquisador_linha_pesquisa;
+                """)
+                total_rel, pesq_dist, linhas_dist = cursor.fetchone()
 
-            print("Tabela dw.fato_pesquisador_linha_pesquisa populada com sucesso!")
-            print(f"Total de registros inseridos: {registros_inseridos}")
+                print("\nEstatísticas da fato_pesquisador_linha_pesquisa:")
+                print(f"   Total de relações: {total_rel}")
+                print(f"   Pesquisadores distintos: {pesq_dist}")
+                print(f"   Linhas de pesquisa distintas: {linhas_dist}")
 
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as total_relacoes,
-                    COUNT(DISTINCT id_pesquisador) as pesquisadores_distintos,
-                    COUNT(DISTINCT id_linha_pesquisa) as linhas_distintas
-                FROM dw.fato_pesquisador_linha_pesquisa;
-            """)
-            total_rel, pesq_dist, linhas_dist = cursor.fetchone()
-
-            print("\nEstatísticas da fato_pesquisador_linha_pesquisa:")
-            print(f"   Total de relações: {total_rel}")
-            print(f"   Pesquisadores distintos: {pesq_dist}")
-            print(f"   Linhas de pesquisa distintas: {linhas_dist}")
-
-            cursor.execute("""
-                SELECT
-                    dlp.linha_pesquisa,
-                    COUNT(DISTINCT fpl.id_pesquisador) as pesquisadores
-                FROM dw.fato_pesquisador_linha_pesquisa fpl
-                JOIN dw.dim_linha_pesquisa dlp
-                    ON fpl.id_linha_pesquisa = dlp.id_linha_pesquisa
-                GROUP BY dlp.linha_pesquisa
-                ORDER BY pesquisadores DESC
-                LIMIT 10;
-            """)
-            top = cursor.fetchall()
-            if top:
-                print("\nTop 10 linhas de pesquisa por pesquisadores distintos:")
-                for linha, qtd in top:
-                    linha_disp = linha if len(linha) <= 90 else linha[:87] + "..."
-                    print(f"   • {linha_disp}: {qtd}")
+                cursor.execute("""
+                    SELECT
+                        dlp.linha_pesquisa,
+                        COUNT(DISTINCT fpl.id_pesquisador) as pesquisadores
+                    FROM dw.fato_pesquisador_linha_pesquisa fpl
+                    JOIN dw.dim_linha_pesquisa dlp
+                        ON fpl.id_linha_pesquisa = dlp.id_linha_pesquisa
+                    GROUP BY dlp.linha_pesquisa
+                    ORDER BY pesquisadores DESC
+                    LIMIT 10;
+                """)
+                top = cursor.fetchall()
+                if top:
+                    print("\nTop 10 linhas de pesquisa por pesquisadores distintos:")
+                    for linha, qtd in top:
+                        linha_disp = linha if len(linha) <= 90 else linha[:87] + "..."
+                        print(f"   • {linha_disp}: {qtd}")
 
     except Exception as e:
         print(f"Erro ao popular fato_pesquisador_linha_pesquisa: {e}")
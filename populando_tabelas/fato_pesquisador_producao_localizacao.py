@@ -2,12 +2,35 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from monitoramento.perfilamento import executar_com_plano
+from populando_tabelas.dim_localizacao_trabalhos import (
+    NAO_SE_APLICA,
+    hash_localizacao,
+    instituicao_canonica,
+    pais_canonico,
+)
+from populando_tabelas.particoes import decadas_recarga, filtro_decadas, preparar_recarga
+from populando_tabelas.referencia import ID_TIPO_PRODUCAO
 
 
 def popular_fato_pesquisador_producao_localizacao():
+    """
+    Popula dw.fato_pesquisador_producao_localizacao a partir de
+    stg.trabalhos_eventos e stg.apresentacoes_trabalho.
+
+    A localização é encontrada por igualdade em hash_localizacao: o hash é
+    calculado sobre o país e a instituição da linha stg com a mesma
+    limpeza da dimensão (ver dim_localizacao_trabalhos.hash_localizacao).
+    """
 
     try:
-        query = """
+        decadas = decadas_recarga()
+        hash_evento = hash_localizacao('te.id_lattes', pais_canonico('te.pais_evento'), NAO_SE_APLICA)
+        hash_apresentacao = hash_localizacao(
+            'at.id_lattes', pais_canonico('at.pais'), instituicao_canonica('at.instituicao_promotora')
+        )
+        query = f"""
         INSERT INTO dw.fato_pesquisador_producao_localizacao (
             id_pesquisador,
             id_tempo,
@@ -16,30 +39,24 @@ def popular_fato_pesquisador_producao_localizacao():
             qtd_producoes
         )
 
-        -- 1) TRABALHOS EM EVENTOS (localização: país do evento; instituição = NULL)
+        -- 1) TRABALHOS EM EVENTOS (localização: país do evento; instituição 'Não se aplica.')
         SELECT
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            te.ano::INT AS id_tempo,
+            {ID_TIPO_PRODUCAO['Trabalho em Evento']} AS id_tipo_producao,
             dlt.id_localizacao_trabalhos,
             COUNT(*) AS qtd_producoes
         FROM stg.trabalhos_eventos te
         JOIN dw.dim_pesquisador dp
             ON dp.id_lattes = te.id_lattes
-        JOIN dw.dim_tempo dt
-            ON te.ano ~ '^[0-9]{4}$'
-           AND te.ano::INT = dt.ano
-        JOIN dw.dim_tipo_producao dtp
-            ON dtp.tipo_producao = 'Trabalho em Evento'
+           AND dp.atual
         JOIN dw.dim_localizacao_trabalhos dlt
-            ON dlt.id_lattes = te.id_lattes
-           AND dlt.pais IS NOT DISTINCT FROM te.pais_evento
-           AND dlt.instituicao IS NULL
-        WHERE dt.ano < 2026
+            ON dlt.hash_localizacao = {hash_evento}
+        WHERE te.ano ~ '^[0-9]{{4}}$'
+          AND {filtro_decadas('te.ano::INT', decadas)}
         GROUP BY
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            te.ano::INT,
             dlt.id_localizacao_trabalhos
 
         UNION ALL
@@ -47,27 +64,21 @@ def popular_fato_pesquisador_producao_localizacao():
         -- 2) APRESENTAÇÕES DE TRABALHO (localização: país + instituição promotora)
         SELECT
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            at.ano::INT AS id_tempo,
+            {ID_TIPO_PRODUCAO['Apresentação de Trabalho']} AS id_tipo_producao,
             dlt.id_localizacao_trabalhos,
             COUNT(*) AS qtd_producoes
         FROM stg.apresentacoes_trabalho at
         JOIN dw.dim_pesquisador dp
             ON dp.id_lattes = at.id_lattes
-        JOIN dw.dim_tempo dt
-            ON at.ano ~ '^[0-9]{4}$'
-           AND at.ano::INT = dt.ano
-        JOIN dw.dim_tipo_producao dtp
-            ON dtp.tipo_producao = 'Apresentação de Trabalho'
+           AND dp.atual
         JOIN dw.dim_localizacao_trabalhos dlt
-            ON dlt.id_lattes = at.id_lattes
-           AND dlt.pais IS NOT DISTINCT FROM at.pais
-           AND dlt.instituicao IS NOT DISTINCT FROM at.instituicao_promotora
-        WHERE dt.ano < 2026
+            ON dlt.hash_localizacao = {hash_apresentacao}
+        WHERE at.ano ~ '^[0-9]{{4}}$'
+          AND {filtro_decadas('at.ano::INT', decadas)}
         GROUP BY
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            at.ano::INT,
             dlt.id_localizacao_trabalhos
 
         ON CONFLICT (
@@ -78,24 +89,26 @@ def popular_fato_pesquisador_producao_localizacao():
         ) DO NOTHING;
         """
 
-        with obter_cursor() as cursor:
-            cursor.execute(query)
-            registros_inseridos = cursor.rowcount
-
-            print("Tabela dw.fato_pesquisador_producao_localizacao populada com sucesso!")
-            print(f"Total de registros inseridos: {registros_inseridos}")
-
-            cursor.execute("""
-                SELECT
-                    COUNT(*) AS total_registros,
-                    SUM(qtd_producoes) AS total_producoes
-                FROM dw.fato_pesquisador_producao_localizacao;
-            """)
-            total_reg, total_prod = cursor.fetchone()
-
-            print("\nEstatísticas da fato_pesquisador_producao_localizacao:")
-            print(f"   Total de registros: {total_reg}")
-            print(f"   Total de produções: {total_prod}")
+        with medir_etapa('dw.fato_pesquisador_producao_localizacao') as metricas, obter_cursor() as cursor:
+            with metricas.fase('particoes'):
+                preparar_recarga(cursor, 'dw.fato_pesquisador_producao_localizacao', decadas)
+            metricas.registrar(decadas=decadas)
+            with metricas.fase('insercao'):
+                executar_com_plano(cursor, query, 'dw.fato_pesquisador_producao_localizacao')
+            metricas.linhas_gravadas = cursor.rowcount
+            
+            if diagnostico_ativo():
+                cursor.execute("""
+                    SELECT
+                        COUNT(*) AS total_registros,
+                        SUM(qtd_producoes) AS total_producoes
+                    FROM dw.fato_pesquisador_producao_localizacao;
+                """)
+                total_reg, total_prod = cursor.fetchone()
+
+                print("\nEstatísticas da fato_pesquisador_producao_localizacao:")
+                print(f"   Total de registros: {total_reg}")
+                print(f"   Total de produções: {total_prod}")
 
     except Exception as e:
         print(f"Erro ao popular fato_pesquisador_producao_localizacao: {e}")
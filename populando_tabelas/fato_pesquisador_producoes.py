@@ -2,16 +2,25 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from monitoramento.perfilamento import executar_com_plano
+from populando_tabelas.particoes import decadas_recarga, filtro_decadas, preparar_recarga
+from populando_tabelas.referencia import ID_TIPO_PRODUCAO
 
 
 def popular_fato_pesquisador_producoes():
     """
     Popula a tabela dw.fato_pesquisador_producoes com dados agregados
     de todas as produções científicas dos pesquisadores.
+
+    O ano vai direto em id_tempo (chave de dw.dim_tempo), sem junção com
+    a dimensão. A tabela é particionada por década: só as partições das
+    décadas a recarregar são truncadas e recarregadas (ver particoes.py).
     """
     
     try:
-        query = """
+        decadas = decadas_recarga()
+        query = f"""
         INSERT INTO dw.fato_pesquisador_producoes (
             id_pesquisador,
             id_tempo,
@@ -22,245 +31,216 @@ def popular_fato_pesquisador_producoes():
         -- 1. LIVROS
         SELECT
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            l.ano::INT AS id_tempo,
+            {ID_TIPO_PRODUCAO['Livro']} AS id_tipo_producao,
             COUNT(l.id) AS qt_producoes
         FROM dw.dim_pesquisador dp
         JOIN stg.livros l
             ON dp.id_lattes = l.id_lattes
-        JOIN dw.dim_tempo dt
-            ON l.ano ~ '^[0-9]{4}$'
-           AND l.ano::INT = dt.ano
-        JOIN dw.dim_tipo_producao dtp
-            ON dtp.tipo_producao = 'Livro'
+           AND dp.atual
         WHERE
-            dt.ano < 2026
+            l.ano ~ '^[0-9]{{4}}$'
+            AND {filtro_decadas('l.ano::INT', decadas)}
         GROUP BY
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao
+            l.ano::INT
         
         UNION ALL
         
         -- 2. ARTIGOS
         SELECT
             dp.id_pesquisador,
-            dtp.id_tipo_producao,
+            a.ano::INT AS id_tempo,
+            {ID_TIPO_PRODUCAO['Artigo']} AS id_tipo_producao,
             COUNT(a.id) AS qt_producoes
         FROM dw.dim_pesquisador dp
         JOIN stg.artigos a
             ON dp.id_lattes = a.id_lattes
-        JOIN dw.dim_tempo dt
-            ON a.ano ~ '^[0-9]{4}$'
-           AND a.ano::INT = dt.ano
-        JOIN dw.dim_tipo_producao dtp
-            ON dtp.tipo_producao = 'Artigo'
+           AND dp.atual
         WHERE
-            dt.ano < 2026
+            a.ano ~ '^[0-9]{{4}}$'
+            AND {filtro_decadas('a.ano::INT', decadas)}
         GROUP BY
             dp.id_pesquisador,
-            dtp.id_tipo_producao
+            a.ano::INT
         
         UNION ALL
         
         -- 3. APRESENTAÇÃO DE TRABALHO
         SELECT
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            at.ano::INT AS id_tempo,
+            {ID_TIPO_PRODUCAO['Apresentação de Trabalho']} AS id_tipo_producao,
             COUNT(at.id) AS qt_producoes
         FROM dw.dim_pesquisador dp
         JOIN stg.apresentacoes_trabalho at
             ON dp.id_lattes = at.id_lattes
-        JOIN dw.dim_tempo dt
-            ON at.ano ~ '^[0-9]{4}$'
-           AND at.ano::INT = dt.ano
-        JOIN dw.dim_tipo_producao dtp
-            ON dtp.tipo_producao = 'Apresentação de Trabalho'
+           AND dp.atual
         WHERE
-            dt.ano < 2026
+            at.ano ~ '^[0-9]{{4}}$'
+            AND {filtro_decadas('at.ano::INT', decadas)}
         GROUP BY
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao
+            at.ano::INT
         
         UNION ALL
         
         -- 4. PROJETOS PESQUISA
         SELECT
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            pp.ano_inicio::INT AS id_tempo,
+            {ID_TIPO_PRODUCAO['projetos pesquisa']} AS id_tipo_producao,
             COUNT(pp.id) AS qt_producoes
         FROM dw.dim_pesquisador dp
         JOIN stg.projetos_pesquisa pp
             ON dp.id_lattes = pp.id_lattes
-        JOIN dw.dim_tempo dt
-            ON pp.ano_inicio ~ '^[0-9]{4}$'
-           AND pp.ano_inicio::INT = dt.ano
-        JOIN dw.dim_tipo_producao dtp
-            ON dtp.tipo_producao = 'projetos pesquisa'
+           AND dp.atual
         WHERE
-            dt.ano < 2026
+            pp.ano_inicio ~ '^[0-9]{{4}}$'
+            AND {filtro_decadas('pp.ano_inicio::INT', decadas)}
         GROUP BY
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao
+            pp.ano_inicio::INT
         
         UNION ALL
         
         -- 5. TEXTO EM JORNAL
         SELECT
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            tj.ano::INT AS id_tempo,
+            {ID_TIPO_PRODUCAO['Texto em Jornal']} AS id_tipo_producao,
             COUNT(tj.id) AS qt_producoes
         FROM dw.dim_pesquisador dp
         JOIN stg.textos_jornais tj
             ON dp.id_lattes = tj.id_lattes
-        JOIN dw.dim_tempo dt
-            ON tj.ano ~ '^[0-9]{4}$'
-           AND tj.ano::INT = dt.ano
-        JOIN dw.dim_tipo_producao dtp
-            ON dtp.tipo_producao = 'Texto em Jornal'
+           AND dp.atual
         WHERE
-            dt.ano < 2026
+            tj.ano ~ '^[0-9]{{4}}$'
+            AND {filtro_decadas('tj.ano::INT', decadas)}
         GROUP BY
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao
+            tj.ano::INT
         
         UNION ALL
         
         -- 6. OUTRAS PRODUÇÕES
         SELECT
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            op.ano::INT AS id_tempo,
+            {ID_TIPO_PRODUCAO['Outras Produções']} AS id_tipo_producao,
             COUNT(op.id) AS qt_producoes
         FROM dw.dim_pesquisador dp
         JOIN stg.outras_producoes op
             ON dp.id_lattes = op.id_lattes
-        JOIN dw.dim_tempo dt
-            ON op.ano ~ '^[0-9]{4}$'
-           AND op.ano::INT = dt.ano
-        JOIN dw.dim_tipo_producao dtp
-            ON dtp.tipo_producao = 'Outras Produções'
+           AND dp.atual
         WHERE
-            dt.ano < 2026
+            op.ano ~ '^[0-9]{{4}}$'
+            AND {filtro_decadas('op.ano::INT', decadas)}
         GROUP BY
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao
+            op.ano::INT
         
         UNION ALL
         
         -- 7. CAPÍTULO DE LIVRO
         SELECT
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            cl.ano::INT AS id_tempo,
+            {ID_TIPO_PRODUCAO['Capítulo de Livro']} AS id_tipo_producao,
             COUNT(cl.id) AS qt_producoes
         FROM dw.dim_pesquisador dp
         JOIN stg.capitulos_livros cl
             ON dp.id_lattes = cl.id_lattes
-        JOIN dw.dim_tempo dt
-            ON cl.ano ~ '^[0-9]{4}$'
-           AND cl.ano::INT = dt.ano
-        JOIN dw.dim_tipo_producao dtp
-            ON dtp.tipo_producao = 'Capítulo de Livro'
+           AND dp.atual
         WHERE
-            dt.ano < 2026
+            cl.ano ~ '^[0-9]{{4}}$'
+            AND {filtro_decadas('cl.ano::INT', decadas)}
         GROUP BY
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao
+            cl.ano::INT
         
         UNION ALL
         
         -- 8. TRABALHO EM EVENTO
         SELECT
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao,
+            te.ano::INT AS id_tempo,
+            {ID_TIPO_PRODUCAO['Trabalho em Evento']} AS id_tipo_producao,
             COUNT(te.id) AS qt_producoes
         FROM dw.dim_pesquisador dp
         JOIN stg.trabalhos_eventos te
             ON dp.id_lattes = te.id_lattes
-        JOIN dw.dim_tempo dt
-            ON te.ano ~ '^[0-9]{4}$'
-           AND te.ano::INT = dt.ano
-        JOIN dw.dim_tipo_producao dtp
-            ON dtp.tipo_producao = 'Trabalho em Evento'
+           AND dp.atual
         WHERE
-            dt.ano < 2026
+            te.ano ~ '^[0-9]{{4}}$'
+            AND {filtro_decadas('te.ano::INT', decadas)}
         GROUP BY
             dp.id_pesquisador,
-            dt.id_tempo,
-            dtp.id_tipo_producao;
+            te.ano::INT;
         """
         
-        with obter_cursor() as cursor:
-            cursor.execute(query)
-            registros_inseridos = cursor.rowcount
-            
-            print(f"Tabela dw.fato_pesquisador_producoes populada com sucesso!")
-            print(f"Total de registros inseridos: {registros_inseridos}")
+        with medir_etapa('dw.fato_pesquisador_producoes') as metricas, obter_cursor() as cursor:
+            with metricas.fase('particoes'):
+                preparar_recarga(cursor, 'dw.fato_pesquisador_producoes', decadas)
+            metricas.registrar(decadas=decadas)
+            with metricas.fase('insercao'):
+                executar_com_plano(cursor, query, 'dw.fato_pesquisador_producoes')
+            metricas.linhas_gravadas = cursor.rowcount
             
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_registros,
-                    SUM(qtd_producoes) as total_producoes
-                FROM dw.fato_pesquisador_producoes;
-            """)
+            if diagnostico_ativo():
+                cursor.execute("""
+                    SELECT 
+                        COUNT(*) as total_registros,
+                        SUM(qtd_producoes) as total_producoes
+                    FROM dw.fato_pesquisador_producoes;
+                """)
             
-            stats = cursor.fetchone()
-            print("\nEstatísticas da fato_pesquisador_producoes:")
-            print(f"   Total de registros: {stats[0]}")
-            print(f"   Total de produções: {stats[1]}")
+                stats = cursor.fetchone()
+                print("\nEstatísticas da fato_pesquisador_producoes:")
+                print(f"   Total de registros: {stats[0]}")
+                print(f"   Total de produções: {stats[1]}")
             
-            cursor.execute("""
-                SELECT 
-                    dtp.tipo_producao,
-                    COUNT(*) as num_registros,
-                    SUM(fpp.qtd_producoes) as total_producoes
-                FROM dw.fato_pesquisador_producoes fpp
-                JOIN dw.dim_tipo_producao dtp
-                    ON fpp.id_tipo_producao = dtp.id_tipo_producao
-                GROUP BY dtp.tipo_producao
-                ORDER BY total_producoes DESC;
-            """)
+                cursor.execute("""
+                    SELECT 
+                        dtp.tipo_producao,
+                        COUNT(*) as num_registros,
+                        SUM(fpp.qtd_producoes) as total_producoes
+                    FROM dw.fato_pesquisador_producoes fpp
+                    JOIN dw.dim_tipo_producao dtp
+                        ON fpp.id_tipo_producao = dtp.id_tipo_producao
+                    GROUP BY dtp.tipo_producao
+                    ORDER BY total_producoes DESC;
+                """)
             
-            stats_tipo = cursor.fetchall()
-            if stats_tipo:
-                print("\nProduções por tipo:")
-                for tipo, num_reg, total_prod in stats_tipo:
-                    print(f"   • {tipo}: {total_prod} produções em {num_reg} registros")
+                stats_tipo = cursor.fetchall()
+                if stats_tipo:
+                    print("\nProduções por tipo:")
+                    for tipo, num_reg, total_prod in stats_tipo:
+                        print(f"   • {tipo}: {total_prod} produções em {num_reg} registros")
             
-            cursor.execute("""
-                SELECT 
-                    dp.nome,
-                    dtp.tipo_producao,
-                    dt.ano,
-                    fpp.qtd_producoes
-                FROM dw.fato_pesquisador_producoes fpp
-                JOIN dw.dim_pesquisador dp
-                    ON fpp.id_pesquisador = dp.id_pesquisador
-                JOIN dw.dim_tipo_producao dtp
-                    ON fpp.id_tipo_producao = dtp.id_tipo_producao
-                JOIN dw.dim_tempo dt
-                    ON fpp.id_tempo = dt.id_tempo
-                ORDER BY fpp.qtd_producoes DESC
-                LIMIT 5;
-            """)
+                cursor.execute("""
+                    SELECT 
+                        dp.nome,
+                        dtp.tipo_producao,
+                        fpp.id_tempo AS ano,
+                        fpp.qtd_producoes
+                    FROM dw.fato_pesquisador_producoes fpp
+                    JOIN dw.dim_pesquisador dp
+                        ON fpp.id_pesquisador = dp.id_pesquisador
+                       AND dp.atual
+                    JOIN dw.dim_tipo_producao dtp
+                        ON fpp.id_tipo_producao = dtp.id_tipo_producao
+                    ORDER BY fpp.qtd_producoes DESC
+                    LIMIT 5;
+                """)
             
-            top_producoes = cursor.fetchall()
-            if top_producoes:
-                print("\nTop 5 registros com mais produções:")
-                for i, (nome, tipo, ano, qtd) in enumerate(top_producoes, 1):
-                    print(f"   {i}. {nome}")
-                    print(f"      Tipo: {tipo} | Ano: {ano} | Quantidade: {qtd}")
-                    print()
+                top_producoes = cursor.fetchall()
+                if top_producoes:
+                    print("\nTop 5 registros com mais produções:")
+                    for i, (nome, tipo, ano, qtd) in enumerate(top_producoes, 1):
+                        print(f"   {i}. {nome}")
+                        print(f"      Tipo: {tipo} | Ano: {ano} | Quantidade: {qtd}")
+                        print()
         
     except Exception as e:
         print(f"Erro ao popular fato_pesquisador_producoes: {e}")
@@ -0,0 +1,211 @@
+"""
+Métricas da rede de coautoria por pesquisador (dw.metricas_coautoria_pesquisador).
+
+A rede é montada uma vez, a partir de dw.fato_coautoria, como matriz de
+adjacência esparsa (scipy.sparse) com o total de produções de cada par:
+
+    grau                Número de coautores distintos
+    grau_ponderado      Soma das produções em coautoria
+    id_componente       Componente conexo (scipy.sparse.csgraph)
+    tamanho_componente  Pesquisadores no mesmo componente
+    intermediacao       Betweenness normalizada, aproximada pelo algoritmo de
+                        Brandes a partir de uma amostra de origens
+
+O número de origens amostradas vem de ETL_COAUTORIA_AMOSTRAS (padrão 500;
+com menos pesquisadores que isso o cálculo é exato). A amostra usa semente
+fixa, então execuções sobre os mesmos dados dão o mesmo resultado.
+
+Requer scipy (pip install scipy).
+"""
+
+import sys
+import os
+from collections import deque
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+
+AMOSTRAS_PADRAO = 500
+SEMENTE = 42
+
+
+def _importar_scipy():
+    try:
+        import numpy as np
+        from scipy import sparse
+        from scipy.sparse import csgraph
+    except ImportError:
+        raise RuntimeError("As métricas de coautoria precisam do pacote scipy (pip install scipy)")
+    return np, sparse, csgraph
+
+
+def montar_matriz(ids, arestas):
+    """
+    Monta a matriz de adjacência simétrica da rede.
+
+    Args:
+        ids (list): id_pesquisador de cada vértice, na ordem das linhas da matriz
+        arestas (list): Tuplas (id_pesquisador_a, id_pesquisador_b, qtd_producoes)
+
+    Returns:
+        scipy.sparse.csr_matrix: Pesos (produções em coautoria) de cada par
+    """
+    np, sparse, _ = _importar_scipy()
+    posicao = {id_pesquisador: i for i, id_pesquisador in enumerate(ids)}
+    origem = np.fromiter((posicao[a] for a, _, _ in arestas), dtype=np.int64, count=len(arestas))
+    destino = np.fromiter((posicao[b] for _, b, _ in arestas), dtype=np.int64, count=len(arestas))
+    pesos = np.fromiter((qtd for _, _, qtd in arestas), dtype=np.int64, count=len(arestas))
+    matriz = sparse.coo_matrix(
+        (np.concatenate([pesos, pesos]), (np.concatenate([origem, destino]), np.concatenate([destino, origem]))),
+        shape=(len(ids), len(ids)),
+    )
+    return matriz.tocsr()
+
+
+def intermediacao_aproximada(matriz, amostras=AMOSTRAS_PADRAO, semente=SEMENTE):
+    """
+    Betweenness dos vértices (rede não ponderada) pelo algoritmo de Brandes,
+    acumulando só as buscas em largura que partem de `amostras` origens
+    sorteadas e extrapolando para o total de vértices.
+
+    Args:
+        matriz (scipy.sparse.csr_matrix): Adjacência simétrica
+        amostras (int): Número de origens (>= vértices: cálculo exato)
+        semente (int): Semente do sorteio das origens
+
+    Returns:
+        numpy.ndarray: Intermediação normalizada para [0, 1]
+    """
+    np, _, _ = _importar_scipy()
+    n = matriz.shape[0]
+    intermediacao = np.zeros(n)
+    if n < 3:
+        return intermediacao
+
+    indptr, indices = matriz.indptr, matriz.indices
+    if amostras >= n:
+        origens = range(n)
+        escala = 1.0
+    else:
+        origens = np.random.default_rng(semente).choice(n, size=amostras, replace=False)
+        escala = n / amostras
+
+    for s in origens:
+        if indptr[s] == indptr[s + 1]:
+            continue  # pesquisador sem coautores não está em caminho nenhum
+        pilha = []
+        antecessores = {s: []}
+        caminhos = {s: 1}
+        distancia = {s: 0}
+        fila = deque([s])
+        while fila:
+            v = fila.popleft()
+            pilha.append(v)
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if w not in distancia:
+                    distancia[w] = distancia[v] + 1
+                    caminhos[w] = 0
+                    antecessores[w] = []
+                    fila.append(w)
+                if distancia[w] == distancia[v] + 1:
+                    caminhos[w] += caminhos[v]
+                    antecessores[w].append(v)
+
+        dependencia = dict.fromkeys(pilha, 0.0)
+        while pilha:
+            w = pilha.pop()
+            for v in antecessores[w]:
+                dependencia[v] += caminhos[v] / caminhos[w] * (1 + dependencia[w])
+            if w != s:
+                intermediacao[w] += dependencia[w]
+
+    # Rede não direcionada: cada par é contado nas duas direções
+    return intermediacao * escala / 2 / ((n - 1) * (n - 2) / 2)
+
+
+def calcular_metricas(ids, arestas, amostras=AMOSTRAS_PADRAO):
+    """
+    Calcula as métricas de rede de cada pesquisador.
+
+    Args:
+        ids (list): id_pesquisador de todos os pesquisadores (inclusive isolados)
+        arestas (list): Tuplas (id_pesquisador_a, id_pesquisador_b, qtd_producoes)
+        amostras (int): Origens usadas na aproximação da intermediação
+
+    Returns:
+        list: Tuplas (id_pesquisador, grau, grau_ponderado, id_componente,
+              tamanho_componente, intermediacao)
+    """
+    np, _, csgraph = _importar_scipy()
+    matriz = montar_matriz(ids, arestas)
+
+    grau = np.diff(matriz.indptr)
+    grau_ponderado = np.asarray(matriz.sum(axis=1)).ravel()
+    _, componentes = csgraph.connected_components(matriz, directed=False)
+    tamanhos = np.bincount(componentes)
+    intermediacao = intermediacao_aproximada(matriz, amostras)
+
+    return [
+        (int(id_pesquisador), int(grau[i]), int(grau_ponderado[i]), int(componentes[i]),
+         int(tamanhos[componentes[i]]), float(intermediacao[i]))
+        for i, id_pesquisador in enumerate(ids)
+    ]
+
+
+def popular_metricas_coautoria():
+    """
+    Recalcula dw.metricas_coautoria_pesquisador a partir de dw.fato_coautoria.
+    """
+
+    try:
+        from psycopg2.extras import execute_values
+
+        amostras = int(os.getenv('ETL_COAUTORIA_AMOSTRAS', AMOSTRAS_PADRAO))
+
+        with medir_etapa('dw.metricas_coautoria_pesquisador') as metricas, obter_cursor() as cursor:
+            with metricas.fase('leitura'):
+                cursor.execute("SELECT id_pesquisador FROM dw.dim_pesquisador WHERE atual ORDER BY id_pesquisador;")
+                ids = [linha[0] for linha in cursor.fetchall()]
+                cursor.execute("""
+                    SELECT id_pesquisador_a, id_pesquisador_b, SUM(qtd_producoes)
+                    FROM dw.fato_coautoria
+                    GROUP BY id_pesquisador_a, id_pesquisador_b;
+                """)
+                arestas = cursor.fetchall()
+            metricas.linhas_lidas = len(arestas)
+
+            with metricas.fase('calculo'):
+                linhas = calcular_metricas(ids, arestas, amostras)
+
+            with metricas.fase('insercao'):
+                cursor.execute("TRUNCATE dw.metricas_coautoria_pesquisador;")
+                execute_values(cursor, """
+                    INSERT INTO dw.metricas_coautoria_pesquisador (
+                        id_pesquisador,
+                        grau,
+                        grau_ponderado,
+                        id_componente,
+                        tamanho_componente,
+                        intermediacao
+                    ) VALUES %s
+                """, linhas, page_size=5000)
+            metricas.linhas_gravadas = len(linhas)
+            metricas.registrar(pesquisadores=len(ids), pares=len(arestas),
+                               amostras_intermediacao=min(amostras, len(ids)))
+
+            if diagnostico_ativo():
+                conectados = [linha for linha in linhas if linha[1] > 0]
+                componentes = {linha[3] for linha in conectados}
+                maior = max((linha[4] for linha in conectados), default=0)
+                print("\nEstatísticas da rede de coautoria:")
+                print(f"   Pesquisadores com coautores: {len(conectados)} de {len(linhas)}")
+                print(f"   Componentes (sem isolados): {len(componentes)}")
+                print(f"   Maior componente: {maior} pesquisadores")
+
+    except Exception as e:
+        print(f"Erro ao popular metricas_coautoria_pesquisador: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    popular_metricas_coautoria()
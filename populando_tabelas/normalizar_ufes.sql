@@ -2,7 +2,8 @@ SELECT
     COUNT(*) as registros_afetados,
     'Serão padronizados para: Universidade Federal do Espírito Santo' as mensagem
 FROM dw.dim_pesquisador
-WHERE atuacao_profissional ~* 'federal do esp[ií]rito santo'
+WHERE atual
+  AND atuacao_profissional ~* 'federal do esp[ií]rito santo'
   AND atuacao_profissional !~* 'instituto'
   AND atuacao_profissional !~* 'regional'
   AND atuacao_profissional !~* 'justiça'
@@ -14,7 +15,8 @@ SELECT
     atuacao_profissional as valor_atual,
     'Universidade Federal do Espírito Santo' as novo_valor
 FROM dw.dim_pesquisador
-WHERE atuacao_profissional ~* 'federal do esp[ií]rito santo'
+WHERE atual
+  AND atuacao_profissional ~* 'federal do esp[ií]rito santo'
   AND atuacao_profissional !~* 'instituto'
   AND atuacao_profissional !~* 'regional'
   AND atuacao_profissional !~* 'justiça'
@@ -22,9 +24,12 @@ WHERE atuacao_profissional ~* 'federal do esp[ií]rito santo'
 LIMIT 10;
 
 
+-- Só a versão vigente; hash_linha acompanha o novo valor (ver dim_pesquisador.py)
 UPDATE dw.dim_pesquisador
-SET atuacao_profissional = 'Universidade Federal do Espírito Santo'
-WHERE atuacao_profissional ~* 'federal do esp[ií]rito santo'
+SET atuacao_profissional = 'Universidade Federal do Espírito Santo',
+    hash_linha = md5(nome || '|' || 'Universidade Federal do Espírito Santo')
+WHERE atual
+  AND atuacao_profissional ~* 'federal do esp[ií]rito santo'
   AND atuacao_profissional !~* 'instituto'
   AND atuacao_profissional !~* 'regional'
   AND atuacao_profissional !~* 'justiça'
@@ -34,7 +39,8 @@ SELECT
     COUNT(*) as total_ufes,
     'Universidade Federal do Espírito Santo' as atuacao_padronizada
 FROM dw.dim_pesquisador
-WHERE atuacao_profissional = 'Universidade Federal do Espírito Santo';
+WHERE atual
+  AND atuacao_profissional = 'Universidade Federal do Espírito Santo';
 
 COMMIT;
 
@@ -0,0 +1,129 @@
+"""
+Partições por década das tabelas fato particionadas por ano.
+
+dw.fato_pesquisador_producoes e dw.fato_pesquisador_producao_localizacao
+são particionadas por RANGE (id_tempo), uma partição por década
+(ver criar_tabelas_fato.sql). As partições são criadas pelo pipeline,
+antes de cada carga, para todas as décadas entre ANO_INICIAL e ANO_FINAL.
+
+Cada carga trunca e recarrega só as décadas selecionadas, na mesma
+transação do INSERT. Décadas antigas podem ser congeladas: ficam fora das
+recargas e seus dados são mantidos.
+
+Variáveis de ambiente:
+    ETL_DECADAS            Décadas a recarregar, separadas por vírgula
+                           (ex: '2010,2020'). Padrão: todas
+    ETL_CONGELAR_ANTES_DE  Ano: décadas que terminam antes dele não são
+                           recarregadas (ex: 2000 congela até a de 1990)
+
+Uso:
+    decadas = decadas_recarga()
+    with obter_cursor() as cursor:
+        preparar_recarga(cursor, 'dw.fato_pesquisador_producoes', decadas)
+        cursor.execute(f"INSERT ... WHERE {filtro_decadas('x.ano::INT', decadas)}")
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from populando_tabelas.dim_tempo import ANO_INICIAL, ANO_FINAL
+
+TAMANHO_PARTICAO = 10
+
+TABELAS_PARTICIONADAS = [
+    'dw.fato_pesquisador_producoes',
+    'dw.fato_pesquisador_producao_localizacao',
+]
+
+
+def todas_decadas():
+    """Início de cada década entre ANO_INICIAL e ANO_FINAL."""
+    primeira = ANO_INICIAL // TAMANHO_PARTICAO * TAMANHO_PARTICAO
+    return list(range(primeira, ANO_FINAL + 1, TAMANHO_PARTICAO))
+
+
+def nome_particao(tabela, decada):
+    """Nome da partição de uma década (ex: dw.fato_pesquisador_producoes_2010)."""
+    return f"{tabela}_{decada}"
+
+
+def decadas_recarga():
+    """
+    Décadas a recarregar nesta execução (ver ETL_DECADAS e
+    ETL_CONGELAR_ANTES_DE).
+
+    Returns:
+        list: Início de cada década, em ordem
+
+    Raises:
+        ValueError: Se ETL_DECADAS tiver um valor que não é início de década
+            do intervalo de anos
+    """
+    decadas = todas_decadas()
+    selecionadas = os.getenv('ETL_DECADAS', '').strip()
+    if selecionadas:
+        pedidas = sorted({int(valor) for valor in selecionadas.split(',') if valor.strip()})
+        invalidas = [decada for decada in pedidas if decada not in decadas]
+        if invalidas:
+            raise ValueError(f"Décadas fora do intervalo {ANO_INICIAL}-{ANO_FINAL}: "
+                             f"{', '.join(map(str, invalidas))}")
+        decadas = pedidas
+
+    congelar_antes_de = os.getenv('ETL_CONGELAR_ANTES_DE', '').strip()
+    if congelar_antes_de:
+        decadas = [d for d in decadas if d + TAMANHO_PARTICAO > int(congelar_antes_de)]
+    return decadas
+
+
+def criar_particoes(cursor, tabela):
+    """
+    Cria as partições de década que ainda não existem.
+
+    Args:
+        cursor: Cursor aberto
+        tabela (str): Tabela particionada (ex: 'dw.fato_pesquisador_producoes')
+    """
+    for decada in todas_decadas():
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {nome_particao(tabela, decada)}
+            PARTITION OF {tabela}
+            FOR VALUES FROM ({decada}) TO ({decada + TAMANHO_PARTICAO});
+        """)
+
+
+def preparar_recarga(cursor, tabela, decadas):
+    """
+    Garante as partições e trunca as das décadas a recarregar.
+
+    O TRUNCATE roda na transação do cursor: se a carga falhar, as
+    partições voltam ao estado anterior.
+
+    Args:
+        cursor: Cursor aberto (o mesmo da carga)
+        tabela (str): Tabela particionada
+        decadas (list): Décadas a recarregar (ver decadas_recarga)
+    """
+    criar_particoes(cursor, tabela)
+    if decadas:
+        particoes = ', '.join(nome_particao(tabela, decada) for decada in decadas)
+        cursor.execute(f"TRUNCATE {particoes};")
+
+
+def filtro_decadas(coluna_ano, decadas):
+    """
+    Predicado SQL que limita a carga às décadas recarregadas.
+
+    Args:
+        coluna_ano (str): Expressão SQL do ano (inteiro) na origem
+        decadas (list): Décadas a recarregar (ver decadas_recarga)
+
+    Returns:
+        str: Predicado SQL ('FALSE' se não há década a recarregar)
+    """
+    if not decadas:
+        return "FALSE"
+    if decadas == todas_decadas():
+        return f"{coluna_ano} BETWEEN {ANO_INICIAL} AND {ANO_FINAL}"
+    return (f"{coluna_ano} BETWEEN {ANO_INICIAL} AND {ANO_FINAL}"
+            f" AND {coluna_ano} / {TAMANHO_PARTICAO} * {TAMANHO_PARTICAO}"
+            f" IN ({', '.join(map(str, decadas))})")
@@ -0,0 +1,348 @@
+"""
+Deduplicação de produções entre currículos (dw.producao_canonica).
+
+Quando vários pesquisadores da UFES são coautores de uma produção, ela
+aparece uma vez em cada currículo. Este passo agrupa esses registros das
+tabelas stg de produção e atribui a cada um o id da produção canônica,
+permitindo contar produções distintas da instituição.
+
+Dentro do mesmo tipo de produção, dois registros são a mesma produção quando:
+
+    doi       Têm o mesmo DOI (normalizado)
+    titulo    Têm o mesmo título normalizado no mesmo ano
+    veiculo   Saíram no mesmo ano e no mesmo ISSN/ISBN e os títulos têm
+              similaridade de Jaccard >= ETL_DEDUP_LIMIAR_VEICULO (0.6).
+              ISSN/ISBN identificam o periódico ou livro, não a produção,
+              por isso servem só para aproximar os candidatos.
+    minhash   Saíram no mesmo ano e os títulos têm similaridade de Jaccard
+              >= ETL_DEDUP_LIMIAR (0.8)
+
+A similaridade é calculada sobre trigramas de caracteres do título
+normalizado. Para não comparar todos os pares, os candidatos são agrupados
+por chaves de bloco: (tipo, ano, DOI), (tipo, ano, título), (tipo, ano,
+ISSN/ISBN) e (tipo, ano, banda da assinatura MinHash). As bandas (LSH)
+fazem com que só títulos com alta probabilidade de serem parecidos caiam
+no mesmo bloco. Os blocos de veículo não passam por esse filtro: um
+periódico publica centenas de artigos por ano, e comparar todos os pares
+seria quadrático. Até TAMANHO_MAXIMO_BLOCO_VEICULO registros todos os
+pares do bloco são comparados; acima disso, o bloco é subdividido pelas
+bandas e só os pares que também dividem uma banda são comparados. Assim
+cada bloco custa no máximo O(TAMANHO_MAXIMO_BLOCO_VEICULO²) comparações,
+e o total cresce com o número de blocos, não com o quadrado do tamanho do
+maior veículo. Títulos muito curtos ("Editorial", "Apresentação") só são
+unidos por DOI ou pelo mesmo título exato no mesmo veículo.
+
+O identificador de cada registro é o mesmo hash_producao de stg.autoria
+(ver stage/extrator.hash_producao).
+"""
+
+import sys
+import os
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+
+# tabela stg: (tipo de produção, coluna do título, coluna do DOI, coluna do ISSN/ISBN)
+FONTES = {
+    'stg.artigos': ('Artigo', 'titulo', 'doi', 'issn'),
+    'stg.livros': ('Livro', 'titulo', None, None),
+    'stg.capitulos_livros': ('Capítulo de Livro', 'titulo_capitulo', 'doi', 'isbn'),
+    'stg.textos_jornais': ('Texto em Jornal', 'titulo', 'doi', 'issn'),
+    'stg.trabalhos_eventos': ('Trabalho em Evento', 'titulo', 'doi', 'isbn'),
+    'stg.apresentacoes_trabalho': ('Apresentação de Trabalho', 'titulo', 'doi', None),
+    'stg.outras_producoes': ('Outras Produções', 'titulo', 'doi', 'issn_isbn'),
+}
+
+LIMIAR_PADRAO = 0.8
+LIMIAR_VEICULO_PADRAO = 0.6
+TAMANHO_MINIMO_TITULO = 20      # caracteres do título normalizado
+TAMANHO_SHINGLE = 3
+NUM_PERMUTACOES = 32
+NUM_BANDAS = 8                  # 8 bandas de 4 linhas: candidatos a partir de ~0.6 de similaridade
+TAMANHO_MAXIMO_BLOCO_VEICULO = 50   # acima disso, só pares do veículo que dividem uma banda
+SEMENTE = 42
+
+_rng = np.random.default_rng(SEMENTE)
+_COEF_A = _rng.integers(1, 2 ** 63, NUM_PERMUTACOES, dtype=np.uint64) | np.uint64(1)   # ímpares
+_COEF_B = _rng.integers(0, 2 ** 63, NUM_PERMUTACOES, dtype=np.uint64)
+
+_NAO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+
+Producao = namedtuple('Producao', ['hash_producao', 'tabela_origem', 'id_lattes', 'titulo', 'ano', 'doi', 'veiculo'])
+
+
+def normalizar_titulo(titulo):
+    """Título sem acentos, em minúsculas e só com letras, dígitos e espaços simples."""
+    if not titulo:
+        return ''
+    texto = unicodedata.normalize('NFKD', titulo).encode('ascii', 'ignore').decode('ascii').lower()
+    return ' '.join(_NAO_ALFANUMERICO.sub(' ', texto).split())
+
+
+def normalizar_doi(doi):
+    """DOI em minúsculas, sem prefixo de URL ('https://doi.org/', 'doi:')."""
+    if not doi:
+        return ''
+    doi = doi.strip().lower()
+    doi = re.sub(r'^(https?://)?(dx\.)?doi\.org/', '', doi)
+    doi = re.sub(r'^doi:\s*', '', doi)
+    return doi if doi.startswith('10.') else ''
+
+
+def normalizar_veiculo(codigo):
+    """ISSN/ISBN só com dígitos e X."""
+    return re.sub(r'[^0-9X]', '', (codigo or '').upper())
+
+
+def shingles(titulo):
+    """Trigramas de caracteres do título normalizado."""
+    if len(titulo) <= TAMANHO_SHINGLE:
+        return {titulo}
+    return {titulo[i:i + TAMANHO_SHINGLE] for i in range(len(titulo) - TAMANHO_SHINGLE + 1)}
+
+
+def assinaturas_minhash(titulos, caracteres_por_lote=200_000):
+    """
+    Assinaturas MinHash dos trigramas de vários títulos normalizados.
+
+    Os trigramas são lidos direto dos bytes dos títulos (só ASCII depois de
+    normalizar_titulo) e cada permutação é um hash multiplicativo
+    (a * x + b) >> 32 em 64 bits, tudo vetorizado por lote.
+
+    O lote é limitado pelo total de caracteres, não de títulos: a matriz de
+    permutações tem NUM_PERMUTACOES x trigramas do lote em uint64 (com
+    200 mil caracteres, cerca de 50MB, e o dobro no pico da conta).
+
+    Args:
+        titulos (list): Títulos normalizados com pelo menos TAMANHO_SHINGLE caracteres
+        caracteres_por_lote (int): Caracteres processados por operação vetorizada
+            (um título maior que isso forma um lote sozinho)
+
+    Returns:
+        numpy.ndarray: Matriz (len(titulos), NUM_PERMUTACOES)
+    """
+    assinaturas = np.empty((len(titulos), NUM_PERMUTACOES), dtype=np.uint64)
+    inicio = 0
+    while inicio < len(titulos):
+        fim, caracteres = inicio + 1, len(titulos[inicio])
+        while fim < len(titulos) and caracteres + len(titulos[fim]) <= caracteres_por_lote:
+            caracteres += len(titulos[fim])
+            fim += 1
+        parte = titulos[inicio:fim]
+        tamanhos = np.fromiter((len(t) for t in parte), dtype=np.int64, count=len(parte))
+        texto = np.frombuffer(''.join(parte).encode('ascii'), dtype=np.uint8).astype(np.uint64)
+        trigramas = (texto[:-2] << np.uint64(16)) | (texto[1:-1] << np.uint64(8)) | texto[2:]
+        # Descarta os trigramas que atravessam a fronteira entre dois títulos
+        validos = np.ones(len(texto), dtype=bool)
+        fins = np.cumsum(tamanhos)
+        validos[fins - 1] = False
+        validos[fins - 2] = False
+        trigramas = trigramas[validos[:-2]]
+        with np.errstate(over='ignore'):
+            permutados = (_COEF_A[:, None] * trigramas + _COEF_B[:, None]) >> np.uint64(32)
+        inicios = np.concatenate(([0], np.cumsum(tamanhos - (TAMANHO_SHINGLE - 1))[:-1]))
+        assinaturas[inicio:fim] = np.minimum.reduceat(permutados, inicios, axis=1).T
+        inicio = fim
+    return assinaturas
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class UniaoBusca:
+    """Union-find com compressão de caminho; guarda o critério da primeira união de cada registro."""
+
+    def __init__(self, n):
+        self.pai = list(range(n))
+        self.criterio = [None] * n
+
+    def raiz(self, i):
+        while self.pai[i] != i:
+            self.pai[i] = self.pai[self.pai[i]]
+            i = self.pai[i]
+        return i
+
+    def unir(self, i, j, criterio):
+        raiz_i, raiz_j = self.raiz(i), self.raiz(j)
+        if raiz_i == raiz_j:
+            return False
+        self.pai[max(raiz_i, raiz_j)] = min(raiz_i, raiz_j)
+        for k in (i, j):
+            if self.criterio[k] is None:
+                self.criterio[k] = criterio
+        return True
+
+
+def agrupar_producoes(producoes, limiar=LIMIAR_PADRAO, limiar_veiculo=LIMIAR_VEICULO_PADRAO):
+    """
+    Agrupa registros que representam a mesma produção.
+
+    Args:
+        producoes (list): Registros Producao (hash_producao único)
+        limiar (float): Similaridade mínima de títulos no mesmo tipo e ano
+        limiar_veiculo (float): Similaridade mínima quando o ISSN/ISBN também coincide
+
+    Returns:
+        tuple: ([(id_producao_canonica, critério) por registro, na ordem de
+               `producoes`], {critério: uniões feitas})
+    """
+    n = len(producoes)
+    uniao = UniaoBusca(n)
+    unioes = defaultdict(int)
+    titulos = [normalizar_titulo(p.titulo) for p in producoes]
+
+    # 1. Chaves exatas: DOI (no tipo) e título normalizado (no tipo e ano)
+    blocos = defaultdict(list)
+    for i, p in enumerate(producoes):
+        tipo = FONTES[p.tabela_origem][0]
+        doi = normalizar_doi(p.doi)
+        if doi:
+            blocos[('doi', tipo, doi)].append(i)
+        if len(titulos[i]) >= TAMANHO_MINIMO_TITULO:
+            blocos[('titulo', tipo, p.ano, titulos[i])].append(i)
+        elif titulos[i] and normalizar_veiculo(p.veiculo):
+            blocos[('titulo', tipo, p.ano, titulos[i], normalizar_veiculo(p.veiculo))].append(i)
+    for chave, membros in blocos.items():
+        for j in membros[1:]:
+            if uniao.unir(membros[0], j, chave[0]):
+                unioes[chave[0]] += 1
+
+    # 2. Chaves aproximadas: um representante por título distinto no tipo e ano
+    representantes = {}
+    for i, p in enumerate(producoes):
+        if len(titulos[i]) >= TAMANHO_MINIMO_TITULO:
+            representantes.setdefault((FONTES[p.tabela_origem][0], p.ano, titulos[i]), i)
+    if representantes:
+        assinaturas = assinaturas_minhash([titulos[i] for i in representantes.values()])
+        # Cada banda (LSH) vira uma única chave de 64 bits; colisões só geram candidatos a mais
+        with np.errstate(over='ignore'):
+            bandas = (assinaturas.reshape(len(assinaturas), NUM_BANDAS, -1) * _COEF_A[:NUM_PERMUTACOES // NUM_BANDAS]).sum(axis=2)
+    else:
+        # Nenhum título longo o bastante: só as chaves exatas (DOI, título no veículo) valem
+        bandas = np.empty((0, NUM_BANDAS), dtype=np.uint64)
+    conjuntos = {}
+
+    blocos = defaultdict(list)
+    veiculos = defaultdict(list)
+    bandas_por_registro = {}
+    for ((tipo, ano, _), i), chaves_banda in zip(representantes.items(), bandas.tolist()):
+        bandas_por_registro[i] = chaves_banda
+        veiculo = normalizar_veiculo(producoes[i].veiculo)
+        if veiculo:
+            veiculos[('veiculo', tipo, ano, veiculo)].append(i)
+        for banda, chave_banda in enumerate(chaves_banda):
+            blocos[('minhash', tipo, ano, banda, chave_banda)].append(i)
+    # Veículos grandes: subdivididos pelas bandas para não comparar todos os pares
+    for chave, membros in veiculos.items():
+        if len(membros) <= TAMANHO_MAXIMO_BLOCO_VEICULO:
+            blocos[chave] = membros
+            continue
+        for i in membros:
+            for banda, chave_banda in enumerate(bandas_por_registro[i]):
+                blocos[chave + (banda, chave_banda)].append(i)
+
+    for chave, membros in blocos.items():
+        if len(membros) < 2:
+            continue
+        criterio = chave[0]
+        minimo = limiar_veiculo if criterio == 'veiculo' else limiar
+        for a in range(len(membros)):
+            for b in range(a + 1, len(membros)):
+                i, j = membros[a], membros[b]
+                if uniao.raiz(i) == uniao.raiz(j):
+                    continue
+                for k in (i, j):
+                    if k not in conjuntos:
+                        conjuntos[k] = shingles(titulos[k])
+                if jaccard(conjuntos[i], conjuntos[j]) >= minimo:
+                    uniao.unir(i, j, criterio)
+                    unioes[criterio] += 1
+
+    # Ids canônicos estáveis: na ordem do menor hash de cada grupo
+    grupos = defaultdict(list)
+    for i in range(n):
+        grupos[uniao.raiz(i)].append(i)
+    ordem = sorted(grupos.values(), key=lambda membros: min(producoes[i].hash_producao for i in membros))
+    resultado = [None] * n
+    for id_canonica, membros in enumerate(ordem, 1):
+        for i in membros:
+            resultado[i] = (id_canonica, uniao.criterio[i] or 'unica')
+    return resultado, dict(unioes)
+
+
+def _query_producoes():
+    partes = []
+    for tabela, (_, titulo, doi, veiculo) in FONTES.items():
+        partes.append(f"""
+            SELECT
+                md5(concat_ws('|', '{tabela}', id_lattes, {titulo}, ano)),
+                '{tabela}',
+                id_lattes,
+                {titulo},
+                ano,
+                {doi or 'NULL'},
+                {veiculo or 'NULL'}
+            FROM {tabela}""")
+    return '\n            UNION ALL'.join(partes) + ';'
+
+
+def popular_producao_canonica():
+    """
+    Recalcula dw.producao_canonica a partir das tabelas stg de produção.
+    """
+
+    try:
+        from psycopg2.extras import execute_values
+
+        limiar = float(os.getenv('ETL_DEDUP_LIMIAR', LIMIAR_PADRAO))
+        limiar_veiculo = float(os.getenv('ETL_DEDUP_LIMIAR_VEICULO', LIMIAR_VEICULO_PADRAO))
+
+        with medir_etapa('dw.producao_canonica') as metricas, obter_cursor() as cursor:
+            with metricas.fase('leitura'):
+                cursor.execute(_query_producoes())
+                # O mesmo hash (registro repetido no currículo) é a mesma produção
+                producoes = list({linha[0]: Producao(*linha) for linha in cursor.fetchall()}.values())
+            metricas.linhas_lidas = len(producoes)
+
+            with metricas.fase('agrupamento'):
+                grupos, unioes = agrupar_producoes(producoes, limiar, limiar_veiculo)
+
+            with metricas.fase('insercao'):
+                cursor.execute("TRUNCATE dw.producao_canonica;")
+                execute_values(cursor, """
+                    INSERT INTO dw.producao_canonica (
+                        hash_producao,
+                        id_producao_canonica,
+                        tabela_origem,
+                        id_lattes,
+                        ano,
+                        criterio
+                    ) VALUES %s
+                """, [
+                    (p.hash_producao, id_canonica, p.tabela_origem, p.id_lattes,
+                     int(p.ano) if p.ano and re.fullmatch(r'[0-9]{4}', p.ano) else None, criterio)
+                    for p, (id_canonica, criterio) in zip(producoes, grupos)
+                ], page_size=5000)
+            metricas.linhas_gravadas = len(producoes)
+            canonicas = len({id_canonica for id_canonica, _ in grupos})
+            metricas.registrar(producoes_canonicas=canonicas, unioes=unioes)
+
+            if diagnostico_ativo():
+                print("\nEstatísticas da producao_canonica:")
+                print(f"   Registros nos currículos: {len(producoes)}")
+                print(f"   Produções distintas: {canonicas}")
+                for criterio, total in sorted(unioes.items()):
+                    print(f"   • Uniões por {criterio}: {total}")
+
+    except Exception as e:
+        print(f"Erro ao popular producao_canonica: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    popular_producao_canonica()
@@ -0,0 +1,323 @@
+"""
+Verificações de qualidade de dados do DW.
+
+As verificações são declaradas por tabela em VERIFICACOES e compiladas
+para uma única consulta agregada por tabela: cada verificação vira uma
+coluna do SELECT (COUNT ... FILTER, COUNT DISTINCT) e as de integridade
+referencial viram LEFT JOINs com as dimensões (ou com uma subconsulta
+DISTINCT da chave), que são únicas na chave e não multiplicam linhas. Cada tabela é lida uma vez, e as tabelas são
+verificadas em paralelo, cada uma na sua conexão.
+
+Tipos de verificação (valor calculado -> aprovado se):
+    linhas      COUNT(*)                              >= minimo
+    unico       linhas repetidas nas colunas          <= maximo (padrão 0)
+    nulos       fração de NULL ou ''                  <= maximo
+    intervalo   valores fora de [minimo, maximo]      <= tolerancia (padrão 0)
+    referencia  chaves sem linha na dimensão          <= maximo (padrão 0)
+
+Os resultados (valor, limite e aprovação de cada verificação) são gravados
+em dq.resultados com o id da execução. Se alguma verificação reprova, a
+etapa falha depois de gravar e o pipeline para antes de recalcular os
+agregados (resumo_pesquisador, cubo_producoes, metricas_coautoria), que
+continuam com a última carga aprovada. Dimensões e fatos já foram
+recarregados a essa altura: as páginas que os leem diretamente mostram a
+carga reprovada até a próxima execução aprovada.
+
+Variáveis de ambiente:
+    ETL_DQ_PARALELISMO  Tabelas verificadas ao mesmo tempo (padrão: 4)
+"""
+
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, id_execucao, medir_etapa
+from populando_tabelas.dim_tempo import ANO_INICIAL, ANO_FINAL
+from populando_tabelas.referencia import TIPOS_PRODUCAO
+
+PARALELISMO_PADRAO = 4
+
+# Chave durável: as fatos guardam pesquisadores que já saíram do staging
+# (versão encerrada na dim tipo 2, partições congeladas), e isso não é erro.
+# DISTINCT mantém uma linha por chave, como nas outras dimensões
+REF_PESQUISADOR = {
+    'dimensao': '(SELECT DISTINCT id_pesquisador FROM dw.dim_pesquisador)',
+    'chave': 'id_pesquisador',
+}
+REF_TEMPO = {'dimensao': 'dw.dim_tempo', 'chave': 'id_tempo'}
+REF_TIPO = {'dimensao': 'dw.dim_tipo_producao', 'chave': 'id_tipo_producao'}
+
+# Por tabela: condição opcional (linhas verificadas) e lista de verificações
+VERIFICACOES = {
+    'dw.dim_pesquisador': {
+        # Dimensão tipo 2: só as versões vigentes
+        'condicao': 'atual',
+        'verificacoes': [
+            {'tipo': 'linhas', 'minimo': 1},
+            {'tipo': 'unico', 'colunas': ['id_lattes']},
+            {'tipo': 'unico', 'colunas': ['id_pesquisador']},
+            {'tipo': 'nulos', 'coluna': 'nome', 'maximo': 0},
+            {'tipo': 'nulos', 'coluna': 'atuacao_profissional', 'maximo': 0},
+        ],
+    },
+    'dw.dim_area': {
+        'verificacoes': [
+            {'tipo': 'linhas', 'minimo': 1},
+            {'tipo': 'unico', 'colunas': ['grande_area', 'area']},
+            {'tipo': 'nulos', 'coluna': 'area', 'maximo': 0},
+        ],
+    },
+    'dw.dim_linha_pesquisa': {
+        'verificacoes': [
+            {'tipo': 'linhas', 'minimo': 1},
+            {'tipo': 'unico', 'colunas': ['linha_pesquisa']},
+        ],
+    },
+    'dw.dim_tempo': {
+        'verificacoes': [
+            {'tipo': 'linhas', 'minimo': ANO_FINAL - ANO_INICIAL + 1},
+            {'tipo': 'unico', 'colunas': ['id_tempo']},
+            {'tipo': 'intervalo', 'coluna': 'id_tempo', 'minimo': ANO_INICIAL, 'maximo': ANO_FINAL},
+        ],
+    },
+    'dw.dim_tipo_producao': {
+        'verificacoes': [
+            {'tipo': 'linhas', 'minimo': len(TIPOS_PRODUCAO)},
+            {'tipo': 'unico', 'colunas': ['tipo_producao']},
+        ],
+    },
+    'dw.dim_localizacao_trabalhos': {
+        'verificacoes': [
+            {'tipo': 'linhas', 'minimo': 1},
+            {'tipo': 'unico', 'colunas': ['id_lattes', 'pais', 'instituicao']},
+            # Ausência é gravada como 'Não se aplica.'
+            {'tipo': 'nulos', 'coluna': 'pais', 'maximo': 0},
+            {'tipo': 'nulos', 'coluna': 'instituicao', 'maximo': 0},
+        ],
+    },
+    'dw.fato_pesquisador_producoes': {
+        'verificacoes': [
+            {'tipo': 'linhas', 'minimo': 1},
+            {'tipo': 'unico', 'colunas': ['id_pesquisador', 'id_tempo', 'id_tipo_producao']},
+            {'tipo': 'intervalo', 'coluna': 'qtd_producoes', 'minimo': 1},
+            {'tipo': 'referencia', 'coluna': 'id_pesquisador', **REF_PESQUISADOR},
+            {'tipo': 'referencia', 'coluna': 'id_tempo', **REF_TEMPO},
+            {'tipo': 'referencia', 'coluna': 'id_tipo_producao', **REF_TIPO},
+        ],
+    },
+    'dw.fato_pesquisador_area_atuacao': {
+        'verificacoes': [
+            {'tipo': 'referencia', 'coluna': 'id_pesquisador', **REF_PESQUISADOR},
+            {'tipo': 'referencia', 'coluna': 'id_area', 'dimensao': 'dw.dim_area', 'chave': 'id_area'},
+        ],
+    },
+    'dw.fato_pesquisador_linha_pesquisa': {
+        'verificacoes': [
+            {'tipo': 'referencia', 'coluna': 'id_pesquisador', **REF_PESQUISADOR},
+            {'tipo': 'referencia', 'coluna': 'id_linha_pesquisa',
+             'dimensao': 'dw.dim_linha_pesquisa', 'chave': 'id_linha_pesquisa'},
+        ],
+    },
+    'dw.fato_pesquisador_producao_localizacao': {
+        'verificacoes': [
+            {'tipo': 'intervalo', 'coluna': 'qtd_producoes', 'minimo': 1},
+            {'tipo': 'referencia', 'coluna': 'id_pesquisador', **REF_PESQUISADOR},
+            {'tipo': 'referencia', 'coluna': 'id_tempo', **REF_TEMPO},
+            {'tipo': 'referencia', 'coluna': 'id_tipo_producao', **REF_TIPO},
+            {'tipo': 'referencia', 'coluna': 'id_localizacao_trabalhos',
+             'dimensao': 'dw.dim_localizacao_trabalhos', 'chave': 'id_localizacao_trabalhos'},
+        ],
+    },
+    'dw.fato_coautoria': {
+        'verificacoes': [
+            {'tipo': 'intervalo', 'coluna': 'qtd_producoes', 'minimo': 1},
+            {'tipo': 'referencia', 'coluna': 'id_pesquisador_a', **REF_PESQUISADOR},
+            {'tipo': 'referencia', 'coluna': 'id_pesquisador_b', **REF_PESQUISADOR},
+            {'tipo': 'referencia', 'coluna': 'id_tempo', **REF_TEMPO},
+            {'tipo': 'referencia', 'coluna': 'id_tipo_producao', **REF_TIPO},
+        ],
+    },
+}
+
+
+def nome_verificacao(verificacao):
+    """Rótulo de uma verificação (ex: 'unico(id_lattes)', 'referencia(id_tempo)')."""
+    colunas = verificacao.get('colunas') or [verificacao.get('coluna', '*')]
+    return f"{verificacao['tipo']}({', '.join(colunas)})"
+
+
+def compilar_verificacao(verificacao, alias):
+    """
+    Compila uma verificação para uma expressão agregada sobre a tabela "t".
+
+    Args:
+        verificacao (dict): Verificação declarada em VERIFICACOES
+        alias (str): Alias da dimensão juntada (só para 'referencia')
+
+    Returns:
+        tuple: (expressão SQL, junção ou None, operador, limite)
+
+    Raises:
+        ValueError: Se o tipo da verificação não existir
+    """
+    tipo = verificacao['tipo']
+    coluna = f"t.{verificacao['coluna']}" if 'coluna' in verificacao else None
+
+    if tipo == 'linhas':
+        return "COUNT(*)", None, '>=', verificacao['minimo']
+
+    if tipo == 'unico':
+        colunas = ', '.join(f"t.{c}" for c in verificacao['colunas'])
+        if len(verificacao['colunas']) == 1:
+            expressao = f"COUNT({colunas}) - COUNT(DISTINCT {colunas})"
+        else:
+            expressao = f"COUNT(*) - COUNT(DISTINCT ({colunas}))"
+        return expressao, None, '<=', verificacao.get('maximo', 0)
+
+    if tipo == 'nulos':
+        expressao = (f"COALESCE(COUNT(*) FILTER (WHERE {coluna} IS NULL OR {coluna}::TEXT = '')::NUMERIC"
+                     f" / NULLIF(COUNT(*), 0), 0)")
+        return expressao, None, '<=', verificacao['maximo']
+
+    if tipo == 'intervalo':
+        fora = []
+        if verificacao.get('minimo') is not None:
+            fora.append(f"{coluna} < {verificacao['minimo']}")
+        if verificacao.get('maximo') is not None:
+            fora.append(f"{coluna} > {verificacao['maximo']}")
+        expressao = f"COUNT(*) FILTER (WHERE {' OR '.join(fora)})"
+        return expressao, None, '<=', verificacao.get('tolerancia', 0)
+
+    if tipo == 'referencia':
+        juncao = (f"LEFT JOIN {verificacao['dimensao']} {alias}\n"
+                  f"    ON {alias}.{verificacao['chave']} = {coluna}")
+        if verificacao.get('condicao'):
+            juncao += f"\n   AND {alias}.{verificacao['condicao']}"
+        expressao = f"COUNT(*) FILTER (WHERE {coluna} IS NOT NULL AND {alias}.{verificacao['chave']} IS NULL)"
+        return expressao, juncao, '<=', verificacao.get('maximo', 0)
+
+    raise ValueError(f"Tipo de verificação desconhecido: {tipo}")
+
+
+def compilar_tabela(tabela, definicao):
+    """
+    Compila as verificações de uma tabela para uma única consulta agregada.
+
+    Args:
+        tabela (str): Tabela verificada (ex: 'dw.dim_pesquisador')
+        definicao (dict): Entrada de VERIFICACOES da tabela
+
+    Returns:
+        tuple: (query, lista de (nome, tipo, operador, limite) na ordem das
+            colunas do SELECT)
+    """
+    colunas = []
+    juncoes = []
+    verificacoes = []
+    for i, verificacao in enumerate(definicao['verificacoes'], start=1):
+        expressao, juncao, operador, limite = compilar_verificacao(verificacao, f"r{i}")
+        colunas.append(f"{expressao} AS v{i}")
+        if juncao:
+            juncoes.append(juncao)
+        verificacoes.append((nome_verificacao(verificacao), verificacao['tipo'], operador, limite))
+
+    query = "SELECT\n    " + ",\n    ".join(colunas) + f"\nFROM {tabela} t"
+    if juncoes:
+        query += "\n" + "\n".join(juncoes)
+    if definicao.get('condicao'):
+        query += f"\nWHERE t.{definicao['condicao']}"
+    return query + ";", verificacoes
+
+
+def verificar_tabela(tabela, definicao):
+    """
+    Executa a consulta de verificação de uma tabela (na sua própria conexão).
+
+    Returns:
+        list: Resultados (tabela, verificacao, tipo, valor, operador, limite, aprovado)
+    """
+    query, verificacoes = compilar_tabela(tabela, definicao)
+    with obter_cursor() as cursor:
+        cursor.execute(query)
+        valores = cursor.fetchone()
+
+    resultados = []
+    for (nome, tipo, operador, limite), valor in zip(verificacoes, valores):
+        valor = float(valor)
+        aprovado = valor >= limite if operador == '>=' else valor <= limite
+        resultados.append((tabela, nome, tipo, valor, operador, limite, aprovado))
+    return resultados
+
+
+def gravar_resultados(cursor, resultados):
+    """Grava os resultados da execução atual em dq.resultados."""
+    from psycopg2.extras import execute_values
+
+    execucao = id_execucao()
+    execute_values(cursor, """
+        INSERT INTO dq.resultados (
+            id_execucao,
+            tabela,
+            verificacao,
+            tipo,
+            valor,
+            operador,
+            limite,
+            aprovado
+        ) VALUES %s
+    """, [(execucao, *resultado) for resultado in resultados])
+
+
+def validar_qualidade(tabelas=None):
+    """
+    Verifica a qualidade das tabelas do DW e grava os resultados.
+
+    Args:
+        tabelas (list, optional): Tabelas a verificar. Padrão: todas de VERIFICACOES
+
+    Raises:
+        RuntimeError: Se alguma verificação reprovar (depois de gravar os resultados)
+    """
+
+    try:
+        selecionadas = tabelas or list(VERIFICACOES)
+        paralelismo = int(os.getenv('ETL_DQ_PARALELISMO', PARALELISMO_PADRAO))
+
+        with medir_etapa('dq.validacao') as metricas:
+            with metricas.fase('verificacao'):
+                with ThreadPoolExecutor(max_workers=paralelismo) as executor:
+                    por_tabela = list(executor.map(
+                        lambda tabela: verificar_tabela(tabela, VERIFICACOES[tabela]),
+                        selecionadas
+                    ))
+            resultados = [resultado for lista in por_tabela for resultado in lista]
+
+            with metricas.fase('gravacao'), obter_cursor() as cursor:
+                gravar_resultados(cursor, resultados)
+            metricas.linhas_gravadas = len(resultados)
+
+            reprovadas = [resultado for resultado in resultados if not resultado[6]]
+            metricas.registrar(tabelas=len(selecionadas), verificacoes=len(resultados),
+                               reprovadas=len(reprovadas))
+
+            if diagnostico_ativo():
+                print(f"\n{'Tabela':<42} {'Verificação':<45} {'Valor':>12}")
+                print("-" * 101)
+                for tabela, nome, _, valor, operador, limite, aprovado in resultados:
+                    simbolo = '✓' if aprovado else '✗'
+                    print(f"{simbolo} {tabela:<40} {nome:<45} {valor:>12,.4g} ({operador} {limite})")
+
+            if reprovadas:
+                print(f"\n✗ {len(reprovadas)} verificação(ões) reprovada(s):")
+                for tabela, nome, _, valor, operador, limite, _ in reprovadas:
+                    print(f"   • {tabela} {nome}: {valor:,.4g} (esperado {operador} {limite})")
+                raise RuntimeError(f"Qualidade de dados reprovada em {len(reprovadas)} verificação(ões)")
+
+    except Exception as e:
+        print(f"Erro na validação de qualidade: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    validar_qualidade()
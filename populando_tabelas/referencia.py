@@ -0,0 +1,63 @@
+"""
+Dados de referência: dimensões estáticas semeadas a partir de uma
+definição versionada, com ids estáveis.
+
+Os ids são fixos (não SERIAL): as cargas das fatos usam o id diretamente
+(ID_TIPO_PRODUCAO['Artigo']), sem junção com a dimensão nem busca pelo
+rótulo. Para mudar um rótulo ou incluir um tipo, altere TIPOS_PRODUCAO e
+incremente VERSAO_TIPOS_PRODUCAO; ids já usados nunca são reaproveitados.
+
+A versão semeada fica registrada em dw.versao_referencia; se a base já
+está na versão atual, a semeadura não faz nada.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+VERSAO_TIPOS_PRODUCAO = 1
+
+# (id_tipo_producao, tipo_producao, tabela stg de origem)
+TIPOS_PRODUCAO = [
+    (1, 'Artigo', 'stg.artigos'),
+    (2, 'Livro', 'stg.livros'),
+    (3, 'Capítulo de Livro', 'stg.capitulos_livros'),
+    (4, 'Texto em Jornal', 'stg.textos_jornais'),
+    (5, 'Trabalho em Evento', 'stg.trabalhos_eventos'),
+    (6, 'Apresentação de Trabalho', 'stg.apresentacoes_trabalho'),
+    (7, 'Outras Produções', 'stg.outras_producoes'),
+    (8, 'projetos pesquisa', 'stg.projetos_pesquisa'),
+]
+
+ID_TIPO_PRODUCAO = {tipo: id_tipo for id_tipo, tipo, _ in TIPOS_PRODUCAO}
+ID_TIPO_POR_ORIGEM = {tabela: id_tipo for id_tipo, _, tabela in TIPOS_PRODUCAO}
+
+
+def versao_semeada(cursor, tabela):
+    """
+    Versão da definição já semeada numa tabela de referência.
+
+    Args:
+        cursor: Cursor aberto
+        tabela (str): Tabela de referência (ex: 'dw.dim_tipo_producao')
+
+    Returns:
+        int: Versão registrada, ou None se a tabela nunca foi semeada
+    """
+    cursor.execute(
+        "SELECT versao FROM dw.versao_referencia WHERE tabela = %s;",
+        (tabela,)
+    )
+    linha = cursor.fetchone()
+    return linha[0] if linha else None
+
+
+def registrar_versao(cursor, tabela, versao):
+    """Registra a versão semeada de uma tabela de referência."""
+    cursor.execute("""
+        INSERT INTO dw.versao_referencia (tabela, versao, atualizado_em)
+        VALUES (%s, %s, NOW())
+        ON CONFLICT (tabela) DO UPDATE SET
+            versao = EXCLUDED.versao,
+            atualizado_em = EXCLUDED.atualizado_em;
+    """, (tabela, versao))
@@ -0,0 +1,176 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, medir_etapa
+from monitoramento.perfilamento import executar_com_plano
+from populando_tabelas.dim_localizacao_trabalhos import NAO_SE_APLICA
+from populando_tabelas.referencia import ID_TIPO_PRODUCAO
+
+# Colunas atualizadas a cada execução (todas menos a chave)
+COLUNAS = [
+    'id_lattes',
+    'nome',
+    'total_producoes',
+    'qtd_artigos',
+    'qtd_livros',
+    'qtd_capitulos_livros',
+    'qtd_trabalhos_eventos',
+    'qtd_textos_jornais',
+    'qtd_apresentacoes_trabalho',
+    'qtd_outras_producoes',
+    'qtd_projetos_pesquisa',
+    'qtd_internacionais',
+    'primeiro_ano',
+    'ultimo_ano',
+    'qtd_anos_ativos',
+    'anos_producao',
+    'qtd_areas',
+    'qtd_linhas_pesquisa',
+    'posicao_geral',
+    'posicao_artigos',
+    'posicao_internacional',
+]
+
+
+def popular_resumo_pesquisador():
+    """
+    Atualiza a tabela dw.resumo_pesquisador a partir das tabelas fato.
+
+    O resumo inteiro é recalculado numa única consulta, mas a gravação é
+    incremental: só linhas novas ou com algum valor diferente são escritas
+    (ON CONFLICT ... WHERE IS DISTINCT FROM), e pesquisadores sem versão
+    vigente na dim_pesquisador são removidos.
+    """
+
+    try:
+        atualizacoes = ',\n            '.join(f"{coluna} = EXCLUDED.{coluna}" for coluna in COLUNAS)
+        atuais = ', '.join(f"dw.resumo_pesquisador.{coluna}" for coluna in COLUNAS)
+        novos = ', '.join(f"EXCLUDED.{coluna}" for coluna in COLUNAS)
+
+        query = f"""
+        WITH producoes AS (
+            SELECT
+                f.id_pesquisador,
+                SUM(f.qtd_producoes) AS total_producoes,
+                SUM(f.qtd_producoes) FILTER (WHERE f.id_tipo_producao = {ID_TIPO_PRODUCAO['Artigo']}) AS qtd_artigos,
+                SUM(f.qtd_producoes) FILTER (WHERE f.id_tipo_producao = {ID_TIPO_PRODUCAO['Livro']}) AS qtd_livros,
+                SUM(f.qtd_producoes) FILTER (WHERE f.id_tipo_producao = {ID_TIPO_PRODUCAO['Capítulo de Livro']}) AS qtd_capitulos_livros,
+                SUM(f.qtd_producoes) FILTER (WHERE f.id_tipo_producao = {ID_TIPO_PRODUCAO['Trabalho em Evento']}) AS qtd_trabalhos_eventos,
+                SUM(f.qtd_producoes) FILTER (WHERE f.id_tipo_producao = {ID_TIPO_PRODUCAO['Texto em Jornal']}) AS qtd_textos_jornais,
+                SUM(f.qtd_producoes) FILTER (WHERE f.id_tipo_producao = {ID_TIPO_PRODUCAO['Apresentação de Trabalho']}) AS qtd_apresentacoes_trabalho,
+                SUM(f.qtd_producoes) FILTER (WHERE f.id_tipo_producao = {ID_TIPO_PRODUCAO['Outras Produções']}) AS qtd_outras_producoes,
+                SUM(f.qtd_producoes) FILTER (WHERE f.id_tipo_producao = {ID_TIPO_PRODUCAO['projetos pesquisa']}) AS qtd_projetos_pesquisa,
+                MIN(f.id_tempo) AS primeiro_ano,
+                MAX(f.id_tempo) AS ultimo_ano,
+                ARRAY_AGG(DISTINCT f.id_tempo ORDER BY f.id_tempo) AS anos_producao
+            FROM dw.fato_pesquisador_producoes f
+            GROUP BY f.id_pesquisador
+        ),
+        internacionais AS (
+            SELECT
+                f.id_pesquisador,
+                SUM(f.qtd_producoes) AS qtd_internacionais
+            FROM dw.fato_pesquisador_producao_localizacao f
+            JOIN dw.dim_localizacao_trabalhos dlt
+                ON dlt.id_localizacao_trabalhos = f.id_localizacao_trabalhos
+            -- Local não informado (NAO_SE_APLICA) não é internacional
+            WHERE dlt.pais NOT IN ('Brasil', {NAO_SE_APLICA})
+            GROUP BY f.id_pesquisador
+        ),
+        areas AS (
+            SELECT id_pesquisador, COUNT(*) AS qtd_areas
+            FROM dw.fato_pesquisador_area_atuacao
+            GROUP BY id_pesquisador
+        ),
+        linhas AS (
+            SELECT id_pesquisador, COUNT(*) AS qtd_linhas_pesquisa
+            FROM dw.fato_pesquisador_linha_pesquisa
+            GROUP BY id_pesquisador
+        ),
+        resumo AS (
+            SELECT
+                dp.id_pesquisador,
+                dp.id_lattes,
+                dp.nome,
+                COALESCE(p.total_producoes, 0) AS total_producoes,
+                COALESCE(p.qtd_artigos, 0) AS qtd_artigos,
+                COALESCE(p.qtd_livros, 0) AS qtd_livros,
+                COALESCE(p.qtd_capitulos_livros, 0) AS qtd_capitulos_livros,
+                COALESCE(p.qtd_trabalhos_eventos, 0) AS qtd_trabalhos_eventos,
+                COALESCE(p.qtd_textos_jornais, 0) AS qtd_textos_jornais,
+                COALESCE(p.qtd_apresentacoes_trabalho, 0) AS qtd_apresentacoes_trabalho,
+                COALESCE(p.qtd_outras_producoes, 0) AS qtd_outras_producoes,
+                COALESCE(p.qtd_projetos_pesquisa, 0) AS qtd_projetos_pesquisa,
+                COALESCE(i.qtd_internacionais, 0) AS qtd_internacionais,
+                p.primeiro_ano,
+                p.ultimo_ano,
+                COALESCE(CARDINALITY(p.anos_producao), 0) AS qtd_anos_ativos,
+                COALESCE(p.anos_producao, '{{}}') AS anos_producao,
+                COALESCE(a.qtd_areas, 0) AS qtd_areas,
+                COALESCE(l.qtd_linhas_pesquisa, 0) AS qtd_linhas_pesquisa
+            FROM dw.dim_pesquisador dp
+            LEFT JOIN producoes p
+                ON p.id_pesquisador = dp.id_pesquisador
+            LEFT JOIN internacionais i
+                ON i.id_pesquisador = dp.id_pesquisador
+            LEFT JOIN areas a
+                ON a.id_pesquisador = dp.id_pesquisador
+            LEFT JOIN linhas l
+                ON l.id_pesquisador = dp.id_pesquisador
+            WHERE dp.atual
+        )
+        INSERT INTO dw.resumo_pesquisador (
+            id_pesquisador,
+            {', '.join(COLUNAS)}
+        )
+        SELECT
+            r.*,
+            RANK() OVER (ORDER BY r.total_producoes DESC) AS posicao_geral,
+            RANK() OVER (ORDER BY r.qtd_artigos DESC) AS posicao_artigos,
+            RANK() OVER (ORDER BY r.qtd_internacionais DESC) AS posicao_internacional
+        FROM resumo r
+        ON CONFLICT (id_pesquisador) DO UPDATE SET
+            {atualizacoes}
+        WHERE ({atuais}) IS DISTINCT FROM ({novos});
+        """
+
+        with medir_etapa('dw.resumo_pesquisador') as metricas, obter_cursor() as cursor:
+            with metricas.fase('insercao'):
+                executar_com_plano(cursor, query, 'dw.resumo_pesquisador')
+            metricas.linhas_gravadas = cursor.rowcount
+
+            with metricas.fase('remocao'):
+                cursor.execute("""
+                    DELETE FROM dw.resumo_pesquisador r
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM dw.dim_pesquisador dp
+                        WHERE dp.id_pesquisador = r.id_pesquisador
+                          AND dp.atual
+                    );
+                """)
+            metricas.registrar(linhas_removidas=cursor.rowcount)
+
+            if diagnostico_ativo():
+                cursor.execute("""
+                    SELECT
+                        COUNT(*) AS total,
+                        COUNT(*) FILTER (WHERE total_producoes > 0) AS com_producoes,
+                        ROUND(AVG(qtd_anos_ativos), 1) AS media_anos_ativos
+                    FROM dw.resumo_pesquisador;
+                """)
+
+                stats = cursor.fetchone()
+                print("\nEstatísticas do resumo_pesquisador:")
+                print(f"   Pesquisadores: {stats[0]}")
+                print(f"   Com produções: {stats[1]}")
+                print(f"   Média de anos ativos: {stats[2]}")
+                print(f"   Linhas gravadas nesta execução: {metricas.linhas_gravadas}")
+
+    except Exception as e:
+        print(f"Erro ao popular resumo_pesquisador: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    popular_resumo_pesquisador()
@@ -0,0 +1,114 @@
+-- Busca textual nos títulos das produções (tabelas stg).
+--
+-- Executar depois de criar_tabelas_stg.sql (e novamente se as tabelas stg
+-- forem recriadas). Cada tabela de produção ganha a coluna gerada "busca"
+-- (tsvector em português, sem acentos), calculada pelo próprio banco a cada
+-- linha gravada pelo COPY do stage, e dois índices GIN: um no tsvector e
+-- um de trigramas no título sem acentos, para termos parciais ou com erro
+-- de digitação.
+--
+-- A consulta é feita pela view stg.busca_producoes (ver
+-- streamlit/db_utils.buscar_producoes); os filtros sobre a view são
+-- repassados a cada tabela e usam os índices.
+
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Configuração portuguesa que remove acentos antes do stemming
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'pt_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION public.pt_unaccent (COPY = portuguese);
+        ALTER TEXT SEARCH CONFIGURATION public.pt_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+    END IF;
+END
+$$;
+
+-- unaccent() não é IMMUTABLE; esta versão com dicionário fixo pode ser usada em índices
+CREATE OR REPLACE FUNCTION stg.f_unaccent(texto TEXT)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, texto)) $$;
+
+
+-- Título com peso A, periódico/livro/evento com peso B
+ALTER TABLE stg.artigos ADD COLUMN IF NOT EXISTS busca TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(titulo, '')), 'A') ||
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(titulo_periodico, '')), 'B')
+) STORED;
+
+ALTER TABLE stg.livros ADD COLUMN IF NOT EXISTS busca TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(titulo, '')), 'A')
+) STORED;
+
+ALTER TABLE stg.capitulos_livros ADD COLUMN IF NOT EXISTS busca TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(titulo_capitulo, '')), 'A') ||
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(titulo_livro, '')), 'B')
+) STORED;
+
+ALTER TABLE stg.textos_jornais ADD COLUMN IF NOT EXISTS busca TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(titulo, '')), 'A') ||
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(titulo_jornal, '')), 'B')
+) STORED;
+
+ALTER TABLE stg.trabalhos_eventos ADD COLUMN IF NOT EXISTS busca TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(titulo, '')), 'A') ||
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(nome_evento, '')), 'B')
+) STORED;
+
+ALTER TABLE stg.apresentacoes_trabalho ADD COLUMN IF NOT EXISTS busca TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(titulo, '')), 'A') ||
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(nome_evento, '')), 'B')
+) STORED;
+
+ALTER TABLE stg.outras_producoes ADD COLUMN IF NOT EXISTS busca TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('public.pt_unaccent', COALESCE(titulo, '')), 'A')
+) STORED;
+
+
+CREATE INDEX IF NOT EXISTS idx_stg_artigos_busca ON stg.artigos USING GIN (busca);
+CREATE INDEX IF NOT EXISTS idx_stg_livros_busca ON stg.livros USING GIN (busca);
+CREATE INDEX IF NOT EXISTS idx_stg_capitulos_livros_busca ON stg.capitulos_livros USING GIN (busca);
+CREATE INDEX IF NOT EXISTS idx_stg_textos_jornais_busca ON stg.textos_jornais USING GIN (busca);
+CREATE INDEX IF NOT EXISTS idx_stg_trabalhos_eventos_busca ON stg.trabalhos_eventos USING GIN (busca);
+CREATE INDEX IF NOT EXISTS idx_stg_apresentacoes_trabalho_busca ON stg.apresentacoes_trabalho USING GIN (busca);
+CREATE INDEX IF NOT EXISTS idx_stg_outras_producoes_busca ON stg.outras_producoes USING GIN (busca);
+
+CREATE INDEX IF NOT EXISTS idx_stg_artigos_titulo_trgm ON stg.artigos USING GIN (stg.f_unaccent(titulo) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_stg_livros_titulo_trgm ON stg.livros USING GIN (stg.f_unaccent(titulo) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_stg_capitulos_livros_titulo_trgm ON stg.capitulos_livros USING GIN (stg.f_unaccent(titulo_capitulo) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_stg_textos_jornais_titulo_trgm ON stg.textos_jornais USING GIN (stg.f_unaccent(titulo) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_stg_trabalhos_eventos_titulo_trgm ON stg.trabalhos_eventos USING GIN (stg.f_unaccent(titulo) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_stg_apresentacoes_trabalho_titulo_trgm ON stg.apresentacoes_trabalho USING GIN (stg.f_unaccent(titulo) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_stg_outras_producoes_titulo_trgm ON stg.outras_producoes USING GIN (stg.f_unaccent(titulo) gin_trgm_ops);
+
+
+CREATE OR REPLACE VIEW stg.busca_producoes AS
+SELECT 'Artigo'::TEXT AS tipo_producao, id, id_lattes, titulo, ano, titulo_periodico AS veiculo,
+       busca, stg.f_unaccent(titulo) AS titulo_busca
+FROM stg.artigos
+UNION ALL
+SELECT 'Livro', id, id_lattes, titulo, ano, nome_editora,
+       busca, stg.f_unaccent(titulo)
+FROM stg.livros
+UNION ALL
+SELECT 'Capítulo de Livro', id, id_lattes, titulo_capitulo, ano, titulo_livro,
+       busca, stg.f_unaccent(titulo_capitulo)
+FROM stg.capitulos_livros
+UNION ALL
+SELECT 'Texto em Jornal', id, id_lattes, titulo, ano, titulo_jornal,
+       busca, stg.f_unaccent(titulo)
+FROM stg.textos_jornais
+UNION ALL
+SELECT 'Trabalho em Evento', id, id_lattes, titulo, ano, nome_evento,
+       busca, stg.f_unaccent(titulo)
+FROM stg.trabalhos_eventos
+UNION ALL
+SELECT 'Apresentação de Trabalho', id, id_lattes, titulo, ano, nome_evento,
+       busca, stg.f_unaccent(titulo)
+FROM stg.apresentacoes_trabalho
+UNION ALL
+SELECT 'Outras Produções', id, id_lattes, titulo, ano, editora,
+       busca, stg.f_unaccent(titulo)
+FROM stg.outras_producoes;
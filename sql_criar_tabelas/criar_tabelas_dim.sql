@@ -4,32 +4,89 @@ CREATE TABLE dw.dim_area (
     area VARCHAR(255)
 );
 
+-- Chave natural da carga (ON CONFLICT em populando_tabelas/dim_area.py);
+-- grande área ausente conta como '' para que não se repita a cada execução
+CREATE UNIQUE INDEX uq_dim_area ON dw.dim_area (COALESCE(grande_area, ''), area);
+
 CREATE TABLE dw.dim_linha_pesquisa (
     id_linha_pesquisa SERIAL PRIMARY KEY,
-    linha_pesquisa VARCHAR(500) NOT NULL
+    linha_pesquisa VARCHAR(500) NOT NULL,
+    CONSTRAINT uq_dim_linha_pesquisa UNIQUE (linha_pesquisa)
 );
 
+-- Dimensão de mudança lenta tipo 2: uma linha por versão do pesquisador.
+-- id_pesquisador é a chave durável (a mesma em todas as versões de um
+-- id_lattes) e é a que as fatos guardam; consultas do estado atual
+-- filtram "atual". hash_linha detecta mudanças nos atributos rastreados
+-- (ver populando_tabelas/dim_pesquisador.py)
+CREATE SEQUENCE dw.dim_pesquisador_id_pesquisador_seq;
+
 CREATE TABLE dw.dim_pesquisador (
-    id_pesquisador SERIAL PRIMARY KEY,
-    id_lattes VARCHAR(100),
+    id_versao SERIAL PRIMARY KEY,
+    id_pesquisador INT NOT NULL DEFAULT nextval('dw.dim_pesquisador_id_pesquisador_seq'),
+    id_lattes VARCHAR(100) NOT NULL,
     nome VARCHAR(100),
-    atuacao_profissional TEXT
+    atuacao_profissional TEXT,
+    hash_linha CHAR(32) NOT NULL,
+    valido_de TIMESTAMP NOT NULL DEFAULT NOW(),
+    valido_ate TIMESTAMP,
+    atual BOOLEAN NOT NULL DEFAULT TRUE
 );
 
+ALTER SEQUENCE dw.dim_pesquisador_id_pesquisador_seq OWNED BY dw.dim_pesquisador.id_pesquisador;
+
+-- Uma versão vigente por pesquisador
+CREATE UNIQUE INDEX uq_dim_pesquisador_atual_lattes ON dw.dim_pesquisador (id_lattes) WHERE atual;
+CREATE UNIQUE INDEX uq_dim_pesquisador_atual_id ON dw.dim_pesquisador (id_pesquisador) WHERE atual;
+
+-- Chave inteligente: id_tempo é o próprio ano. As fatos guardam o ano em
+-- id_tempo e podem ser carregadas e consultadas sem junção com esta tabela
 CREATE TABLE dw.dim_tempo (
-    id_tempo SERIAL PRIMARY KEY,
-    ano INT NOT NULL
+    id_tempo INT PRIMARY KEY,
+    ano INT GENERATED ALWAYS AS (id_tempo) STORED,
+    decada INT GENERATED ALWAYS AS (id_tempo / 10 * 10) STORED,
+    quinquenio INT GENERATED ALWAYS AS (id_tempo / 5 * 5) STORED
 );
 
+-- Dimensão de referência: ids fixos, semeados a partir de
+-- populando_tabelas/referencia.py (as fatos usam os ids diretamente)
 CREATE TABLE dw.dim_tipo_producao (
-    id_tipo_producao SERIAL PRIMARY KEY,
-    tipo_producao VARCHAR(100)
+    id_tipo_producao INT PRIMARY KEY,
+    tipo_producao VARCHAR(100) NOT NULL UNIQUE
+);
+
+-- Versão da definição semeada em cada tabela de referência
+CREATE TABLE dw.versao_referencia (
+    tabela VARCHAR(100) PRIMARY KEY,
+    versao INT NOT NULL,
+    atualizado_em TIMESTAMP NOT NULL DEFAULT NOW()
 );
 
+-- hash_localizacao é a chave natural (id_lattes, pais, instituicao já
+-- canônicos) num único valor; a fato calcula o mesmo hash sobre a linha stg
+-- e junta por igualdade (ver populando_tabelas/dim_localizacao_trabalhos.py)
 CREATE TABLE dw.dim_localizacao_trabalhos (
     id_localizacao_trabalhos SERIAL PRIMARY KEY,
     id_lattes VARCHAR(100) NOT NULL,
-    instituicao VARCHAR(500),
-    pais VARCHAR(100)
+    instituicao VARCHAR(500) NOT NULL,
+    pais VARCHAR(100) NOT NULL,
+    hash_localizacao CHAR(32) GENERATED ALWAYS AS (
+        md5(id_lattes || '|' || pais || '|' || instituicao)
+    ) STORED,
+    CONSTRAINT uq_dim_localizacao_trabalhos_hash UNIQUE (hash_localizacao)
+);
+
+
+
+-- Produção canônica de cada registro de produção das tabelas stg: registros
+-- do mesmo trabalho em currículos diferentes recebem o mesmo id_producao_canonica
+CREATE TABLE dw.producao_canonica (
+    hash_producao CHAR(32) PRIMARY KEY,
+    id_producao_canonica INT NOT NULL,
+    tabela_origem VARCHAR(50) NOT NULL,
+    id_lattes VARCHAR(100) NOT NULL,
+    ano INT,
+    criterio VARCHAR(20) NOT NULL
 );
 
+CREATE INDEX idx_producao_canonica_id ON dw.producao_canonica (id_producao_canonica);
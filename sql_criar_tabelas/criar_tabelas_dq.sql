@@ -0,0 +1,38 @@
+CREATE SCHEMA IF NOT EXISTS dq;
+
+-- Resultado de cada verificação de qualidade (populando_tabelas/qualidade_dados.py):
+-- valor calculado, limite e operador da comparação, por execução do pipeline
+CREATE TABLE dq.resultados (
+    id_resultado SERIAL PRIMARY KEY,
+    id_execucao VARCHAR(100) NOT NULL,
+    tabela VARCHAR(100) NOT NULL,
+    verificacao VARCHAR(255) NOT NULL,
+    tipo VARCHAR(20) NOT NULL,
+    valor NUMERIC NOT NULL,
+    operador VARCHAR(2) NOT NULL,
+    limite NUMERIC NOT NULL,
+    aprovado BOOLEAN NOT NULL,
+    verificado_em TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_dq_resultados_execucao ON dq.resultados (id_execucao);
+CREATE INDEX idx_dq_resultados_tabela ON dq.resultados (tabela, verificado_em);
+
+-- Perfil das colunas das tabelas stg (stage/perfil_dados.py), um por execução:
+-- a comparação entre execuções mostra a deriva dos dados de origem
+CREATE TABLE dq.perfil_stg (
+    id_perfil SERIAL PRIMARY KEY,
+    id_execucao VARCHAR(100) NOT NULL,
+    tabela VARCHAR(100) NOT NULL,
+    coluna VARCHAR(100) NOT NULL,
+    linhas BIGINT NOT NULL,
+    nulos BIGINT NOT NULL,
+    distintos BIGINT,
+    minimo TEXT,
+    maximo TEXT,
+    padroes JSONB,
+    truncados BIGINT,
+    perfilado_em TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_dq_perfil_stg_tabela ON dq.perfil_stg (tabela, perfilado_em);
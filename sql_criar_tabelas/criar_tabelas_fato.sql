@@ -1,10 +1,17 @@
+-- Particionada por ano (id_tempo), uma partição por década. As partições
+-- são criadas pelo pipeline (populando_tabelas/particoes.py); a chave
+-- primária precisa incluir a chave de partição.
 CREATE TABLE dw.fato_pesquisador_producoes (
-    id_fato_pesquisador_producoes SERIAL PRIMARY KEY,
+    id_fato_pesquisador_producoes SERIAL,
     id_pesquisador INT NOT NULL,
     id_tempo INT NOT NULL,
     id_tipo_producao INT NOT NULL,
-    qtd_producoes INT NOT NULL
-);
+    qtd_producoes INT NOT NULL,
+    PRIMARY KEY (id_fato_pesquisador_producoes, id_tempo)
+) PARTITION BY RANGE (id_tempo);
+
+-- id_tempo é o ano (ver dw.dim_tempo): filtros de período usam este índice direto
+CREATE INDEX idx_fato_pesquisador_producoes_tempo ON dw.fato_pesquisador_producoes (id_tempo);
 
 
 CREATE TABLE dw.fato_pesquisador_area_atuacao (
@@ -23,17 +30,103 @@ CREATE TABLE dw.fato_pesquisador_linha_pesquisa (
     CONSTRAINT uq_fato_pesquisador_linha UNIQUE (id_pesquisador, id_linha_pesquisa)
 );
 
+-- Particionada por década como dw.fato_pesquisador_producoes
 CREATE TABLE dw.fato_pesquisador_producao_localizacao (
-    id_fato_pesq_prod_loc SERIAL PRIMARY KEY,
+    id_fato_pesq_prod_loc SERIAL,
     id_pesquisador INT NOT NULL,
     id_tempo INT NOT NULL,
     id_tipo_producao INT NOT NULL,
     id_localizacao_trabalhos INT NOT NULL,
     qtd_producoes INT NOT NULL,
+    PRIMARY KEY (id_fato_pesq_prod_loc, id_tempo),
     CONSTRAINT uq_fato_pesq_prod_loc UNIQUE (
         id_pesquisador,
         id_tempo,
         id_tipo_producao,
         id_localizacao_trabalhos
     )
-);
\ No newline at end of file
+) PARTITION BY RANGE (id_tempo);
+
+CREATE INDEX idx_fato_pesq_prod_loc_tempo ON dw.fato_pesquisador_producao_localizacao (id_tempo);
+
+-- Rede de coautoria: um par de pesquisadores (id_pesquisador_a < id_pesquisador_b)
+-- por ano e tipo de produção
+CREATE TABLE dw.fato_coautoria (
+    id_fato_coautoria SERIAL PRIMARY KEY,
+    id_pesquisador_a INT NOT NULL,
+    id_pesquisador_b INT NOT NULL,
+    id_tempo INT NOT NULL,
+    id_tipo_producao INT NOT NULL,
+    qtd_producoes INT NOT NULL,
+    CONSTRAINT ck_fato_coautoria_par CHECK (id_pesquisador_a < id_pesquisador_b),
+    CONSTRAINT uq_fato_coautoria UNIQUE (
+        id_pesquisador_a,
+        id_pesquisador_b,
+        id_tempo,
+        id_tipo_producao
+    )
+);
+
+CREATE INDEX idx_fato_coautoria_pesquisador_b ON dw.fato_coautoria (id_pesquisador_b);
+
+-- Métricas de rede por pesquisador, pré-calculadas a partir de dw.fato_coautoria
+CREATE TABLE dw.metricas_coautoria_pesquisador (
+    id_pesquisador INT PRIMARY KEY,
+    grau INT NOT NULL,
+    grau_ponderado INT NOT NULL,
+    id_componente INT NOT NULL,
+    tamanho_componente INT NOT NULL,
+    intermediacao DOUBLE PRECISION NOT NULL
+);
+
+-- Resumo por pesquisador (uma linha por pesquisador), recalculado a partir
+-- dos fatos; alimenta rankings e perfis sem reagregar as tabelas fato
+CREATE TABLE dw.resumo_pesquisador (
+    id_pesquisador INT PRIMARY KEY,
+    id_lattes VARCHAR(100),
+    nome VARCHAR(100),
+    total_producoes INT NOT NULL DEFAULT 0,
+    qtd_artigos INT NOT NULL DEFAULT 0,
+    qtd_livros INT NOT NULL DEFAULT 0,
+    qtd_capitulos_livros INT NOT NULL DEFAULT 0,
+    qtd_trabalhos_eventos INT NOT NULL DEFAULT 0,
+    qtd_textos_jornais INT NOT NULL DEFAULT 0,
+    qtd_apresentacoes_trabalho INT NOT NULL DEFAULT 0,
+    qtd_outras_producoes INT NOT NULL DEFAULT 0,
+    qtd_projetos_pesquisa INT NOT NULL DEFAULT 0,
+    qtd_internacionais INT NOT NULL DEFAULT 0,
+    primeiro_ano INT,
+    ultimo_ano INT,
+    qtd_anos_ativos INT NOT NULL DEFAULT 0,
+    anos_producao INT[] NOT NULL DEFAULT '{}',
+    qtd_areas INT NOT NULL DEFAULT 0,
+    qtd_linhas_pesquisa INT NOT NULL DEFAULT 0,
+    posicao_geral INT NOT NULL,
+    posicao_artigos INT NOT NULL,
+    posicao_internacional INT NOT NULL
+);
+
+CREATE INDEX idx_resumo_pesquisador_posicao_geral ON dw.resumo_pesquisador (posicao_geral);
+CREATE INDEX idx_resumo_pesquisador_anos_producao ON dw.resumo_pesquisador USING GIN (anos_producao);
+
+-- Cubo de produções: agregados pré-calculados por (grande_area, area, ano,
+-- tipo_producao). "agrupamento" lista as dimensões agrupadas na ordem
+-- grande_area,area,ano,tipo_producao; as demais ficam NULL (totalizadas).
+CREATE TABLE dw.cubo_producoes (
+    id_cubo SERIAL PRIMARY KEY,
+    agrupamento VARCHAR(50) NOT NULL,
+    grande_area VARCHAR(255),
+    area VARCHAR(255),
+    ano INT,
+    tipo_producao VARCHAR(100),
+    qtd_producoes BIGINT NOT NULL,
+    qtd_pesquisadores INT NOT NULL
+);
+
+CREATE INDEX idx_cubo_producoes_agrupamento ON dw.cubo_producoes (
+    agrupamento,
+    grande_area,
+    area,
+    ano,
+    tipo_producao
+);
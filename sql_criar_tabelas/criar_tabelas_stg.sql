@@ -155,4 +155,22 @@ CREATE TABLE stg.outras_producoes (
     issn_isbn VARCHAR(50),
     numero_paginas VARCHAR(20),
     autores TEXT
-);
\ No newline at end of file
+);
+-- Um registro por autor de cada produção (artigos, livros, capítulos, textos,
+-- trabalhos em eventos, apresentações e outras produções).
+-- hash_producao = md5(concat_ws('|', tabela_origem, id_lattes, titulo, ano))
+-- calculado sobre a linha da tabela de origem.
+CREATE TABLE stg.autoria (
+    id SERIAL PRIMARY KEY,
+    hash_producao CHAR(32) NOT NULL,
+    tabela_origem VARCHAR(50) NOT NULL,
+    id_lattes VARCHAR(100) NOT NULL,
+    ano VARCHAR(10),
+    ordem_autoria VARCHAR(10),
+    nome_citacao VARCHAR(500) NOT NULL,
+    nro_id_cnpq VARCHAR(50)
+);
+
+CREATE INDEX idx_stg_autoria_nome_citacao ON stg.autoria (nome_citacao);
+CREATE INDEX idx_stg_autoria_nro_id_cnpq ON stg.autoria (nro_id_cnpq) WHERE nro_id_cnpq IS NOT NULL;
+CREATE INDEX idx_stg_autoria_hash_producao ON stg.autoria (hash_producao);
@@ -0,0 +1,80 @@
+-- ========================================
+-- MIGRAÇÃO: CHAVES ÚNICAS EM DIM_AREA E DIM_LINHA_PESQUISA
+-- ========================================
+--
+-- As cargas de dw.dim_area e dw.dim_linha_pesquisa passaram a usar
+-- ON CONFLICT sobre a chave natural (ver criar_tabelas_dim.sql). Numa base
+-- carregada antes disso, cada execução repetiu todas as linhas. Aqui as
+-- repetidas são fundidas no menor id: as fatos são remapeadas para ele e
+-- as demais linhas são apagadas; depois as chaves únicas são criadas.
+--
+-- Executar uma única vez, com o pipeline parado. Tudo roda numa transação.
+-- Em seguida, recalcule os agregados:
+--
+--     python executar_pipeline.py dq.validacao dw.resumo_pesquisador \
+--         dw.cubo_producoes dw.metricas_coautoria_pesquisador
+--
+
+BEGIN;
+
+-- 1. dim_area: id de cada linha -> menor id da mesma (grande_area, area)
+CREATE TEMP TABLE areas_repetidas AS
+SELECT id_area, id_mantido
+FROM (
+    SELECT
+        id_area,
+        MIN(id_area) OVER (PARTITION BY COALESCE(grande_area, ''), area) AS id_mantido
+    FROM dw.dim_area
+) x
+WHERE id_area <> id_mantido;
+
+INSERT INTO dw.fato_pesquisador_area_atuacao (id_pesquisador, id_area)
+SELECT f.id_pesquisador, r.id_mantido
+FROM dw.fato_pesquisador_area_atuacao f
+JOIN areas_repetidas r ON r.id_area = f.id_area
+ON CONFLICT (id_pesquisador, id_area) DO NOTHING;
+
+DELETE FROM dw.fato_pesquisador_area_atuacao f
+USING areas_repetidas r
+WHERE f.id_area = r.id_area;
+
+DELETE FROM dw.dim_area d
+USING areas_repetidas r
+WHERE d.id_area = r.id_area;
+
+CREATE UNIQUE INDEX uq_dim_area ON dw.dim_area (COALESCE(grande_area, ''), area);
+
+-- 2. dim_linha_pesquisa: id de cada linha -> menor id do mesmo texto
+CREATE TEMP TABLE linhas_repetidas AS
+SELECT id_linha_pesquisa, id_mantido
+FROM (
+    SELECT
+        id_linha_pesquisa,
+        MIN(id_linha_pesquisa) OVER (PARTITION BY linha_pesquisa) AS id_mantido
+    FROM dw.dim_linha_pesquisa
+) x
+WHERE id_linha_pesquisa <> id_mantido;
+
+INSERT INTO dw.fato_pesquisador_linha_pesquisa (id_pesquisador, id_linha_pesquisa)
+SELECT f.id_pesquisador, r.id_mantido
+FROM dw.fato_pesquisador_linha_pesquisa f
+JOIN linhas_repetidas r ON r.id_linha_pesquisa = f.id_linha_pesquisa
+ON CONFLICT (id_pesquisador, id_linha_pesquisa) DO NOTHING;
+
+DELETE FROM dw.fato_pesquisador_linha_pesquisa f
+USING linhas_repetidas r
+WHERE f.id_linha_pesquisa = r.id_linha_pesquisa;
+
+DELETE FROM dw.dim_linha_pesquisa d
+USING linhas_repetidas r
+WHERE d.id_linha_pesquisa = r.id_linha_pesquisa;
+
+ALTER TABLE dw.dim_linha_pesquisa
+    ADD CONSTRAINT uq_dim_linha_pesquisa UNIQUE (linha_pesquisa);
+
+-- 3. Conferência
+SELECT
+    (SELECT COUNT(*) FROM areas_repetidas) AS areas_fundidas,
+    (SELECT COUNT(*) FROM linhas_repetidas) AS linhas_fundidas;
+
+COMMIT;
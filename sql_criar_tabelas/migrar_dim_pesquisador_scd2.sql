@@ -0,0 +1,100 @@
+-- ========================================
+-- MIGRAÇÃO: DIM_PESQUISADOR COMO DIMENSÃO TIPO 2
+-- ========================================
+--
+-- Converte uma base criada com dw.dim_pesquisador (uma linha por carga,
+-- id_pesquisador SERIAL PRIMARY KEY) para a dimensão de mudança lenta
+-- tipo 2 de criar_tabelas_dim.sql.
+--
+-- id_pesquisador continua sendo a chave guardada pelas fatos (chave
+-- durável) e mantém a sua sequence. Linhas repetidas de um mesmo
+-- id_lattes (execuções repetidas de popular_dim_pesquisador) viram versões
+-- encerradas do menor id_pesquisador. As linhas das fatos e agregados que
+-- apontam para os outros ids são removidas (são cópias das linhas do id
+-- mantido, gravadas quando a dimensão tinha o pesquisador repetido);
+-- recarregue as fatos em seguida para completar o que faltar.
+--
+-- Executar uma única vez, com o pipeline parado. Tudo roda numa transação.
+--
+
+BEGIN;
+
+-- 1. Novas colunas
+ALTER TABLE dw.dim_pesquisador DROP CONSTRAINT dim_pesquisador_pkey;
+
+ALTER TABLE dw.dim_pesquisador
+    ADD COLUMN id_versao SERIAL PRIMARY KEY,
+    ADD COLUMN hash_linha CHAR(32),
+    ADD COLUMN valido_de TIMESTAMP NOT NULL DEFAULT NOW(),
+    ADD COLUMN valido_ate TIMESTAMP,
+    ADD COLUMN atual BOOLEAN NOT NULL DEFAULT TRUE;
+
+-- 2. Repetidos: a linha de menor id_pesquisador fica vigente; as demais
+--    viram versões encerradas com a mesma chave durável
+CREATE TEMP TABLE ids_repetidos AS
+SELECT id_pesquisador AS id_antigo
+FROM (
+    SELECT
+        id_pesquisador,
+        id_lattes,
+        MIN(id_pesquisador) OVER (PARTITION BY id_lattes) AS id_duravel
+    FROM dw.dim_pesquisador
+) dp
+-- Linhas sem id_lattes são removidas da dimensão no passo 4
+WHERE id_pesquisador <> id_duravel
+   OR id_lattes IS NULL;
+
+WITH repetidos AS (
+    SELECT
+        id_versao,
+        MIN(id_pesquisador) OVER (PARTITION BY id_lattes) AS id_duravel,
+        ROW_NUMBER() OVER (PARTITION BY id_lattes ORDER BY id_pesquisador) AS ordem
+    FROM dw.dim_pesquisador
+)
+UPDATE dw.dim_pesquisador dp
+SET id_pesquisador = r.id_duravel,
+    atual = FALSE,
+    valido_ate = NOW()
+FROM repetidos r
+WHERE r.id_versao = dp.id_versao
+  AND r.ordem > 1;
+
+-- 3. Fatos e agregados: remove as linhas dos ids que deixaram de existir
+DELETE FROM dw.fato_pesquisador_producoes WHERE id_pesquisador IN (SELECT id_antigo FROM ids_repetidos);
+DELETE FROM dw.fato_pesquisador_area_atuacao WHERE id_pesquisador IN (SELECT id_antigo FROM ids_repetidos);
+DELETE FROM dw.fato_pesquisador_linha_pesquisa WHERE id_pesquisador IN (SELECT id_antigo FROM ids_repetidos);
+DELETE FROM dw.fato_pesquisador_producao_localizacao WHERE id_pesquisador IN (SELECT id_antigo FROM ids_repetidos);
+DELETE FROM dw.fato_coautoria
+WHERE id_pesquisador_a IN (SELECT id_antigo FROM ids_repetidos)
+   OR id_pesquisador_b IN (SELECT id_antigo FROM ids_repetidos);
+DELETE FROM dw.resumo_pesquisador WHERE id_pesquisador IN (SELECT id_antigo FROM ids_repetidos);
+DELETE FROM dw.metricas_coautoria_pesquisador WHERE id_pesquisador IN (SELECT id_antigo FROM ids_repetidos);
+
+-- 4. Hash dos atributos rastreados (mesma expressão de dim_pesquisador.HASH_LINHA)
+UPDATE dw.dim_pesquisador
+SET hash_linha = md5(nome || '|' || atuacao_profissional);
+
+DELETE FROM dw.dim_pesquisador WHERE id_lattes IS NULL;
+
+ALTER TABLE dw.dim_pesquisador
+    ALTER COLUMN hash_linha SET NOT NULL,
+    ALTER COLUMN id_lattes SET NOT NULL;
+
+CREATE UNIQUE INDEX uq_dim_pesquisador_atual_lattes ON dw.dim_pesquisador (id_lattes) WHERE atual;
+CREATE UNIQUE INDEX uq_dim_pesquisador_atual_id ON dw.dim_pesquisador (id_pesquisador) WHERE atual;
+
+-- 5. Conferência
+SELECT
+    COUNT(*) FILTER (WHERE atual) AS versoes_vigentes,
+    COUNT(*) FILTER (WHERE NOT atual) AS versoes_encerradas,
+    COUNT(DISTINCT id_lattes) AS pesquisadores
+FROM dw.dim_pesquisador;
+
+SELECT COUNT(*) AS area_sem_pesquisador_vigente
+FROM dw.fato_pesquisador_area_atuacao f
+LEFT JOIN dw.dim_pesquisador dp
+    ON dp.id_pesquisador = f.id_pesquisador
+   AND dp.atual
+WHERE dp.id_pesquisador IS NULL;
+
+COMMIT;
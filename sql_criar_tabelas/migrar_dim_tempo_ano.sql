@@ -0,0 +1,86 @@
+-- ========================================
+-- MIGRAÇÃO: DIM_TEMPO COM CHAVE = ANO
+-- ========================================
+--
+-- Converte uma base criada com dw.dim_tempo (id_tempo SERIAL, ano) para a
+-- chave inteligente atual (id_tempo = ano, ver criar_tabelas_dim.sql).
+--
+-- As fatos passam a guardar o ano em id_tempo; as cargas e os dashboards
+-- deixam de juntar com dw.dim_tempo para obter o ano.
+--
+-- Executar uma única vez, com o pipeline parado. Tudo roda numa transação:
+-- se alguma verificação falhar, nada é alterado.
+--
+
+BEGIN;
+
+-- 1. Verificações: anos repetidos na dimensão antiga (execuções repetidas de
+--    popular_dim_tempo) ou ids que já parecem anos impedem um mapeamento 1:1
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM dw.dim_tempo GROUP BY ano HAVING COUNT(*) > 1) THEN
+        RAISE EXCEPTION 'dw.dim_tempo tem anos repetidos: recarregue as fatos em vez de migrar';
+    END IF;
+    IF EXISTS (SELECT 1 FROM dw.dim_tempo WHERE id_tempo >= 1000) THEN
+        RAISE EXCEPTION 'dw.dim_tempo tem id_tempo >= 1000: a base parece já migrada';
+    END IF;
+END $$;
+
+-- 2. Fatos: id_tempo antigo -> ano
+UPDATE dw.fato_pesquisador_producoes f
+SET id_tempo = dt.ano
+FROM dw.dim_tempo dt
+WHERE dt.id_tempo = f.id_tempo;
+
+UPDATE dw.fato_pesquisador_producao_localizacao f
+SET id_tempo = dt.ano
+FROM dw.dim_tempo dt
+WHERE dt.id_tempo = f.id_tempo;
+
+UPDATE dw.fato_coautoria f
+SET id_tempo = dt.ano
+FROM dw.dim_tempo dt
+WHERE dt.id_tempo = f.id_tempo;
+
+-- 3. Nova dimensão
+ALTER TABLE dw.dim_tempo RENAME TO dim_tempo_antiga;
+
+CREATE TABLE dw.dim_tempo (
+    id_tempo INT PRIMARY KEY,
+    ano INT GENERATED ALWAYS AS (id_tempo) STORED,
+    decada INT GENERATED ALWAYS AS (id_tempo / 10 * 10) STORED,
+    quinquenio INT GENERATED ALWAYS AS (id_tempo / 5 * 5) STORED
+);
+
+INSERT INTO dw.dim_tempo (id_tempo)
+SELECT ano FROM dw.dim_tempo_antiga;
+
+DROP TABLE dw.dim_tempo_antiga;
+
+-- 4. Índices de período nas fatos
+CREATE INDEX IF NOT EXISTS idx_fato_pesquisador_producoes_tempo ON dw.fato_pesquisador_producoes (id_tempo);
+CREATE INDEX IF NOT EXISTS idx_fato_pesq_prod_loc_tempo ON dw.fato_pesquisador_producao_localizacao (id_tempo);
+
+-- 5. Conferência: toda fato deve apontar para um ano da dimensão
+SELECT
+    'fato_pesquisador_producoes' AS tabela,
+    COUNT(*) FILTER (WHERE dt.id_tempo IS NULL) AS sem_ano
+FROM dw.fato_pesquisador_producoes f
+LEFT JOIN dw.dim_tempo dt ON dt.id_tempo = f.id_tempo
+UNION ALL
+SELECT
+    'fato_pesquisador_producao_localizacao',
+    COUNT(*) FILTER (WHERE dt.id_tempo IS NULL)
+FROM dw.fato_pesquisador_producao_localizacao f
+LEFT JOIN dw.dim_tempo dt ON dt.id_tempo = f.id_tempo
+UNION ALL
+SELECT
+    'fato_coautoria',
+    COUNT(*) FILTER (WHERE dt.id_tempo IS NULL)
+FROM dw.fato_coautoria f
+LEFT JOIN dw.dim_tempo dt ON dt.id_tempo = f.id_tempo;
+
+COMMIT;
+
+-- 6. Os agregados (dw.resumo_pesquisador, dw.cubo_producoes) guardam o ano
+--    e não precisam de migração.
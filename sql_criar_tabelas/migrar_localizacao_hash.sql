@@ -0,0 +1,54 @@
+-- ========================================
+-- MIGRAÇÃO: DIM_LOCALIZACAO_TRABALHOS COM CHAVE HASH
+-- ========================================
+--
+-- Acrescenta a dw.dim_localizacao_trabalhos a coluna gerada
+-- hash_localizacao (md5 de id_lattes, pais e instituicao), única, como em
+-- criar_tabelas_dim.sql.
+--
+-- A fato dw.fato_pesquisador_producao_localizacao é esvaziada: ela foi
+-- carregada com a junção antiga, que comparava a instituição bruta do stg
+-- com a instituição limpa da dimensão e nunca encontrava os trabalhos em
+-- eventos. Em seguida, recarregue:
+--
+--     python executar_pipeline.py dw.dim_localizacao_trabalhos \
+--         dw.fato_pesquisador_producao_localizacao dq.validacao dw.resumo_pesquisador
+--
+-- Executar uma única vez, com o pipeline parado. Tudo roda numa transação.
+--
+
+BEGIN;
+
+-- 1. Fato (recarregada depois da migração)
+TRUNCATE dw.fato_pesquisador_producao_localizacao;
+
+-- 2. Valores ausentes: a carga grava 'Não se aplica.'
+UPDATE dw.dim_localizacao_trabalhos
+SET pais = COALESCE(pais, 'Não se aplica.'),
+    instituicao = COALESCE(instituicao, 'Não se aplica.')
+WHERE pais IS NULL OR instituicao IS NULL;
+
+-- 3. Repetidos (execuções repetidas da carga): fica o menor id
+DELETE FROM dw.dim_localizacao_trabalhos dlt
+USING dw.dim_localizacao_trabalhos outra
+WHERE outra.id_lattes = dlt.id_lattes
+  AND outra.pais = dlt.pais
+  AND outra.instituicao = dlt.instituicao
+  AND outra.id_localizacao_trabalhos < dlt.id_localizacao_trabalhos;
+
+-- 4. Chave hash (mesma expressão de dim_localizacao_trabalhos.hash_localizacao)
+ALTER TABLE dw.dim_localizacao_trabalhos
+    ALTER COLUMN pais SET NOT NULL,
+    ALTER COLUMN instituicao SET NOT NULL,
+    ADD COLUMN hash_localizacao CHAR(32) GENERATED ALWAYS AS (
+        md5(id_lattes || '|' || pais || '|' || instituicao)
+    ) STORED,
+    ADD CONSTRAINT uq_dim_localizacao_trabalhos_hash UNIQUE (hash_localizacao);
+
+-- 5. Conferência
+SELECT
+    COUNT(*) AS localizacoes,
+    COUNT(DISTINCT hash_localizacao) AS chaves
+FROM dw.dim_localizacao_trabalhos;
+
+COMMIT;
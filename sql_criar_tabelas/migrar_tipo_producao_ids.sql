@@ -0,0 +1,109 @@
+-- ========================================
+-- MIGRAÇÃO: DIM_TIPO_PRODUCAO COM IDS FIXOS
+-- ========================================
+--
+-- Converte uma base criada com dw.dim_tipo_producao (id SERIAL, na ordem
+-- em que os tipos foram encontrados no staging) para os ids fixos de
+-- populando_tabelas/referencia.py. As fatos são remapeadas pelo rótulo.
+--
+-- Executar uma única vez, com o pipeline parado. Tudo roda numa transação:
+-- se alguma verificação falhar, nada é alterado.
+--
+
+BEGIN;
+
+-- 1. Definição (mesma de referencia.TIPOS_PRODUCAO, versão 1)
+CREATE TEMP TABLE tipos_referencia (id_tipo_producao, tipo_producao) AS
+VALUES
+    (1, 'Artigo'),
+    (2, 'Livro'),
+    (3, 'Capítulo de Livro'),
+    (4, 'Texto em Jornal'),
+    (5, 'Trabalho em Evento'),
+    (6, 'Apresentação de Trabalho'),
+    (7, 'Outras Produções'),
+    (8, 'projetos pesquisa');
+
+-- 2. Verificação: todo tipo da base precisa existir na definição
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM dw.dim_tipo_producao dtp
+        LEFT JOIN tipos_referencia r ON r.tipo_producao = dtp.tipo_producao
+        WHERE r.id_tipo_producao IS NULL
+    ) THEN
+        RAISE EXCEPTION 'dw.dim_tipo_producao tem tipos fora de referencia.TIPOS_PRODUCAO';
+    END IF;
+END $$;
+
+CREATE TEMP TABLE mapa_tipos AS
+SELECT dtp.id_tipo_producao AS id_antigo, r.id_tipo_producao AS id_novo
+FROM dw.dim_tipo_producao dtp
+JOIN tipos_referencia r ON r.tipo_producao = dtp.tipo_producao;
+
+-- 3. Fatos: id antigo -> id fixo. Passa por id_novo + 1000 para que a troca
+--    entre dois ids não viole uq_fato_pesq_prod_loc/uq_fato_coautoria no meio
+UPDATE dw.fato_pesquisador_producoes f
+SET id_tipo_producao = m.id_novo + 1000
+FROM mapa_tipos m
+WHERE m.id_antigo = f.id_tipo_producao;
+
+UPDATE dw.fato_pesquisador_producao_localizacao f
+SET id_tipo_producao = m.id_novo + 1000
+FROM mapa_tipos m
+WHERE m.id_antigo = f.id_tipo_producao;
+
+UPDATE dw.fato_coautoria f
+SET id_tipo_producao = m.id_novo + 1000
+FROM mapa_tipos m
+WHERE m.id_antigo = f.id_tipo_producao;
+
+UPDATE dw.fato_pesquisador_producoes SET id_tipo_producao = id_tipo_producao - 1000 WHERE id_tipo_producao > 1000;
+UPDATE dw.fato_pesquisador_producao_localizacao SET id_tipo_producao = id_tipo_producao - 1000 WHERE id_tipo_producao > 1000;
+UPDATE dw.fato_coautoria SET id_tipo_producao = id_tipo_producao - 1000 WHERE id_tipo_producao > 1000;
+
+-- 4. Nova dimensão
+DROP TABLE dw.dim_tipo_producao;
+
+CREATE TABLE dw.dim_tipo_producao (
+    id_tipo_producao INT PRIMARY KEY,
+    tipo_producao VARCHAR(100) NOT NULL UNIQUE
+);
+
+INSERT INTO dw.dim_tipo_producao (id_tipo_producao, tipo_producao)
+SELECT id_tipo_producao, tipo_producao FROM tipos_referencia;
+
+CREATE TABLE IF NOT EXISTS dw.versao_referencia (
+    tabela VARCHAR(100) PRIMARY KEY,
+    versao INT NOT NULL,
+    atualizado_em TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO dw.versao_referencia (tabela, versao)
+VALUES ('dw.dim_tipo_producao', 1)
+ON CONFLICT (tabela) DO UPDATE SET versao = EXCLUDED.versao, atualizado_em = NOW();
+
+-- 5. Conferência: toda fato deve apontar para um tipo da dimensão
+SELECT
+    'fato_pesquisador_producoes' AS tabela,
+    COUNT(*) FILTER (WHERE dtp.id_tipo_producao IS NULL) AS sem_tipo
+FROM dw.fato_pesquisador_producoes f
+LEFT JOIN dw.dim_tipo_producao dtp ON dtp.id_tipo_producao = f.id_tipo_producao
+UNION ALL
+SELECT
+    'fato_pesquisador_producao_localizacao',
+    COUNT(*) FILTER (WHERE dtp.id_tipo_producao IS NULL)
+FROM dw.fato_pesquisador_producao_localizacao f
+LEFT JOIN dw.dim_tipo_producao dtp ON dtp.id_tipo_producao = f.id_tipo_producao
+UNION ALL
+SELECT
+    'fato_coautoria',
+    COUNT(*) FILTER (WHERE dtp.id_tipo_producao IS NULL)
+FROM dw.fato_coautoria f
+LEFT JOIN dw.dim_tipo_producao dtp ON dtp.id_tipo_producao = f.id_tipo_producao;
+
+COMMIT;
+
+-- 6. Os agregados (dw.resumo_pesquisador, dw.cubo_producoes) não guardam
+--    id_tipo_producao e não precisam de migração.
@@ -0,0 +1,121 @@
+-- ========================================
+-- MIGRAÇÃO: FATOS DE PRODUÇÃO PARTICIONADAS POR DÉCADA
+-- ========================================
+--
+-- Converte dw.fato_pesquisador_producoes e
+-- dw.fato_pesquisador_producao_localizacao (tabelas comuns) para tabelas
+-- particionadas por RANGE (id_tempo), uma partição por década, como em
+-- criar_tabelas_fato.sql. Requer a migração migrar_dim_tempo_ano.sql
+-- (id_tempo = ano).
+--
+-- As partições cobrem ANO_INICIAL..ANO_FINAL de populando_tabelas/dim_tempo.py
+-- (1900-2025); o pipeline cria as que faltarem se o intervalo crescer.
+--
+-- Executar uma única vez, com o pipeline parado. Tudo roda numa transação:
+-- se alguma verificação falhar, nada é alterado.
+--
+
+BEGIN;
+
+-- 1. Verificação: anos fora do intervalo não teriam partição
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM dw.fato_pesquisador_producoes WHERE id_tempo NOT BETWEEN 1900 AND 2025)
+       OR EXISTS (SELECT 1 FROM dw.fato_pesquisador_producao_localizacao WHERE id_tempo NOT BETWEEN 1900 AND 2025) THEN
+        RAISE EXCEPTION 'Fatos com id_tempo fora de 1900-2025: rode migrar_dim_tempo_ano.sql ou recarregue as fatos';
+    END IF;
+END $$;
+
+-- 2. Cópia dos dados (mantém os ids)
+CREATE TEMP TABLE tmp_fato_pesquisador_producoes AS
+SELECT * FROM dw.fato_pesquisador_producoes;
+
+CREATE TEMP TABLE tmp_fato_pesq_prod_loc AS
+SELECT * FROM dw.fato_pesquisador_producao_localizacao;
+
+DROP TABLE dw.fato_pesquisador_producoes;
+DROP TABLE dw.fato_pesquisador_producao_localizacao;
+
+-- 3. Tabelas particionadas (mesma definição de criar_tabelas_fato.sql)
+CREATE TABLE dw.fato_pesquisador_producoes (
+    id_fato_pesquisador_producoes SERIAL,
+    id_pesquisador INT NOT NULL,
+    id_tempo INT NOT NULL,
+    id_tipo_producao INT NOT NULL,
+    qtd_producoes INT NOT NULL,
+    PRIMARY KEY (id_fato_pesquisador_producoes, id_tempo)
+) PARTITION BY RANGE (id_tempo);
+
+CREATE INDEX idx_fato_pesquisador_producoes_tempo ON dw.fato_pesquisador_producoes (id_tempo);
+
+CREATE TABLE dw.fato_pesquisador_producao_localizacao (
+    id_fato_pesq_prod_loc SERIAL,
+    id_pesquisador INT NOT NULL,
+    id_tempo INT NOT NULL,
+    id_tipo_producao INT NOT NULL,
+    id_localizacao_trabalhos INT NOT NULL,
+    qtd_producoes INT NOT NULL,
+    PRIMARY KEY (id_fato_pesq_prod_loc, id_tempo),
+    CONSTRAINT uq_fato_pesq_prod_loc UNIQUE (
+        id_pesquisador,
+        id_tempo,
+        id_tipo_producao,
+        id_localizacao_trabalhos
+    )
+) PARTITION BY RANGE (id_tempo);
+
+CREATE INDEX idx_fato_pesq_prod_loc_tempo ON dw.fato_pesquisador_producao_localizacao (id_tempo);
+
+-- 4. Partições por década (mesmos nomes de particoes.nome_particao)
+DO $$
+DECLARE
+    tabela TEXT;
+    decada INT;
+BEGIN
+    FOREACH tabela IN ARRAY ARRAY['fato_pesquisador_producoes', 'fato_pesquisador_producao_localizacao'] LOOP
+        FOR decada IN SELECT generate_series(1900, 2025, 10) LOOP
+            EXECUTE format(
+                'CREATE TABLE dw.%I PARTITION OF dw.%I FOR VALUES FROM (%s) TO (%s)',
+                tabela || '_' || decada, tabela, decada, decada + 10
+            );
+        END LOOP;
+    END LOOP;
+END $$;
+
+-- 5. Dados e sequences
+INSERT INTO dw.fato_pesquisador_producoes
+SELECT * FROM tmp_fato_pesquisador_producoes;
+
+INSERT INTO dw.fato_pesquisador_producao_localizacao
+SELECT * FROM tmp_fato_pesq_prod_loc;
+
+SELECT setval(
+    pg_get_serial_sequence('dw.fato_pesquisador_producoes', 'id_fato_pesquisador_producoes'),
+    COALESCE((SELECT MAX(id_fato_pesquisador_producoes) FROM dw.fato_pesquisador_producoes), 0) + 1,
+    false
+);
+
+SELECT setval(
+    pg_get_serial_sequence('dw.fato_pesquisador_producao_localizacao', 'id_fato_pesq_prod_loc'),
+    COALESCE((SELECT MAX(id_fato_pesq_prod_loc) FROM dw.fato_pesquisador_producao_localizacao), 0) + 1,
+    false
+);
+
+-- 6. Conferência: linhas por partição
+SELECT
+    tableoid::regclass AS particao,
+    COUNT(*) AS linhas
+FROM dw.fato_pesquisador_producoes
+GROUP BY tableoid
+UNION ALL
+SELECT
+    tableoid::regclass,
+    COUNT(*)
+FROM dw.fato_pesquisador_producao_localizacao
+GROUP BY tableoid
+ORDER BY 1;
+
+COMMIT;
+
+ANALYZE dw.fato_pesquisador_producoes;
+ANALYZE dw.fato_pesquisador_producao_localizacao;
@@ -0,0 +1,121 @@
+"""
+Carga das linhas extraídas nas tabelas stg via COPY.
+
+As linhas já chegam truncadas e na ordem das colunas (ver esquema_stg.py),
+então cada lote é serializado direto no formato texto do COPY. Se um lote
+falhar (ex: chave primária duplicada em stg.pesquisador), ele é refeito
+linha a linha com savepoints para que só as linhas inválidas sejam
+descartadas, como acontecia com os INSERTs individuais.
+"""
+
+import io
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import psycopg2
+from db.db_conexao import obter_conexao
+from stage.esquema_stg import esquema_stg
+
+TAMANHO_LOTE = 10000
+
+# Escape do formato texto do COPY; o byte NUL não é aceito pelo Postgres
+_ESCAPE_COPY = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\x00': '',
+})
+
+
+def _serializar(linhas):
+    buffer = io.StringIO()
+    for linha in linhas:
+        buffer.write('\t'.join(
+            '\\N' if valor is None else str(valor).translate(_ESCAPE_COPY)
+            for valor in linha
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+def _inserir_linha_a_linha(cursor, esquema, lote):
+    """Insere um lote com um savepoint por linha. Retorna (gravadas, rejeitadas)."""
+    colunas = ', '.join(esquema.nomes)
+    marcadores = ', '.join(['%s'] * len(esquema.nomes))
+    comando = f"INSERT INTO {esquema.tabela} ({colunas}) VALUES ({marcadores})"
+    gravadas = rejeitadas = 0
+    for linha in lote:
+        cursor.execute("SAVEPOINT linha_stg;")
+        try:
+            cursor.execute(comando, tuple(
+                valor.replace('\x00', '') if isinstance(valor, str) else valor for valor in linha
+            ))
+            cursor.execute("RELEASE SAVEPOINT linha_stg;")
+            gravadas += 1
+        except psycopg2.Error:
+            cursor.execute("ROLLBACK TO SAVEPOINT linha_stg;")
+            rejeitadas += 1
+    return gravadas, rejeitadas
+
+
+def copiar_para_stg(esquema, linhas, tamanho_lote=TAMANHO_LOTE):
+    """
+    Grava as linhas na tabela stg do esquema usando COPY, em lotes.
+
+    Linhas com colunas NOT NULL vazias são descartadas antes da carga.
+
+    Args:
+        esquema (EsquemaTabela): Esquema da tabela de destino
+        linhas (list): Linhas criadas com esquema.linha()
+        tamanho_lote (int): Linhas por comando COPY (e por commit)
+
+    Returns:
+        tuple: (linhas gravadas, linhas rejeitadas)
+    """
+    validas = [linha for linha in linhas if esquema.valida(linha)]
+    rejeitadas = len(linhas) - len(validas)
+    gravadas = 0
+
+    comando = f"COPY {esquema.tabela} ({', '.join(esquema.nomes)}) FROM STDIN"
+    conn = obter_conexao()
+    try:
+        cursor = conn.cursor()
+        for inicio in range(0, len(validas), tamanho_lote):
+            lote = validas[inicio:inicio + tamanho_lote]
+            try:
+                cursor.copy_expert(comando, _serializar(lote))
+                conn.commit()
+                gravadas += len(lote)
+            except psycopg2.Error as e:
+                conn.rollback()
+                print(f"COPY em {esquema.tabela} falhou ({e.__class__.__name__}); "
+                      f"refazendo {len(lote)} linhas individualmente")
+                ok, erro = _inserir_linha_a_linha(cursor, esquema, lote)
+                conn.commit()
+                gravadas += ok
+                rejeitadas += erro
+        cursor.close()
+    finally:
+        conn.close()
+
+    return gravadas, rejeitadas
+
+
+def salvar_autoria(autorias, metricas):
+    """
+    Grava as linhas de stg.autoria emitidas junto com as produções.
+
+    Args:
+        autorias (list): Linhas criadas pelos extratores (ver extrator.emitir_autoria)
+        metricas (MetricasEtapa): Recebe autorias gravadas e rejeitadas
+    """
+    if not autorias:
+        return
+    try:
+        gravadas, rejeitadas = copiar_para_stg(esquema_stg('stg.autoria'), autorias)
+        metricas.registrar(autorias_gravadas=gravadas, autorias_rejeitadas=rejeitadas)
+    except Exception as e:
+        print(f"Erro ao gravar stg.autoria: {e}")
+        raise
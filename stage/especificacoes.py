@@ -0,0 +1,253 @@
+"""
+Especificação declarativa da extração de cada tabela stg.
+
+Cada entrada diz onde ficam os registros dentro de CURRICULO-VITAE e de
+quais atributos sai cada coluna:
+
+    secao     Caminho de chaves até o nó que contém a lista de registros.
+              Qualquer passo pode ser um objeto ou uma lista de objetos.
+    no        Chave da lista de registros (None: o próprio currículo é o registro)
+    campos    {grupo: {atributo: coluna}}. O grupo é o caminho, separado
+              por '/', do elemento filho que tem os atributos ('' = o próprio
+              registro). Grupos ausentes viram atributos vazios.
+    autores   Se True, a coluna 'autores' recebe "ordem|nome; ..." de AUTORES
+
+A coluna id_lattes é sempre preenchida a partir do currículo. Tamanhos de
+truncamento e colunas obrigatórias vêm do DDL (ver esquema_stg.py): um
+registro sem alguma coluna NOT NULL é ignorado.
+
+Para incluir um novo tipo de produção basta criar a tabela stg no DDL e
+acrescentar a entrada aqui; o extrator é gerado por extrator.compilar().
+"""
+
+from collections import namedtuple
+
+Especificacao = namedtuple('Especificacao', ['tabela', 'secao', 'no', 'campos', 'autores'])
+
+ESPECIFICACOES = {e.tabela: e for e in [
+    Especificacao(
+        tabela='stg.pesquisador',
+        secao=(),
+        no=None,
+        campos={
+            'DADOS-GERAIS': {
+                '@NOME-COMPLETO': 'nome',
+            },
+            'DADOS-GERAIS/ENDERECO/ENDERECO-PROFISSIONAL': {
+                '@NOME-INSTITUICAO-EMPRESA': 'atuacao_profissional',
+            },
+        },
+        autores=False,
+    ),
+    Especificacao(
+        tabela='stg.linha_pesquisa',
+        secao=('DADOS-GERAIS', 'ATUACOES-PROFISSIONAIS', 'ATUACAO-PROFISSIONAL',
+               'ATIVIDADES-DE-PESQUISA-E-DESENVOLVIMENTO', 'PESQUISA-E-DESENVOLVIMENTO'),
+        no='LINHA-DE-PESQUISA',
+        campos={
+            '': {
+                '@TITULO-DA-LINHA-DE-PESQUISA': 'linha_pesquisa',
+            },
+        },
+        autores=False,
+    ),
+    Especificacao(
+        tabela='stg.areas_atuacao',
+        secao=('DADOS-GERAIS', 'AREAS-DE-ATUACAO'),
+        no='AREA-DE-ATUACAO',
+        campos={
+            '': {
+                '@NOME-GRANDE-AREA-DO-CONHECIMENTO': 'nome_grande_area',
+                '@NOME-DA-AREA-DO-CONHECIMENTO': 'nome_area',
+                '@NOME-DA-SUB-AREA-DO-CONHECIMENTO': 'nome_sub_area',
+                '@NOME-DA-ESPECIALIDADE': 'nome_especialidade',
+            },
+        },
+        autores=False,
+    ),
+    Especificacao(
+        tabela='stg.projetos_pesquisa',
+        secao=('DADOS-GERAIS', 'ATUACOES-PROFISSIONAIS', 'ATUACAO-PROFISSIONAL',
+               'ATIVIDADES-DE-PARTICIPACAO-EM-PROJETO', 'PARTICIPACAO-EM-PROJETO'),
+        no='PROJETO-DE-PESQUISA',
+        campos={
+            '': {
+                '@ANO-INICIO': 'ano_inicio',
+                '@ANO-FIM': 'ano_fim',
+                '@NOME-DO-PROJETO': 'nome_projeto',
+                '@DESCRICAO-DO-PROJETO': 'descricao_projeto',
+                '@SITUACAO': 'situacao',
+                '@NATUREZA': 'natureza',
+            },
+        },
+        autores=False,
+    ),
+    Especificacao(
+        tabela='stg.artigos',
+        secao=('PRODUCAO-BIBLIOGRAFICA', 'ARTIGOS-PUBLICADOS'),
+        no='ARTIGO-PUBLICADO',
+        campos={
+            'DADOS-BASICOS-DO-ARTIGO': {
+                '@ANO-DO-ARTIGO': 'ano',
+                '@TITULO-DO-ARTIGO': 'titulo',
+                '@DOI': 'doi',
+                '@IDIOMA': 'idioma',
+                '@NATUREZA': 'natureza',
+                '@MEIO-DE-DIVULGACAO': 'meio_divulgacao',
+            },
+            'DETALHAMENTO-DO-ARTIGO': {
+                '@TITULO-DO-PERIODICO-OU-REVISTA': 'titulo_periodico',
+                '@VOLUME': 'volume',
+                '@PAGINA-INICIAL': 'pagina_inicial',
+                '@PAGINA-FINAL': 'pagina_final',
+                '@ISSN': 'issn',
+                '@LOCAL-DE-PUBLICACAO': 'local_publicacao',
+            },
+        },
+        autores=True,
+    ),
+    Especificacao(
+        tabela='stg.livros',
+        secao=('PRODUCAO-BIBLIOGRAFICA', 'LIVROS-E-CAPITULOS', 'LIVROS-PUBLICADOS-OU-ORGANIZADOS'),
+        no='LIVRO-PUBLICADO-OU-ORGANIZADO',
+        campos={
+            'DADOS-BASICOS-DO-LIVRO': {
+                '@TITULO-DO-LIVRO': 'titulo',
+                '@ANO': 'ano',
+            },
+            'DETALHAMENTO-DO-LIVRO': {
+                '@NUMERO-DA-EDICAO-REVISAO': 'numero_edicao',
+                '@CIDADE-DA-EDITORA': 'cidade_editora',
+                '@NOME-DA-EDITORA': 'nome_editora',
+                '@NUMERO-DE-VOLUMES': 'numero_volumes',
+                '@NUMERO-DE-PAGINAS': 'numero_paginas',
+            },
+        },
+        autores=True,
+    ),
+    Especificacao(
+        tabela='stg.capitulos_livros',
+        secao=('PRODUCAO-BIBLIOGRAFICA', 'LIVROS-E-CAPITULOS', 'CAPITULOS-DE-LIVROS-PUBLICADOS'),
+        no='CAPITULO-DE-LIVRO-PUBLICADO',
+        campos={
+            'DADOS-BASICOS-DO-CAPITULO': {
+                '@TITULO-DO-CAPITULO-DO-LIVRO': 'titulo_capitulo',
+                '@ANO': 'ano',
+                '@DOI': 'doi',
+                '@IDIOMA': 'idioma',
+                '@MEIO-DE-DIVULGACAO': 'meio_divulgacao',
+            },
+            'DETALHAMENTO-DO-CAPITULO': {
+                '@TITULO-DO-LIVRO': 'titulo_livro',
+                '@NUMERO-DA-EDICAO-REVISAO': 'numero_edicao',
+                '@CIDADE-DA-EDITORA': 'cidade_editora',
+                '@NOME-DA-EDITORA': 'nome_editora',
+                '@ISBN': 'isbn',
+                '@PAGINA-INICIAL': 'pagina_inicial',
+                '@PAGINA-FINAL': 'pagina_final',
+                '@ORGANIZADORES': 'organizadores',
+            },
+        },
+        autores=True,
+    ),
+    Especificacao(
+        tabela='stg.textos_jornais',
+        secao=('PRODUCAO-BIBLIOGRAFICA', 'TEXTOS-EM-JORNAIS-OU-REVISTAS'),
+        no='TEXTO-EM-JORNAL-OU-REVISTA',
+        campos={
+            'DADOS-BASICOS-DO-TEXTO': {
+                '@TITULO-DO-TEXTO': 'titulo',
+                '@ANO-DO-TEXTO': 'ano',
+                '@DOI': 'doi',
+                '@IDIOMA': 'idioma',
+                '@NATUREZA': 'natureza',
+                '@MEIO-DE-DIVULGACAO': 'meio_divulgacao',
+            },
+            'DETALHAMENTO-DO-TEXTO': {
+                '@TITULO-DO-JORNAL-OU-REVISTA': 'titulo_jornal',
+                '@DATA-DE-PUBLICACAO': 'data_publicacao',
+                '@LOCAL-DE-PUBLICACAO': 'local_publicacao',
+                '@PAGINA-INICIAL': 'pagina_inicial',
+                '@PAGINA-FINAL': 'pagina_final',
+                '@VOLUME': 'volume',
+                '@ISSN': 'issn',
+            },
+        },
+        autores=True,
+    ),
+    Especificacao(
+        tabela='stg.trabalhos_eventos',
+        secao=('PRODUCAO-BIBLIOGRAFICA', 'TRABALHOS-EM-EVENTOS'),
+        no='TRABALHO-EM-EVENTOS',
+        campos={
+            'DADOS-BASICOS-DO-TRABALHO': {
+                '@TITULO-DO-TRABALHO': 'titulo',
+                '@ANO-DO-TRABALHO': 'ano',
+                '@DOI': 'doi',
+                '@IDIOMA': 'idioma',
+                '@NATUREZA': 'natureza',
+                '@MEIO-DE-DIVULGACAO': 'meio_divulgacao',
+                '@PAIS-DO-EVENTO': 'pais_evento',
+            },
+            'DETALHAMENTO-DO-TRABALHO': {
+                '@NOME-DO-EVENTO': 'nome_evento',
+                '@TITULO-DOS-ANAIS-OU-PROCEEDINGS': 'titulo_anais',
+                '@ANO-DE-REALIZACAO': 'ano_realizacao',
+                '@CIDADE-DO-EVENTO': 'cidade_evento',
+                '@CLASSIFICACAO-DO-EVENTO': 'classificacao_evento',
+                '@NOME-DA-EDITORA': 'nome_editora',
+                '@CIDADE-DA-EDITORA': 'cidade_editora',
+                '@ISBN': 'isbn',
+                '@VOLUME': 'volume',
+                '@PAGINA-INICIAL': 'pagina_inicial',
+                '@PAGINA-FINAL': 'pagina_final',
+            },
+        },
+        autores=True,
+    ),
+    Especificacao(
+        tabela='stg.apresentacoes_trabalho',
+        secao=('PRODUCAO-TECNICA', 'DEMAIS-TIPOS-DE-PRODUCAO-TECNICA'),
+        no='APRESENTACAO-DE-TRABALHO',
+        campos={
+            'DADOS-BASICOS-DA-APRESENTACAO-DE-TRABALHO': {
+                '@TITULO': 'titulo',
+                '@ANO': 'ano',
+                '@DOI': 'doi',
+                '@IDIOMA': 'idioma',
+                '@NATUREZA': 'natureza',
+                '@PAIS': 'pais',
+            },
+            'DETALHAMENTO-DA-APRESENTACAO-DE-TRABALHO': {
+                '@NOME-DO-EVENTO': 'nome_evento',
+                '@CIDADE-DA-APRESENTACAO': 'cidade_apresentacao',
+                '@LOCAL-DA-APRESENTACAO': 'local_apresentacao',
+                '@INSTITUICAO-PROMOTORA': 'instituicao_promotora',
+            },
+        },
+        autores=True,
+    ),
+    Especificacao(
+        tabela='stg.outras_producoes',
+        secao=('PRODUCAO-BIBLIOGRAFICA', 'DEMAIS-TIPOS-DE-PRODUCAO-BIBLIOGRAFICA'),
+        no='OUTRA-PRODUCAO-BIBLIOGRAFICA',
+        campos={
+            'DADOS-BASICOS-DE-OUTRA-PRODUCAO': {
+                '@TITULO': 'titulo',
+                '@ANO': 'ano',
+                '@DOI': 'doi',
+                '@IDIOMA': 'idioma',
+                '@NATUREZA': 'natureza',
+                '@MEIO-DE-DIVULGACAO': 'meio_divulgacao',
+                '@PAIS-DE-PUBLICACAO': 'pais_publicacao',
+            },
+            'DETALHAMENTO-DE-OUTRA-PRODUCAO': {
+                '@CIDADE-DA-EDITORA': 'cidade_editora',
+                '@EDITORA': 'editora',
+                '@ISSN-ISBN': 'issn_isbn',
+                '@NUMERO-DE-PAGINAS': 'numero_paginas',
+            },
+        },
+        autores=True,
+    ),
+]}
@@ -0,0 +1,127 @@
+"""
+Esquema das tabelas stg, lido do DDL em sql_criar_tabelas/criar_tabelas_stg.sql.
+
+Os extratores de stage produzem linhas de formato fixo (namedtuples com
+as colunas na mesma ordem da tabela) em vez de dicionários. O tamanho
+máximo de cada coluna VARCHAR vem do DDL, então o truncamento é aplicado
+uma única vez, na criação da linha, e a carga via COPY só precisa
+serializar a tupla.
+
+Uso:
+    ARTIGOS = esquema_stg('stg.artigos')
+    linha = ARTIGOS.linha(id_lattes=..., ano=..., titulo=...)
+"""
+
+import os
+import re
+from collections import namedtuple
+
+ARQUIVO_DDL = os.path.join(os.path.dirname(__file__), '..', 'sql_criar_tabelas', 'criar_tabelas_stg.sql')
+
+_RE_TABELA = re.compile(r'CREATE TABLE\s+(\w+\.\w+)\s*\((.*?)\);', re.IGNORECASE | re.DOTALL)
+_RE_COLUNA = re.compile(r'^\s*(\w+)\s+(\w+)(?:\s*\(\s*(\d+)\s*\))?(.*)$', re.IGNORECASE)
+
+Coluna = namedtuple('Coluna', ['nome', 'tipo', 'limite', 'obrigatoria'])
+
+
+class EsquemaTabela:
+    """
+    Colunas carregáveis de uma tabela stg (sem as colunas SERIAL) e o tipo
+    de linha correspondente.
+
+    Attributes:
+        tabela (str): Nome qualificado da tabela (ex: 'stg.artigos')
+        colunas (tuple): Colunas na ordem do DDL
+        Linha (type): namedtuple com um campo por coluna
+    """
+
+    def __init__(self, tabela, colunas):
+        self.tabela = tabela
+        self.colunas = tuple(colunas)
+        self.nomes = tuple(c.nome for c in self.colunas)
+        self.Linha = namedtuple(
+            'Linha_' + tabela.split('.')[-1], self.nomes, defaults=(None,) * len(self.nomes)
+        )
+        self._limites = tuple(c.limite for c in self.colunas)
+        self._obrigatorias = tuple(i for i, c in enumerate(self.colunas) if c.obrigatoria)
+
+    def linha(self, **valores):
+        """
+        Cria uma linha a partir dos valores nomeados, truncando cada campo
+        ao tamanho da coluna. Strings vazias viram None.
+
+        Raises:
+            TypeError: Se algum nome não for coluna da tabela
+        """
+        bruta = self.Linha(**valores)
+        return self.Linha._make([
+            (valor[:limite] if limite else valor) if valor else None
+            for valor, limite in zip(bruta, self._limites)
+        ])
+
+    def valida(self, linha):
+        """Indica se todas as colunas NOT NULL da linha estão preenchidas."""
+        return all(linha[i] is not None for i in self._obrigatorias)
+
+
+def _parse_coluna(definicao):
+    correspondencia = _RE_COLUNA.match(definicao)
+    if not correspondencia:
+        return None
+    nome, tipo, limite, restante = correspondencia.groups()
+    if nome.upper() in ('PRIMARY', 'UNIQUE', 'CONSTRAINT', 'FOREIGN', 'CHECK'):
+        return None
+    restante = restante.upper()
+    return Coluna(
+        nome=nome,
+        tipo=tipo.upper(),
+        limite=int(limite) if limite and tipo.upper() == 'VARCHAR' else None,
+        obrigatoria='NOT NULL' in restante or 'PRIMARY KEY' in restante,
+    )
+
+
+def carregar_esquemas(caminho=ARQUIVO_DDL):
+    """
+    Lê o DDL das tabelas stg.
+
+    Args:
+        caminho (str): Arquivo SQL com os CREATE TABLE
+
+    Returns:
+        dict: {nome da tabela: EsquemaTabela}
+    """
+    with open(caminho, 'r', encoding='utf-8') as f:
+        ddl = f.read()
+
+    esquemas = {}
+    for tabela, corpo in _RE_TABELA.findall(ddl):
+        colunas = []
+        for definicao in corpo.split(','):
+            coluna = _parse_coluna(definicao.strip())
+            # Colunas SERIAL são preenchidas pelo banco
+            if coluna and coluna.tipo != 'SERIAL':
+                colunas.append(coluna)
+        esquemas[tabela] = EsquemaTabela(tabela, colunas)
+    return esquemas
+
+
+_ESQUEMAS = None
+
+
+def esquema_stg(tabela):
+    """
+    Retorna o esquema de uma tabela stg (o DDL é lido uma única vez).
+
+    Args:
+        tabela (str): Nome qualificado (ex: 'stg.trabalhos_eventos')
+
+    Returns:
+        EsquemaTabela: Esquema da tabela
+
+    Raises:
+        KeyError: Se a tabela não estiver no DDL
+    """
+    global _ESQUEMAS
+    if _ESQUEMAS is None:
+        _ESQUEMAS = carregar_esquemas()
+    return _ESQUEMAS[tabela]
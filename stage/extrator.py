@@ -0,0 +1,297 @@
+"""
+Extratores de stage gerados a partir de especificacoes.py.
+
+Cada especificação é compilada uma única vez em uma função Python
+especializada (gerada como código-fonte e compilada com exec). A função
+desce direto pelas chaves da seção, normaliza objeto/lista só onde o
+formato do Lattes permite as duas formas, lê os atributos com um único
+.get cada e já monta a linha truncada na ordem das colunas da tabela stg.
+
+Uso:
+    linhas = extrair_tabela('stg.artigos', metricas)
+    por_tabela = extrair_tabelas(['stg.artigos', 'stg.livros'], metricas)
+"""
+
+import hashlib
+
+from stage.esquema_stg import esquema_stg
+from stage.especificacoes import ESPECIFICACOES
+from stage.fonte_curriculos import iterar_curriculos
+
+_VAZIO = {}
+_AUTORIA = esquema_stg('stg.autoria')
+
+
+def concatenar_autores(autores):
+    """
+    Converte o nó AUTORES em "ordem|nome; ordem|nome".
+
+    Returns:
+        str | None: Autores concatenados, ou None se não houver nenhum
+    """
+    if autores.__class__ is dict:
+        autores = (autores,)
+    elif autores.__class__ is not list:
+        return None
+    lista = [
+        f"{autor.get('@ORDEM-DE-AUTORIA', '')}|{autor['@NOME-PARA-CITACAO']}"
+        for autor in autores
+        if autor.__class__ is dict and autor.get('@NOME-PARA-CITACAO')
+    ]
+    return '; '.join(lista) if lista else None
+
+
+def hash_producao(tabela, id_lattes, titulo, ano):
+    """
+    Identificador de uma produção em stg.autoria.
+
+    Equivale, em SQL, a md5(concat_ws('|', tabela, id_lattes, titulo, ano))
+    sobre a linha da tabela stg de origem (concat_ws ignora NULLs), o que
+    permite ligar stg.autoria de volta à produção.
+    """
+    chave = '|'.join(valor for valor in (tabela, id_lattes, titulo, ano) if valor)
+    return hashlib.md5(chave.encode('utf-8')).hexdigest()
+
+
+def emitir_autoria(destino, tabela, id_lattes, titulo, ano, autores):
+    """
+    Acrescenta em `destino` uma linha de stg.autoria por autor do nó AUTORES.
+    """
+    if autores.__class__ is dict:
+        autores = (autores,)
+    elif autores.__class__ is not list:
+        return
+    hash_prod = None
+    for autor in autores:
+        if autor.__class__ is not dict or not autor.get('@NOME-PARA-CITACAO'):
+            continue
+        hash_prod = hash_prod or hash_producao(tabela, id_lattes, titulo, ano)
+        destino.append(_AUTORIA.linha(
+            hash_producao=hash_prod,
+            tabela_origem=tabela,
+            id_lattes=id_lattes,
+            ano=ano,
+            ordem_autoria=autor.get('@ORDEM-DE-AUTORIA'),
+            nome_citacao=autor['@NOME-PARA-CITACAO'],
+            nro_id_cnpq=autor.get('@NRO-ID-CNPQ'),
+        ))
+
+
+def identificar_curriculo(curriculo_vitae):
+    """
+    Id Lattes do currículo; sem @NUMERO-IDENTIFICADOR, usa o nome sem espaços.
+    """
+    id_lattes = curriculo_vitae.get('@NUMERO-IDENTIFICADOR')
+    if id_lattes:
+        return id_lattes
+    dados_gerais = curriculo_vitae.get('DADOS-GERAIS')
+    if dados_gerais.__class__ is dict:
+        return (dados_gerais.get('@NOME-COMPLETO') or '').replace(' ', '')
+    return ''
+
+
+def gerar_codigo(espec, esquema):
+    """
+    Gera o código-fonte do extrator de uma especificação.
+
+    A função gerada tem a assinatura extrair(cv, id_lattes, autorias=None)
+    e retorna a lista de linhas (esquema.Linha) encontradas no currículo.
+    Se `autorias` for uma lista, recebe também as linhas de stg.autoria
+    dos registros com AUTORES.
+    """
+    colunas_mapeadas = {
+        coluna for atributos in espec.campos.values() for coluna in atributos.values()
+    }
+    desconhecidas = colunas_mapeadas - set(esquema.nomes)
+    if desconhecidas:
+        raise ValueError(f"{espec.tabela}: colunas fora do DDL: {', '.join(sorted(desconhecidas))}")
+
+    codigo = []
+    linha = codigo.append
+    linha("def extrair(cv, id_lattes, autorias=None):")
+    linha("    linhas = []")
+    recuo = "    "
+
+    # Descida pela seção até a lista de registros
+    atual = "cv"
+    passos = list(espec.secao) + ([espec.no] if espec.no else [])
+    for i, chave in enumerate(passos):
+        lista, no = f"l{i}", f"n{i}"
+        linha(f"{recuo}{lista} = {atual}.get({chave!r})")
+        linha(f"{recuo}if {lista}.__class__ is dict: {lista} = ({lista},)")
+        linha(f"{recuo}elif {lista}.__class__ is not list: {lista} = ()")
+        linha(f"{recuo}for {no} in {lista}:")
+        recuo += "    "
+        linha(f"{recuo}if {no}.__class__ is not dict: continue")
+        atual = no
+    if not passos:
+        # O próprio currículo é o registro; o laço de um item permite o 'continue'
+        linha(f"{recuo}for registro in (cv,):")
+        recuo += "    "
+        atual = "registro"
+
+    # Grupos de atributos (DADOS-BASICOS-..., DETALHAMENTO-...)
+    origem = {}
+    for g, (grupo, atributos) in enumerate(espec.campos.items()):
+        variavel = atual
+        if grupo:
+            variavel = f"g{g}"
+            anterior = atual
+            for chave in grupo.split('/'):
+                linha(f"{recuo}{variavel} = {anterior}.get({chave!r})")
+                linha(f"{recuo}if {variavel}.__class__ is not dict: {variavel} = _VAZIO")
+                anterior = variavel
+        for atributo, coluna in atributos.items():
+            origem[coluna] = f"{variavel}.get({atributo!r})"
+
+    # Valores das colunas; obrigatórias primeiro, para descartar cedo
+    valores = []
+    for i, coluna in enumerate(esquema.colunas):
+        if coluna.nome == 'id_lattes':
+            expressao = "id_lattes"
+        elif coluna.nome == 'autores' and espec.autores:
+            expressao = f"_autores({atual}.get('AUTORES'))"
+        elif coluna.nome in origem:
+            expressao = origem[coluna.nome]
+        else:
+            valores.append("None")
+            continue
+        linha(f"{recuo}c{i} = {expressao}")
+        if coluna.obrigatoria:
+            linha(f"{recuo}if not c{i}: continue")
+        if coluna.limite:
+            valores.append(f"c{i}[:{coluna.limite}] if c{i} else None")
+        else:
+            valores.append(f"c{i} or None")
+
+    linha(f"{recuo}registro_linha = _Linha({', '.join(f'({v})' for v in valores)})")
+    linha(f"{recuo}linhas.append(registro_linha)")
+    if espec.autores:
+        # Autoria normalizada: produção identificada por (tabela, id_lattes, título, ano)
+        titulo = next(i for i, c in enumerate(esquema.colunas) if c.obrigatoria and c.nome != 'id_lattes')
+        ano = esquema.nomes.index('ano') if 'ano' in esquema.nomes else None
+        expressao_ano = f"registro_linha[{ano}]" if ano is not None else "None"
+        linha(f"{recuo}if autorias is not None:")
+        id_lattes = esquema.nomes.index('id_lattes')
+        linha(f"{recuo}    _autoria(autorias, {espec.tabela!r}, registro_linha[{id_lattes}], registro_linha[{titulo}], "
+              f"{expressao_ano}, {atual}.get('AUTORES'))")
+    linha("    return linhas")
+    return '\n'.join(codigo) + '\n'
+
+
+def compilar(tabela):
+    """
+    Compila o extrator especializado de uma tabela stg.
+
+    Args:
+        tabela (str): Nome qualificado (ex: 'stg.artigos')
+
+    Returns:
+        function: extrair(cv, id_lattes, autorias=None) -> list de linhas
+    """
+    espec = ESPECIFICACOES[tabela]
+    esquema = esquema_stg(tabela)
+    codigo = gerar_codigo(espec, esquema)
+    escopo = {
+        '_VAZIO': _VAZIO,
+        '_Linha': esquema.Linha,
+        '_autores': concatenar_autores,
+        '_autoria': emitir_autoria,
+    }
+    exec(compile(codigo, f"<extrator {tabela}>", 'exec'), escopo)
+    return escopo['extrair']
+
+
+_COMPILADOS = {}
+
+
+def obter_extrator(tabela):
+    """Extrator compilado da tabela (compilado na primeira chamada)."""
+    if tabela not in _COMPILADOS:
+        _COMPILADOS[tabela] = compilar(tabela)
+    return _COMPILADOS[tabela]
+
+
+def caminhos_xml(tabelas):
+    """
+    Caminhos do currículo que os extratores das tabelas usam, para que a
+    leitura do XML (fonte_xml.py) converta só o necessário.
+
+    Returns:
+        tuple: (subárvores inteiras, caminhos dos quais só os atributos interessam)
+    """
+    subarvores, atributos = set(), set()
+    for tabela in tabelas:
+        espec = ESPECIFICACOES[tabela]
+        if espec.no:
+            subarvores.add(tuple(espec.secao) + (espec.no,))
+        else:
+            # Registro é o próprio currículo: só os atributos dos grupos
+            atributos.update(tuple(grupo.split('/')) for grupo in espec.campos if grupo)
+    return subarvores, atributos
+
+
+def extrair_tabelas(tabelas, metricas, autorias=None):
+    """
+    Lê cada currículo uma vez e aplica os extratores das tabelas informadas.
+
+    Args:
+        tabelas (list): Nomes das tabelas stg
+        metricas (MetricasEtapa): Recebe bytes lidos, linhas lidas e contagens de arquivos
+        autorias (list, optional): Se informada, recebe as linhas de stg.autoria
+
+    Returns:
+        dict: {tabela: lista de linhas}
+    """
+    extratores = [(tabela, obter_extrator(tabela)) for tabela in tabelas]
+    resultado = {tabela: [] for tabela in tabelas}
+    arquivos_com_registros = {tabela: 0 for tabela in tabelas}
+    total_arquivos = 0
+
+    subarvores, atributos = caminhos_xml(tabelas)
+    for origem, tamanho, ler in iterar_curriculos(subarvores_xml=subarvores, atributos_xml=atributos):
+        total_arquivos += 1
+        metricas.bytes_lidos += tamanho
+        try:
+            dados = ler()
+        except Exception as e:
+            print(f"Erro ao ler {origem}: {e}")
+            continue
+
+        curriculo_vitae = dados.get("CURRICULO-VITAE")
+        if curriculo_vitae.__class__ is not dict:
+            continue
+        id_lattes = identificar_curriculo(curriculo_vitae)
+        if not id_lattes:
+            continue
+
+        for tabela, extrair in extratores:
+            linhas = extrair(curriculo_vitae, id_lattes, autorias)
+            if linhas:
+                resultado[tabela].extend(linhas)
+                arquivos_com_registros[tabela] += 1
+
+    for tabela in tabelas:
+        metricas.linhas_lidas += len(resultado[tabela])
+    if len(tabelas) == 1:
+        metricas.registrar(arquivos_processados=total_arquivos,
+                           arquivos_com_registros=arquivos_com_registros[tabelas[0]])
+    else:
+        metricas.registrar(arquivos_processados=total_arquivos,
+                           arquivos_com_registros=arquivos_com_registros)
+    return resultado
+
+
+def extrair_tabela(tabela, metricas, autorias=None):
+    """
+    Extrai as linhas de uma única tabela stg de todos os currículos.
+
+    Args:
+        tabela (str): Nome da tabela stg
+        metricas (MetricasEtapa): Métricas da etapa
+        autorias (list, optional): Se informada, recebe as linhas de stg.autoria
+
+    Returns:
+        list: Linhas (esquema.Linha) na ordem das colunas da tabela
+    """
+    return extrair_tabelas([tabela], metricas, autorias)[tabela]
@@ -0,0 +1,286 @@
+import bz2
+import gzip
+import json
+import lzma
+import mmap
+import os
+import tarfile
+import zipfile
+from functools import partial
+
+from stage.fonte_xml import ler_curriculo_xml
+
+# Pasta padrão com os currículos Lattes convertidos para JSON
+PASTA_JSON_PADRAO = os.path.join(os.path.dirname(__file__), "lattes_tcc", "arquivos_json")
+
+
+def obter_pasta_json():
+    """
+    Retorna a pasta de onde os scripts de stage leem os currículos.
+
+    A variável de ambiente LATTES_PASTA_JSON sobrescreve a pasta padrão
+    (stage/lattes_tcc/arquivos_json). O benchmark usa isso para rodar os
+    extratores sobre recortes do corpus com tamanhos diferentes.
+
+    Returns:
+        str: Caminho absoluto da pasta de currículos
+    """
+    return os.path.abspath(os.getenv("LATTES_PASTA_JSON", PASTA_JSON_PADRAO))
+
+
+def listar_arquivos_json(pasta=None):
+    """
+    Lista os currículos JSON da pasta de entrada.
+
+    Args:
+        pasta (str, optional): Pasta a listar. Padrão: obter_pasta_json()
+
+    Returns:
+        list: Caminhos completos dos arquivos .json
+    """
+    pasta = pasta or obter_pasta_json()
+    return [
+        os.path.join(pasta, nome)
+        for nome in os.listdir(pasta)
+        if nome.endswith(".json")
+    ]
+
+
+# Arquivos a partir deste tamanho são lidos via mmap em vez de read()
+LIMIAR_MMAP = 1024 * 1024
+
+
+def _carregar_backends():
+    """
+    Decodificadores JSON disponíveis, do mais rápido para o mais lento.
+    Todos recebem bytes (ou memoryview) em UTF-8 e devolvem dict/list.
+    """
+    backends = {}
+    try:
+        import orjson
+        backends['orjson'] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import simdjson
+        backends['simdjson'] = lambda dados: simdjson.loads(bytes(dados))
+    except ImportError:
+        pass
+    backends['json'] = lambda dados: json.loads(bytes(dados))
+    return backends
+
+
+BACKENDS_JSON = _carregar_backends()
+
+
+def obter_backend_json():
+    """
+    Nome do decodificador JSON em uso.
+
+    A variável LATTES_JSON_BACKEND força um backend ('orjson', 'simdjson'
+    ou 'json'); sem ela, usa o mais rápido instalado. O json da biblioteca
+    padrão está sempre disponível.
+
+    Raises:
+        ValueError: Se o backend pedido não estiver instalado
+    """
+    pedido = os.getenv("LATTES_JSON_BACKEND")
+    if pedido:
+        if pedido not in BACKENDS_JSON:
+            raise ValueError(f"Backend JSON indisponível: {pedido} "
+                             f"(instalados: {', '.join(BACKENDS_JSON)})")
+        return pedido
+    return next(iter(BACKENDS_JSON))
+
+
+def ler_bytes(caminho, funcao):
+    """
+    Aplica `funcao` ao conteúdo do arquivo, lido via mmap quando o arquivo
+    passa de LIMIAR_MMAP (sem copiar para um buffer intermediário).
+
+    Args:
+        caminho (str): Arquivo a ler
+        funcao (callable): Recebe bytes ou memoryview
+
+    Returns:
+        O retorno de `funcao`
+    """
+    with open(caminho, 'rb') as f:
+        tamanho = os.fstat(f.fileno()).st_size
+        if tamanho < LIMIAR_MMAP:
+            return funcao(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            with memoryview(mapa) as visao:
+                return funcao(visao)
+
+
+def ler_curriculo(caminho, backend=None):
+    """
+    Lê e decodifica um currículo JSON.
+
+    Args:
+        caminho (str): Arquivo .json
+        backend (str, optional): Backend a usar. Padrão: obter_backend_json()
+
+    Returns:
+        dict: Conteúdo do currículo
+    """
+    return ler_bytes(caminho, BACKENDS_JSON[backend or obter_backend_json()])
+
+
+def obter_pasta_entrada():
+    """
+    Pasta lida pelos extratores. LATTES_PASTA_XML aponta para uma pasta com
+    os XML originais do Lattes (.xml ou .zip baixados da plataforma); sem
+    ela, usa a pasta de JSON (obter_pasta_json()).
+    """
+    pasta_xml = os.getenv("LATTES_PASTA_XML")
+    return os.path.abspath(pasta_xml) if pasta_xml else obter_pasta_json()
+
+
+def decodificar_json(dados, backend=None):
+    """
+    Decodifica um currículo JSON já em memória (ex: membro de um arquivo
+    compactado) com o backend em uso.
+
+    Args:
+        dados (bytes): Conteúdo em UTF-8
+        backend (str, optional): Backend a usar. Padrão: obter_backend_json()
+
+    Returns:
+        dict: Conteúdo do currículo
+    """
+    return BACKENDS_JSON[backend or obter_backend_json()](dados)
+
+
+def _abrir_zstd(arquivo):
+    try:
+        import zstandard
+    except ImportError:
+        arquivo.close()
+        raise RuntimeError("Leitura de .zst requer o pacote zstandard (pip install zstandard)")
+    return zstandard.ZstdDecompressor().stream_reader(arquivo, closefd=True)
+
+
+# Compressões de arquivo único: sufixo -> função que abre o conteúdo descompactado
+_DESCOMPACTADORES = {
+    '.gz': lambda caminho: gzip.open(caminho, 'rb'),
+    '.bz2': lambda caminho: bz2.open(caminho, 'rb'),
+    '.xz': lambda caminho: lzma.open(caminho, 'rb'),
+    '.zst': lambda caminho: _abrir_zstd(open(caminho, 'rb')),
+}
+
+_SUFIXOS_TAR = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz', '.tar.zst', '.tzst')
+
+
+def _separar_compressao(nome):
+    """Retorna (nome sem o sufixo de compressão, sufixo ou None)."""
+    for sufixo in _DESCOMPACTADORES:
+        if nome.endswith(sufixo):
+            return nome[:-len(sufixo)], sufixo
+    return nome, None
+
+
+def _ler_conteudo(nome, abrir, subarvores_xml, atributos_xml):
+    """
+    Leitor adiado de um membro/arquivo já descompactado. `abrir` devolve
+    um arquivo binário; o JSON é lido inteiro e o XML em streaming.
+    """
+    def ler():
+        with abrir() as conteudo:
+            if nome.endswith(".xml"):
+                return ler_curriculo_xml(conteudo, subarvores_xml, atributos_xml)
+            return decodificar_json(conteudo.read())
+    return ler
+
+
+def _iterar_zip(caminho, subarvores_xml, atributos_xml):
+    with zipfile.ZipFile(caminho) as arquivo_zip:
+        for membro in arquivo_zip.infolist():
+            if not membro.filename.endswith((".json", ".xml")):
+                continue
+            abrir = partial(arquivo_zip.open, membro)
+            yield (f"{caminho}:{membro.filename}", membro.compress_size,
+                   _ler_conteudo(membro.filename, abrir, subarvores_xml, atributos_xml))
+
+
+def _iterar_tar(caminho, subarvores_xml, atributos_xml):
+    # Modo stream ('r|'): os membros são lidos em sequência, sem seek
+    if caminho.endswith(('.tar.zst', '.tzst')):
+        origem = _abrir_zstd(open(caminho, 'rb'))
+        try:
+            arquivo_tar = tarfile.open(fileobj=origem, mode='r|')
+        except Exception:
+            origem.close()
+            raise
+    else:
+        origem = None
+        arquivo_tar = tarfile.open(caminho, mode='r|*')
+
+    # O tamanho do arquivo compactado é contado uma vez, no primeiro membro
+    tamanho = os.path.getsize(caminho)
+    try:
+        for membro in arquivo_tar:
+            if not membro.isfile() or not membro.name.endswith((".json", ".xml")):
+                continue
+            abrir = partial(arquivo_tar.extractfile, membro)
+            yield (f"{caminho}:{membro.name}", tamanho,
+                   _ler_conteudo(membro.name, abrir, subarvores_xml, atributos_xml))
+            tamanho = 0
+    finally:
+        arquivo_tar.close()
+        if origem is not None:
+            origem.close()
+
+
+def iterar_curriculos(pasta=None, subarvores_xml=(), atributos_xml=()):
+    """
+    Percorre os currículos da pasta de entrada, em JSON ou no XML original,
+    soltos ou dentro de arquivos compactados.
+
+    Formatos aceitos (pela extensão):
+        .json / .xml                     Arquivo solto (JSON lido via mmap)
+        .json.gz / .json.zst / .xml.gz   Arquivo único compactado (também .bz2, .xz)
+        .zip                             Membros .json ou .xml (inclui o .zip do Lattes)
+        .tar, .tar.gz, .tgz, .tar.bz2,   Membros .json ou .xml, lidos em sequência
+        .tar.xz, .tar.zst
+
+    Nada é extraído para o disco: cada membro é descompactado em memória
+    (JSON) ou em streaming (XML, via fonte_xml.ler_curriculo_xml()).
+    Arquivos .zst exigem o pacote opcional zstandard.
+
+    Args:
+        pasta (str, optional): Pasta de entrada. Padrão: obter_pasta_entrada()
+        subarvores_xml (set): Subárvores a converter quando a entrada é XML
+        atributos_xml (set): Caminhos dos quais só os atributos são lidos
+
+    Yields:
+        tuple: (origem, bytes lidos do disco, ler) onde ler() decodifica e
+        retorna o currículo. A leitura é adiada para que o chamador trate
+        os erros de cada arquivo; ler() deve ser chamada antes de pedir o
+        próximo item (os membros de .tar são lidos em sequência).
+        Arquivos compactados que não abrem (corrompidos, .zst sem
+        zstandard) são informados e ignorados; os demais seguem.
+    """
+    pasta = pasta or obter_pasta_entrada()
+    for nome in os.listdir(pasta):
+        caminho = os.path.join(pasta, nome)
+        if nome.endswith(_SUFIXOS_TAR) or nome.endswith(".zip"):
+            iterar = _iterar_tar if nome.endswith(_SUFIXOS_TAR) else _iterar_zip
+            try:
+                yield from iterar(caminho, subarvores_xml, atributos_xml)
+            except Exception as e:
+                print(f"Erro ao abrir {caminho}: {e} (restante do arquivo ignorado)")
+            continue
+
+        base, compressao = _separar_compressao(nome)
+        if not base.endswith((".json", ".xml")):
+            continue
+        tamanho = os.path.getsize(caminho)
+        if compressao:
+            abrir = partial(_DESCOMPACTADORES[compressao], caminho)
+            yield caminho, tamanho, _ler_conteudo(base, abrir, subarvores_xml, atributos_xml)
+        elif base.endswith(".json"):
+            yield caminho, tamanho, partial(ler_curriculo, caminho)
+        else:
+            yield caminho, tamanho, partial(ler_curriculo_xml, caminho, subarvores_xml, atributos_xml)
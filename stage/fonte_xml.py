@@ -0,0 +1,128 @@
+"""
+Leitura direta do XML original do Lattes (ou do .zip baixado da plataforma).
+
+Os currículos em arquivos_json são uma conversão do XML no formato
+"@ATRIBUTO" / elemento repetido vira lista. Este leitor usa iterparse e
+monta só as partes do currículo que os extratores usam, já nesse mesmo
+formato, para que os extratores compilados (extrator.py) produzam
+exatamente as mesmas linhas a partir do XML.
+
+Cada subárvore é convertida assim que o elemento fecha e em seguida é
+removida da árvore, então a memória fica limitada ao que é extraído,
+mesmo em currículos muito grandes. Seções que nenhum extrator usa
+(formação, orientações, bancas...) são descartadas durante a leitura.
+"""
+
+import xml.etree.ElementTree as ET
+
+# Atributos de DADOS-GERAIS são usados para identificar o currículo
+CAMINHOS_ATRIBUTOS_PADRAO = {('DADOS-GERAIS',)}
+
+
+def elemento_para_dict(elemento):
+    """
+    Converte um elemento e seus filhos no formato dos arquivos JSON:
+    atributos com prefixo '@', filhos repetidos viram lista, texto em
+    '#text' quando há atributos e elementos vazios viram None.
+    """
+    no = {'@' + chave: valor for chave, valor in elemento.attrib.items()}
+    for filho in elemento:
+        valor = elemento_para_dict(filho)
+        _anexar(no, filho.tag, valor)
+    texto = (elemento.text or '').strip()
+    if texto:
+        if not no:
+            return texto
+        no['#text'] = texto
+    return no or None
+
+
+def _anexar(pai, chave, valor):
+    if chave not in pai:
+        pai[chave] = valor
+    elif isinstance(pai[chave], list):
+        pai[chave].append(valor)
+    else:
+        pai[chave] = [pai[chave], valor]
+
+
+def _prefixos(caminhos):
+    prefixos = set()
+    for caminho in caminhos:
+        for i in range(1, len(caminho) + 1):
+            prefixos.add(caminho[:i])
+    return prefixos
+
+
+def ler_curriculo_xml(arquivo, subarvores, caminhos_atributos=()):
+    """
+    Lê um currículo Lattes em XML de forma incremental.
+
+    Args:
+        arquivo: Caminho ou arquivo binário aberto (ex: membro de um .zip)
+        subarvores (set): Caminhos (tuplas de tags abaixo de CURRICULO-VITAE)
+            cujas subárvores inteiras são convertidas
+        caminhos_atributos (set): Caminhos dos quais só os atributos interessam
+
+    Returns:
+        dict: {'CURRICULO-VITAE': {...}} no mesmo formato dos arquivos JSON
+    """
+    subarvores = set(subarvores)
+    prefixos = _prefixos(subarvores) | _prefixos(set(caminhos_atributos) | CAMINHOS_ATRIBUTOS_PADRAO)
+
+    raiz = None
+    elementos = []      # pilha de elementos abertos
+    caminhos = []       # caminho de cada elemento da pilha
+    nos = []            # dict montado para cada elemento (None fora dos prefixos)
+    profundidade_subarvore = 0
+    profundidade_descarte = 0
+
+    for evento, elemento in ET.iterparse(arquivo, events=('start', 'end')):
+        if evento == 'start':
+            if raiz is None:
+                raiz = {'@' + chave: valor for chave, valor in elemento.attrib.items()}
+                elementos.append(elemento)
+                caminhos.append(())
+                nos.append(raiz)
+                continue
+
+            caminho = caminhos[-1] + (elemento.tag,)
+            no = None
+            if profundidade_subarvore:
+                profundidade_subarvore += 1
+            elif profundidade_descarte:
+                profundidade_descarte += 1
+            elif caminho in subarvores:
+                profundidade_subarvore = 1
+            elif caminho in prefixos:
+                no = {'@' + chave: valor for chave, valor in elemento.attrib.items()}
+                _anexar(nos[-1], elemento.tag, no)
+            else:
+                profundidade_descarte = 1
+
+            elementos.append(elemento)
+            caminhos.append(caminho)
+            nos.append(no)
+            continue
+
+        # evento == 'end'
+        elementos.pop()
+        caminhos.pop()
+        nos.pop()
+        if not elementos:
+            break
+
+        if profundidade_subarvore:
+            profundidade_subarvore -= 1
+            if profundidade_subarvore:
+                continue
+            # Fim da subárvore: converte e anexa ao nó pai
+            _anexar(nos[-1], elemento.tag, elemento_para_dict(elemento))
+        elif profundidade_descarte:
+            profundidade_descarte -= 1
+
+        # Libera o elemento já consumido
+        elemento.clear()
+        elementos[-1].remove(elemento)
+
+    return {'CURRICULO-VITAE': raiz if raiz is not None else {}}
@@ -0,0 +1,254 @@
+"""
+Perfil das colunas das tabelas stg, calculado logo depois da carga.
+
+Cada tabela é lida uma única vez: todas as estatísticas de todas as
+colunas saem de uma só consulta agregada (COUNT ... FILTER, MIN, MAX). As
+tabelas são perfiladas em paralelo, cada uma na sua conexão.
+
+Por coluna:
+    nulos       NULL ou '' (o stage grava strings vazias como NULL)
+    distintos   estimativa do ANALYZE (pg_stats.n_distinct), que amostra
+                a tabela em vez de ordená-la inteira
+    minimo/maximo
+    padroes     para colunas de ano e data: quantos valores são ano no
+                intervalo de dim_tempo, ano fora dele, data DDMMAAAA,
+                data ISO ou outro formato
+    truncados   valores com exatamente o tamanho da coluna VARCHAR; o
+                stage trunca nesse tamanho (ver esquema_stg.py), então é
+                o limite superior dos valores cortados na carga
+
+Os perfis são gravados em dq.perfil_stg com o id da execução; colunas cuja
+taxa de nulos ou de truncados mudou desde a execução anterior são
+listadas ao final.
+
+Variáveis de ambiente:
+    ETL_PERFIL_STG_PARALELISMO  Tabelas perfiladas ao mesmo tempo (padrão: 4)
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from db.db_conexao import obter_cursor
+from monitoramento.metricas import diagnostico_ativo, id_execucao, medir_etapa
+from populando_tabelas.dim_tempo import ANO_INICIAL, ANO_FINAL
+from stage.esquema_stg import carregar_esquemas
+
+PARALELISMO_PADRAO = 4
+
+# Variação de taxa (nulos ou truncados) entre execuções que é reportada
+LIMIAR_DERIVA = 0.05
+
+# Classes de formato das colunas de ano e data (a ordem é a das colunas do SELECT)
+PADROES = {
+    'ano_valido': f"CASE WHEN {{c}} ~ '^[0-9]{{{{4}}}}$' THEN {{c}}::INT END BETWEEN {ANO_INICIAL} AND {ANO_FINAL}",
+    'ano_fora_intervalo': f"CASE WHEN {{c}} ~ '^[0-9]{{{{4}}}}$' THEN {{c}}::INT END NOT BETWEEN {ANO_INICIAL} AND {ANO_FINAL}",
+    'data_ddmmaaaa': "{c} ~ '^[0-9]{{8}}$'",
+    'data_iso': "{c} ~ '^[0-9]{{4}}-[0-9]{{2}}-[0-9]{{2}}'",
+}
+
+
+def coluna_temporal(nome):
+    """Indica se a coluna guarda um ano ou uma data (ex: ano, ano_fim, data_publicacao)."""
+    return nome == 'ano' or nome.startswith('ano_') or nome.startswith('data_')
+
+
+def compilar_perfil(esquema):
+    """
+    Monta a consulta agregada que perfila todas as colunas de uma tabela.
+
+    Args:
+        esquema (EsquemaTabela): Esquema da tabela stg
+
+    Returns:
+        tuple: (query, lista de (coluna, medida) na ordem das colunas do
+            SELECT, depois de "linhas")
+    """
+    expressoes = ["COUNT(*)"]
+    medidas = []
+    for coluna in esquema.colunas:
+        c = coluna.nome
+        expressoes += [
+            f"COUNT(*) FILTER (WHERE {c} IS NULL OR {c}::TEXT = '')",
+            f"LEFT(MIN({c})::TEXT, 100)",
+            f"LEFT(MAX({c})::TEXT, 100)",
+        ]
+        medidas += [(c, 'nulos'), (c, 'minimo'), (c, 'maximo')]
+        if coluna.limite:
+            expressoes.append(f"COUNT(*) FILTER (WHERE LENGTH({c}) = {coluna.limite})")
+            medidas.append((c, 'truncados'))
+        if coluna_temporal(c):
+            for padrao, condicao in PADROES.items():
+                expressoes.append(f"COUNT(*) FILTER (WHERE {condicao.format(c=c)})")
+                medidas.append((c, padrao))
+
+    query = "SELECT\n    " + ",\n    ".join(expressoes) + f"\nFROM {esquema.tabela};"
+    return query, medidas
+
+
+def perfilar_tabela(esquema):
+    """
+    Perfila uma tabela stg (na sua própria conexão).
+
+    Returns:
+        list: Um dict por coluna (tabela, coluna, linhas, nulos, distintos,
+            minimo, maximo, padroes, truncados)
+    """
+    query, medidas = compilar_perfil(esquema)
+    schema, tabela = esquema.tabela.split('.')
+    with obter_cursor() as cursor:
+        cursor.execute(query)
+        valores = cursor.fetchone()
+        # Estatísticas por amostragem; também deixam o planejador pronto
+        # para as cargas do DW que leem esta tabela
+        cursor.execute(f"ANALYZE {esquema.tabela};")
+        cursor.execute(
+            "SELECT attname, n_distinct FROM pg_stats WHERE schemaname = %s AND tablename = %s;",
+            (schema, tabela)
+        )
+        n_distinct = dict(cursor.fetchall())
+
+    linhas = valores[0]
+    perfis = {
+        coluna.nome: {'tabela': esquema.tabela, 'coluna': coluna.nome, 'linhas': linhas,
+                      'padroes': {}, 'truncados': None}
+        for coluna in esquema.colunas
+    }
+    for (coluna, medida), valor in zip(medidas, valores[1:]):
+        if medida in PADROES:
+            perfis[coluna]['padroes'][medida] = valor
+        else:
+            perfis[coluna][medida] = valor
+
+    for perfil in perfis.values():
+        # n_distinct negativo é fração das linhas
+        estimativa = n_distinct.get(perfil['coluna'])
+        if estimativa is not None and estimativa < 0:
+            estimativa = -estimativa * linhas
+        perfil['distintos'] = round(estimativa) if estimativa is not None else None
+        if perfil['padroes']:
+            perfil['padroes']['outro'] = (linhas - perfil['nulos']
+                                          - sum(perfil['padroes'].values()))
+    return list(perfis.values())
+
+
+def gravar_perfis(cursor, perfis):
+    """Grava os perfis da execução atual em dq.perfil_stg."""
+    from psycopg2.extras import execute_values
+
+    execucao = id_execucao()
+    execute_values(cursor, """
+        INSERT INTO dq.perfil_stg (
+            id_execucao,
+            tabela,
+            coluna,
+            linhas,
+            nulos,
+            distintos,
+            minimo,
+            maximo,
+            padroes,
+            truncados
+        ) VALUES %s
+    """, [
+        (execucao, p['tabela'], p['coluna'], p['linhas'], p['nulos'], p['distintos'],
+         p['minimo'], p['maximo'], json.dumps(p['padroes']) if p['padroes'] else None, p['truncados'])
+        for p in perfis
+    ])
+
+
+def _taxa(quantidade, linhas):
+    return (quantidade or 0) / linhas if linhas else 0.0
+
+
+def comparar_execucao_anterior(cursor, perfis):
+    """
+    Compara as taxas de nulos e de truncados com o perfil anterior de cada
+    tabela.
+
+    Returns:
+        list: (tabela, coluna, medida, taxa anterior, taxa atual) das colunas
+            que variaram pelo menos LIMIAR_DERIVA
+    """
+    cursor.execute("""
+        WITH anterior AS (
+            SELECT DISTINCT ON (tabela) tabela, id_execucao
+            FROM dq.perfil_stg
+            WHERE id_execucao <> %s
+            ORDER BY tabela, perfilado_em DESC
+        )
+        SELECT p.tabela, p.coluna, p.linhas, p.nulos, p.truncados
+        FROM dq.perfil_stg p
+        JOIN anterior a
+            ON a.tabela = p.tabela
+           AND a.id_execucao = p.id_execucao;
+    """, (id_execucao(),))
+    anteriores = {(tabela, coluna): (linhas, nulos, truncados)
+                  for tabela, coluna, linhas, nulos, truncados in cursor.fetchall()}
+
+    derivas = []
+    for p in perfis:
+        if (p['tabela'], p['coluna']) not in anteriores:
+            continue
+        linhas, nulos, truncados = anteriores[(p['tabela'], p['coluna'])]
+        for medida, antes, agora in (
+            ('nulos', _taxa(nulos, linhas), _taxa(p['nulos'], p['linhas'])),
+            ('truncados', _taxa(truncados, linhas), _taxa(p['truncados'], p['linhas'])),
+        ):
+            if abs(agora - antes) >= LIMIAR_DERIVA:
+                derivas.append((p['tabela'], p['coluna'], medida, antes, agora))
+    return derivas
+
+
+def perfilar_stg(tabelas=None):
+    """
+    Perfila as tabelas stg e grava os perfis desta execução.
+
+    Args:
+        tabelas (list, optional): Tabelas a perfilar. Padrão: todas do DDL stg
+    """
+
+    try:
+        esquemas = carregar_esquemas()
+        selecionadas = tabelas or list(esquemas)
+        paralelismo = int(os.getenv('ETL_PERFIL_STG_PARALELISMO', PARALELISMO_PADRAO))
+
+        with medir_etapa('stg.perfil') as metricas:
+            with metricas.fase('perfil'):
+                with ThreadPoolExecutor(max_workers=paralelismo) as executor:
+                    por_tabela = list(executor.map(
+                        lambda tabela: perfilar_tabela(esquemas[tabela]), selecionadas
+                    ))
+            perfis = [perfil for lista in por_tabela for perfil in lista]
+            metricas.linhas_lidas = sum(lista[0]['linhas'] for lista in por_tabela if lista)
+
+            with metricas.fase('gravacao'), obter_cursor() as cursor:
+                gravar_perfis(cursor, perfis)
+                derivas = comparar_execucao_anterior(cursor, perfis)
+            metricas.linhas_gravadas = len(perfis)
+            metricas.registrar(tabelas=len(selecionadas), colunas_com_deriva=len(derivas))
+
+            if diagnostico_ativo():
+                print(f"\n{'Coluna':<45} {'Nulos':>8} {'Distintos':>10} {'Truncados':>10}")
+                print("-" * 76)
+                for p in perfis:
+                    truncados = f"{_taxa(p['truncados'], p['linhas']):.1%}" if p['truncados'] is not None else '-'
+                    distintos = f"{p['distintos']:,}" if p['distintos'] is not None else '-'
+                    print(f"{p['tabela'] + '.' + p['coluna']:<45} "
+                          f"{_taxa(p['nulos'], p['linhas']):>8.1%} {distintos:>10} {truncados:>10}")
+                    if p['padroes']:
+                        print(f"      • {', '.join(f'{k}: {v}' for k, v in p['padroes'].items())}")
+
+            if derivas:
+                print(f"\nColunas com variação desde a execução anterior (>= {LIMIAR_DERIVA:.0%}):")
+                for tabela, coluna, medida, antes, agora in derivas:
+                    print(f"   • {tabela}.{coluna} {medida}: {antes:.1%} -> {agora:.1%}")
+
+    except Exception as e:
+        print(f"Erro ao perfilar as tabelas stg: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    perfilar_stg()
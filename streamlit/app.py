@@ -8,6 +8,7 @@ import streamlit as st
 from pathlib import Path
 from PIL import Image
 from db_utils import test_connection, get_metric_value
+from camada_semantica import valor
 from ufes_theme import (
     load_css, 
     render_header, 
@@ -78,20 +79,14 @@ col1, col2, col3, col4 = st.columns(4)
 
 try:
     with col1:
-        total_pesquisadores = get_metric_value("""
-            SELECT COUNT(DISTINCT id_pesquisador) 
-            FROM dw.dim_pesquisador;
-        """)
+        total_pesquisadores = valor('total_pesquisadores')
         st.metric(
             label="Total de Pesquisadores",
             value=f"{total_pesquisadores:,}"
         )
     
     with col2:
-        total_producoes = get_metric_value("""
-            SELECT SUM(qtd_producoes) 
-            FROM dw.fato_pesquisador_producoes;
-        """)
+        total_producoes = valor('total_producoes')
         st.metric(
             label="Total de Produções",
             value=f"{total_producoes:,}"
@@ -0,0 +1,286 @@
+"""
+Camada semântica das métricas dos dashboards.
+
+Métricas e dimensões são definidas uma única vez aqui e compiladas para
+SQL. Cada métrica pertence a um modelo (tabela fato ou dimensão base);
+consultar() escolhe a fonte mais agregada capaz de responder à pergunta
+(ver AGREGADOS) e só recorre ao modelo base quando nenhum agregado
+serve. Novos agregados materializados entram em AGREGADOS e passam a ser
+usados por todas as páginas, sem mudar as consultas.
+
+As consultas compiladas ficam em cache: a chave é a estrutura da
+consulta (métricas, dimensões e quais filtros estão ativos), e os
+valores dos filtros vão sempre como parâmetros.
+
+Exemplo:
+    consultar(['total_producoes'], ['ano'], filtros)
+    valor('total_pesquisadores')
+"""
+
+from functools import lru_cache
+
+from cubo import agrupamento_mais_proximo
+from db_utils import run_query, get_metric_value
+from filtros_globais import filtros_ativos, sql_filtros, params_filtros
+
+# Mesmos rótulos usados na construção do cubo (populando_tabelas/cubo_producoes.py)
+GRANDE_AREA = "COALESCE(NULLIF(TRIM(da.grande_area), ''), 'Não informada')"
+AREA = "COALESCE(NULLIF(TRIM(da.area), ''), 'Não informada')"
+
+JUNCAO_TIPO = "JOIN dw.dim_tipo_producao dtp ON dtp.id_tipo_producao = f.id_tipo_producao"
+JUNCAO_AREA = "JOIN dw.dim_area da ON da.id_area = fpa.id_area"
+
+# Modelos base: tabela, condição fixa opcional e, para cada dimensão,
+# (expressão SQL, junção necessária).
+# Dimensões em 'multiplicam' repetem linhas da fato (um pesquisador tem várias
+# áreas): só são juntadas quando agrupadas; como filtro, viram EXISTS.
+MODELOS = {
+    'producoes': {
+        'tabela': "dw.fato_pesquisador_producoes f",
+        'dimensoes': {
+            # id_tempo é o próprio ano: sem junção com dw.dim_tempo
+            'ano': ("f.id_tempo", None),
+            'tipo_producao': ("dtp.tipo_producao", JUNCAO_TIPO),
+            'grande_area': ("pa.grande_area", f"""JOIN (
+  SELECT DISTINCT fpa.id_pesquisador, {GRANDE_AREA} AS grande_area
+  FROM dw.fato_pesquisador_area_atuacao fpa
+  {JUNCAO_AREA}
+) pa ON pa.id_pesquisador = f.id_pesquisador"""),
+            'id_pesquisador': ("f.id_pesquisador", None),
+        },
+        'multiplicam': {'grande_area'},
+    },
+    'areas_atuacao': {
+        'tabela': "dw.fato_pesquisador_area_atuacao fpa",
+        'dimensoes': {
+            'grande_area': (GRANDE_AREA, JUNCAO_AREA),
+            'area': (AREA, JUNCAO_AREA),
+            'id_pesquisador': ("fpa.id_pesquisador", None),
+        },
+        'multiplicam': set(),
+    },
+    'pesquisadores': {
+        'tabela': "dw.dim_pesquisador dp",
+        # Dimensão tipo 2: só a versão vigente de cada pesquisador
+        'condicao': "dp.atual",
+        'dimensoes': {
+            'id_pesquisador': ("dp.id_pesquisador", None),
+        },
+        'multiplicam': set(),
+    },
+}
+
+# Métricas: modelo, expressão de agregação sobre o modelo e se é aditiva
+# (pode ser somada entre células de um agregado)
+METRICAS = {
+    'total_producoes': {
+        'modelo': 'producoes',
+        'expressao': "SUM(f.qtd_producoes)",
+        'aditiva': True,
+    },
+    'pesquisadores_produtivos': {
+        'modelo': 'producoes',
+        'expressao': "COUNT(DISTINCT f.id_pesquisador)",
+        'aditiva': False,
+    },
+    'media_producoes_por_pesquisador': {
+        'modelo': 'producoes',
+        'expressao': "ROUND(SUM(f.qtd_producoes) * 1.0 / NULLIF(COUNT(DISTINCT f.id_pesquisador), 0), 2)",
+        'aditiva': False,
+    },
+    'pesquisadores_area': {
+        'modelo': 'areas_atuacao',
+        'expressao': "COUNT(DISTINCT fpa.id_pesquisador)",
+        'aditiva': False,
+    },
+    'total_pesquisadores': {
+        'modelo': 'pesquisadores',
+        'expressao': "COUNT(*)",
+        'aditiva': True,
+    },
+}
+
+# Agregados materializados, em ordem de preferência. 'metricas' dá a
+# expressão de cada métrica sobre as linhas do agregado; 'filtros' são os
+# filtros globais que ele consegue aplicar.
+AGREGADOS = [
+    {
+        'nome': 'cubo_producoes',
+        'tabela': "dw.cubo_producoes c",
+        'dimensoes': {
+            'grande_area': "c.grande_area",
+            'area': "c.area",
+            'ano': "c.ano",
+            'tipo_producao': "c.tipo_producao",
+        },
+        'filtros': {'ano', 'tipo_producao', 'grande_area'},
+        'metricas': {
+            'total_producoes': "SUM(c.qtd_producoes)",
+            'pesquisadores_produtivos': "SUM(c.qtd_pesquisadores)",
+            'media_producoes_por_pesquisador': "ROUND(SUM(c.qtd_producoes) * 1.0 / NULLIF(SUM(c.qtd_pesquisadores), 0), 2)",
+        },
+        'agrupamentos': True,
+    },
+    {
+        'nome': 'resumo_pesquisador',
+        'tabela': "dw.resumo_pesquisador r",
+        'dimensoes': {
+            'id_pesquisador': "r.id_pesquisador",
+        },
+        # Grande área e pesquisador recortam pesquisadores inteiros; anos e
+        # tipos mudariam os totais de cada um
+        'filtros': {'grande_area', 'pesquisador'},
+        'metricas': {
+            'total_producoes': "SUM(r.total_producoes)",
+            'pesquisadores_produtivos': "COUNT(*) FILTER (WHERE r.total_producoes > 0)",
+            'media_producoes_por_pesquisador': "ROUND(SUM(r.total_producoes) * 1.0 / NULLIF(COUNT(*) FILTER (WHERE r.total_producoes > 0), 0), 2)",
+        },
+        'agrupamentos': False,
+    },
+]
+
+
+def _assinatura_filtros(filtros):
+    """(nome, valor único?) de cada filtro ativo: o que muda a consulta compilada."""
+    assinatura = []
+    for nome in sorted(filtros_ativos(filtros or {})):
+        valor = filtros[nome]
+        if nome == 'ano':
+            unico = valor[0] == valor[1]
+        else:
+            unico = len(valor) == 1
+        assinatura.append((nome, unico))
+    return tuple(assinatura)
+
+
+def _compilar_agregado(agregado, metricas, agrupar_por, assinatura):
+    """SQL sobre um agregado, ou None se ele não responde à consulta."""
+    ativos = {nome for nome, _ in assinatura}
+    if not all(metrica in agregado['metricas'] for metrica in metricas):
+        return None
+    if not set(agrupar_por) <= set(agregado['dimensoes']):
+        return None
+    if not ativos <= agregado['filtros']:
+        return None
+
+    condicoes = ""
+    if agregado['agrupamentos']:
+        # Grande área/área se sobrepõem (um pesquisador em várias): somar
+        # células de áreas diferentes contaria a mesma produção duas vezes
+        unicos = {nome for nome, unico in assinatura if unico}
+        for nome in ativos - set(agrupar_por):
+            if nome in ('grande_area', 'area') and nome not in unicos:
+                return None
+        # O mesmo rótulo de área existe em várias grandes áreas
+        if 'area' in agrupar_por and 'grande_area' not in agrupar_por and 'grande_area' not in unicos:
+            return None
+
+        agrupamento = agrupamento_mais_proximo(set(agrupar_por) | ativos)
+        exato = set(agrupamento) - set(agrupar_por) <= unicos
+        if not exato and not all(METRICAS[metrica]['aditiva'] for metrica in metricas):
+            return None
+        condicoes = f"\n  AND c.agrupamento = '{','.join(agrupamento)}'"
+
+    condicoes += sql_filtros(ativos, agregado['dimensoes'])
+
+    selecao = [f"{agregado['dimensoes'][dimensao]} AS {dimensao}" for dimensao in agrupar_por]
+    selecao += [f"{agregado['metricas'][metrica]} AS {metrica}" for metrica in metricas]
+    agrupamento_sql = ', '.join(agregado['dimensoes'][dimensao] for dimensao in agrupar_por)
+    return _montar_select(selecao, agregado['tabela'], [], condicoes, agrupamento_sql, agrupar_por)
+
+
+def _compilar_modelo(metricas, agrupar_por, assinatura):
+    """SQL sobre o modelo base das métricas."""
+    modelo = MODELOS[METRICAS[metricas[0]]['modelo']]
+    ativos = {nome for nome, _ in assinatura}
+
+    desconhecidas = set(agrupar_por) - set(modelo['dimensoes'])
+    if desconhecidas:
+        raise ValueError(f"Dimensões fora do modelo: {', '.join(sorted(desconhecidas))}")
+
+    # Colunas usadas pelos filtros: dimensões do modelo, exceto as que
+    # multiplicam linhas e não estão agrupadas (essas viram EXISTS)
+    colunas_filtro = {
+        nome: expressao
+        for nome, (expressao, _) in modelo['dimensoes'].items()
+        if nome not in modelo['multiplicam'] or nome in agrupar_por
+    }
+    usadas = set(agrupar_por) | {nome for nome in ativos if nome in colunas_filtro}
+    juncoes = []
+    for nome, (_, juncao) in modelo['dimensoes'].items():
+        if nome in usadas and juncao and juncao not in juncoes:
+            juncoes.append(juncao)
+
+    selecao = [f"{modelo['dimensoes'][dimensao][0]} AS {dimensao}" for dimensao in agrupar_por]
+    selecao += [f"{METRICAS[metrica]['expressao']} AS {metrica}" for metrica in metricas]
+    agrupamento_sql = ', '.join(modelo['dimensoes'][dimensao][0] for dimensao in agrupar_por)
+    condicoes = sql_filtros(ativos, colunas_filtro)
+    if 'condicao' in modelo:
+        condicoes = f"\n  AND {modelo['condicao']}" + condicoes
+    return _montar_select(selecao, modelo['tabela'], juncoes, condicoes, agrupamento_sql, agrupar_por)
+
+
+def _montar_select(selecao, tabela, juncoes, condicoes, agrupamento_sql, agrupar_por):
+    linhas = ["SELECT", "  " + ",\n  ".join(selecao), f"FROM {tabela}"]
+    linhas += juncoes
+    linhas.append(f"WHERE TRUE{condicoes}")
+    if agrupamento_sql:
+        linhas.append(f"GROUP BY {agrupamento_sql}")
+        linhas.append(f"ORDER BY {', '.join(agrupar_por)}")
+    return '\n'.join(linhas) + ';'
+
+
+@lru_cache(maxsize=256)
+def _compilar(metricas, agrupar_por, assinatura):
+    for agregado in AGREGADOS:
+        query = _compilar_agregado(agregado, metricas, agrupar_por, assinatura)
+        if query:
+            return agregado['nome'], query
+    return METRICAS[metricas[0]]['modelo'], _compilar_modelo(metricas, agrupar_por, assinatura)
+
+
+def compilar(metricas, agrupar_por=(), filtros=None):
+    """
+    Compila uma consulta de métricas para SQL.
+
+    Args:
+        metricas (list): Nomes das métricas (de um mesmo modelo, ver METRICAS)
+        agrupar_por (list): Dimensões do resultado (ex: ['ano'])
+        filtros (dict, optional): Filtros no formato dos filtros globais
+            (ver filtros_globais.obter_filtros)
+
+    Returns:
+        tuple: (fonte usada, query, params)
+
+    Raises:
+        ValueError: Métrica desconhecida ou métricas de modelos diferentes
+    """
+    metricas = tuple(metricas)
+    desconhecidas = [metrica for metrica in metricas if metrica not in METRICAS]
+    if desconhecidas:
+        raise ValueError(f"Métricas desconhecidas: {', '.join(desconhecidas)}")
+    if len({METRICAS[metrica]['modelo'] for metrica in metricas}) > 1:
+        raise ValueError("Métricas de modelos diferentes devem ser consultadas separadamente")
+
+    filtros = filtros or {}
+    fonte, query = _compilar(metricas, tuple(agrupar_por), _assinatura_filtros(filtros))
+    return fonte, query, params_filtros(filtros)
+
+
+def consultar(metricas, agrupar_por=(), filtros=None):
+    """
+    Executa uma consulta de métricas (ver compilar).
+
+    Returns:
+        DataFrame: Uma coluna por dimensão e por métrica, ordenado pelas dimensões
+    """
+    _, query, params = compilar(metricas, agrupar_por, filtros)
+    return run_query(query, params)
+
+
+def valor(metrica, filtros=None):
+    """
+    Valor total de uma métrica (sem agrupamento).
+    """
+    _, query, params = compilar([metrica], (), filtros)
+    return get_metric_value(query, params)
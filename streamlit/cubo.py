@@ -0,0 +1,135 @@
+"""
+Consultas ao cubo de produções (dw.cubo_producoes).
+
+O cubo guarda agregados pré-calculados para as combinações de
+(grande_area, area, ano, tipo_producao) listadas em AGRUPAMENTOS (ver
+populando_tabelas/cubo_producoes.py). consultar_cubo() escolhe o menor
+agrupamento que contém as dimensões pedidas e filtradas: se ele é
+exatamente o pedido, a consulta é uma leitura direta pelo índice;
+senão, os agregados desse agrupamento são somados.
+
+Grande área e área não são somadas entre valores diferentes: um
+pesquisador pode ter várias áreas, então a mesma produção aparece em mais
+de uma célula. Filtrar por vários valores de uma delas sem agrupá-la é
+recusado, assim como usar área sem fixar a grande área (agrupando-a ou
+filtrando um único valor): rótulos de área como 'Não informada' se
+repetem entre grandes áreas. Nesses casos a consulta deve ir à tabela
+fato (como faz camada_semantica.consultar).
+
+Exemplo:
+    consultar_cubo(['ano'], {'grande_area': 'Ciências Exatas e da Terra'})
+    consultar_cubo(['tipo_producao'], {'ano': [2020, 2021, 2022]})
+"""
+
+from itertools import combinations
+
+from db_utils import run_query
+
+DIMENSOES = ('grande_area', 'area', 'ano', 'tipo_producao')
+
+# Agrupamentos materializados: hierarquia de área x CUBE(ano, tipo_producao)
+AGRUPAMENTOS = [
+    nivel_area + outras
+    for nivel_area in ((), ('grande_area',), ('grande_area', 'area'))
+    for n in range(3)
+    for outras in combinations(('ano', 'tipo_producao'), n)
+]
+
+
+def agrupamento_mais_proximo(dimensoes):
+    """
+    Menor agrupamento materializado que contém as dimensões informadas.
+
+    Args:
+        dimensoes (iterable): Dimensões necessárias (agrupadas ou filtradas)
+
+    Returns:
+        tuple: Dimensões do agrupamento, na ordem de DIMENSOES
+
+    Raises:
+        ValueError: Se alguma dimensão não existir no cubo
+    """
+    dimensoes = set(dimensoes)
+    desconhecidas = dimensoes - set(DIMENSOES)
+    if desconhecidas:
+        raise ValueError(f"Dimensões fora do cubo: {', '.join(sorted(desconhecidas))}")
+    candidatos = [a for a in AGRUPAMENTOS if dimensoes <= set(a)]
+    return min(candidatos, key=len)
+
+
+def consultar_cubo(agrupar_por=(), filtros=None):
+    """
+    Consulta uma fatia do cubo de produções.
+
+    Args:
+        agrupar_por (list): Dimensões do resultado (ex: ['ano', 'tipo_producao'])
+        filtros (dict, optional): {dimensão: valor ou lista de valores}
+
+    Returns:
+        DataFrame: Dimensões pedidas, qtd_producoes e qtd_pesquisadores.
+            qtd_pesquisadores só é devolvido quando o valor pré-calculado é
+            exato (nenhuma soma entre células); caso contrário vem vazio,
+            pois pesquisadores distintos não podem ser somados.
+
+    Raises:
+        ValueError: Dimensão fora do cubo, vários valores de grande_area/
+            area filtrados sem estarem em `agrupar_por`, ou area usada sem
+            grande_area agrupada ou filtrada por um único valor
+    """
+    filtros = filtros or {}
+    agrupar_por = [d for d in DIMENSOES if d in set(agrupar_por)]
+    if ('area' in agrupar_por or 'area' in filtros) and 'grande_area' not in agrupar_por:
+        grande_area = filtros.get('grande_area')
+        if grande_area is None:
+            grande_area = []
+        elif not isinstance(grande_area, (list, tuple, set)):
+            grande_area = [grande_area]
+        if len(grande_area) != 1:
+            raise ValueError(
+                "area exige grande_area em agrupar_por ou filtrada por um único valor: "
+                "o mesmo rótulo de área aparece em várias grandes áreas"
+            )
+    agrupamento = agrupamento_mais_proximo(set(agrupar_por) | set(filtros))
+
+    condicoes = ["agrupamento = %(agrupamento)s"]
+    params = {'agrupamento': ','.join(agrupamento)}
+    exato = True
+    for dimensao, valor in filtros.items():
+        valores = list(valor) if isinstance(valor, (list, tuple, set)) else [valor]
+        if dimensao == 'ano':
+            valores = [int(v) for v in valores]
+        condicoes.append(f"{dimensao} = ANY(%({dimensao})s)")
+        params[dimensao] = valores
+        # Vários valores de uma dimensão que não está no resultado são somados
+        if len(valores) > 1 and dimensao not in agrupar_por:
+            if dimensao in ('grande_area', 'area'):
+                raise ValueError(
+                    f"Vários valores de {dimensao} só podem ser filtrados com {dimensao} em "
+                    "agrupar_por: as áreas se sobrepõem e a soma contaria produções repetidas"
+                )
+            exato = False
+    # Dimensões do agrupamento que não foram pedidas nem filtradas também são somadas
+    if set(agrupamento) - set(agrupar_por) - set(filtros):
+        exato = False
+
+    colunas = ', '.join(agrupar_por)
+    if exato:
+        query = f"""
+        SELECT {colunas + ',' if colunas else ''}
+          qtd_producoes,
+          qtd_pesquisadores
+        FROM dw.cubo_producoes
+        WHERE {' AND '.join(condicoes)}
+        {'ORDER BY ' + colunas if colunas else ''};
+        """
+    else:
+        query = f"""
+        SELECT {colunas + ',' if colunas else ''}
+          SUM(qtd_producoes) AS qtd_producoes,
+          NULL::INT AS qtd_pesquisadores
+        FROM dw.cubo_producoes
+        WHERE {' AND '.join(condicoes)}
+        {'GROUP BY ' + colunas if colunas else ''}
+        {'ORDER BY ' + colunas if colunas else ''};
+        """
+    return run_query(query, params)
@@ -43,25 +43,101 @@ def test_connection():
     except Exception:
         return False
 
-def run_query(query):
+def run_query(query, params=None):
     """
     Executa uma query e retorna os resultados como DataFrame do pandas.
     Útil para queries que retornam múltiplas linhas.
+    Valores informados pelo usuário devem ir em params (%(nome)s na query).
     """
     conn = get_connection()
-    df = pd.read_sql_query(query, conn)
+    df = pd.read_sql_query(query, conn, params=params)
     conn.close()
     return df
 
-def get_metric_value(query):
+def get_metric_value(query, params=None):
     """
     Executa uma query e retorna um único valor (primeira linha, primeira coluna).
     Útil para queries de agregação (COUNT, SUM, AVG, etc.).
     """
     conn = get_connection()
     cur = conn.cursor()
-    cur.execute(query)
+    cur.execute(query, params)
     result = cur.fetchone()
     cur.close()
     conn.close()
     return result[0]
+
+def buscar_producoes(termo, pagina=1, por_pagina=20, tipos=None, ano_inicio=None, ano_fim=None):
+    """
+    Busca produções pelo título (e periódico/livro/evento) na view
+    stg.busca_producoes (ver sql_criar_tabelas/criar_busca_producoes.sql).
+
+    Combina a busca textual em português (com stemming, sem acentos e com
+    a sintaxe de buscadores: "frase exata", -excluir, OR) com a semelhança
+    de trigramas, que encontra termos parciais ou digitados com erro.
+    As duas condições usam índices GIN, sem varrer as tabelas.
+
+    Args:
+        termo (str): Texto buscado
+        pagina (int): Página de resultados, a partir de 1
+        por_pagina (int): Resultados por página
+        tipos (list, optional): Tipos de produção (ex: ['Artigo', 'Livro'])
+        ano_inicio (int, optional): Primeiro ano
+        ano_fim (int, optional): Último ano
+
+    Returns:
+        tuple: (DataFrame da página ordenado por relevância, total de resultados)
+    """
+    filtros = []
+    params = {
+        'termo': termo,
+        'limite': por_pagina,
+        'deslocamento': (max(pagina, 1) - 1) * por_pagina,
+    }
+    if tipos:
+        filtros.append("AND b.tipo_producao = ANY(%(tipos)s)")
+        params['tipos'] = list(tipos)
+    if ano_inicio is not None:
+        filtros.append("AND b.ano >= %(ano_inicio)s")
+        params['ano_inicio'] = str(int(ano_inicio))
+    if ano_fim is not None:
+        filtros.append("AND b.ano <= %(ano_fim)s")
+        params['ano_fim'] = str(int(ano_fim))
+
+    # Termo repetido em cada condição (e não numa CTE) para que o planejador
+    # o trate como constante e use os índices de cada tabela da view
+    query = f"""
+    WITH resultados AS (
+      SELECT
+        b.tipo_producao,
+        b.titulo,
+        b.veiculo,
+        b.ano,
+        b.id_lattes,
+        ts_rank_cd(b.busca, websearch_to_tsquery('public.pt_unaccent', %(termo)s), 32)
+          + word_similarity(stg.f_unaccent(%(termo)s), b.titulo_busca) AS relevancia
+      FROM stg.busca_producoes b
+      WHERE (
+          b.busca @@ websearch_to_tsquery('public.pt_unaccent', %(termo)s)
+          OR stg.f_unaccent(%(termo)s) <%% b.titulo_busca
+        )
+        {' '.join(filtros)}
+    )
+    SELECT
+      r.tipo_producao,
+      r.titulo,
+      r.veiculo,
+      r.ano,
+      dp.nome AS pesquisador,
+      r.relevancia,
+      COUNT(*) OVER () AS total
+    FROM resultados r
+    LEFT JOIN dw.dim_pesquisador dp
+      ON dp.id_lattes = r.id_lattes
+     AND dp.atual
+    ORDER BY r.relevancia DESC, r.ano DESC NULLS LAST
+    LIMIT %(limite)s OFFSET %(deslocamento)s;
+    """
+    df = run_query(query, params)
+    total = int(df['total'].iloc[0]) if not df.empty else 0
+    return df.drop(columns=['total']), total
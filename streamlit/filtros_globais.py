@@ -0,0 +1,324 @@
+"""
+Filtros globais dos dashboards (barra lateral).
+
+Os filtros (intervalo de anos, grande área, tipo de produção e
+pesquisador) ficam em st.session_state e valem para todas as páginas.
+Cada página chama render_filtros_globais() e, para cada consulta,
+compila os filtros em predicados parametrizados com compilar_filtros(),
+informando qual coluna representa cada dimensão naquela subconsulta.
+Assim o filtro é aplicado dentro da CTE/subconsulta certa, antes das
+agregações, e o banco só lê as linhas necessárias. Filtros que uma seção
+não consegue aplicar são informados nela com avisar_filtros_ignorados().
+
+Exemplo:
+    filtros = render_filtros_globais()
+    filtro_sql, params = compilar_filtros(filtros, {
+        'ano': 'f.id_tempo',
+        'tipo_producao': 'dtp.tipo_producao',
+        'id_pesquisador': 'f.id_pesquisador',
+    })
+    query = f'''
+    SELECT f.id_tempo AS ano, SUM(f.qtd_producoes)
+    FROM dw.fato_pesquisador_producoes f
+    JOIN dw.dim_tipo_producao dtp ON dtp.id_tipo_producao = f.id_tipo_producao
+    WHERE TRUE {filtro_sql}
+    GROUP BY f.id_tempo
+    '''
+    df = run_query(query, params)
+"""
+
+import streamlit as st
+
+from db_utils import run_query
+
+CHAVE_ESTADO = 'filtros_globais'
+CHAVE_OPCOES = 'filtros_globais_opcoes'
+
+ROTULOS = {
+    'ano': 'Anos',
+    'grande_area': 'Grande área',
+    'tipo_producao': 'Tipo de produção',
+    'pesquisador': 'Pesquisador',
+}
+
+
+def _carregar_opcoes():
+    """Opções dos filtros, lidas uma vez por sessão."""
+    if CHAVE_OPCOES not in st.session_state:
+        # dw.dim_tempo cobre todo o intervalo configurado; o slider vai
+        # só dos anos com produção (MIN/MAX pelo índice de id_tempo)
+        anos = run_query("""
+            SELECT MIN(id_tempo) AS ano_min, MAX(id_tempo) AS ano_max
+            FROM dw.fato_pesquisador_producoes;
+        """)
+        areas = run_query("""
+            SELECT DISTINCT grande_area
+            FROM dw.dim_area
+            WHERE grande_area IS NOT NULL AND TRIM(grande_area) <> ''
+            ORDER BY grande_area;
+        """)
+        tipos = run_query("SELECT tipo_producao FROM dw.dim_tipo_producao ORDER BY tipo_producao;")
+        pesquisadores = run_query("SELECT id_pesquisador, nome FROM dw.dim_pesquisador WHERE atual ORDER BY nome;")
+        st.session_state[CHAVE_OPCOES] = {
+            'ano': (int(anos['ano_min'].iloc[0]), int(anos['ano_max'].iloc[0])),
+            'grande_area': areas['grande_area'].tolist(),
+            'tipo_producao': tipos['tipo_producao'].tolist(),
+            'pesquisador': dict(zip(pesquisadores['id_pesquisador'].astype(int), pesquisadores['nome'])),
+        }
+    return st.session_state[CHAVE_OPCOES]
+
+
+def obter_filtros():
+    """
+    Filtros globais atuais.
+
+    Returns:
+        dict: {'ano': (início, fim) ou None, 'grande_area': [...],
+               'tipo_producao': [...], 'pesquisador': [id_pesquisador, ...]}.
+               Valores vazios (None ou lista vazia) não filtram.
+    """
+    if CHAVE_ESTADO not in st.session_state:
+        st.session_state[CHAVE_ESTADO] = {
+            'ano': None,
+            'grande_area': [],
+            'tipo_producao': [],
+            'pesquisador': [],
+        }
+    return st.session_state[CHAVE_ESTADO]
+
+
+def _guardar(nome):
+    # Os widgets perdem o estado ao trocar de página; o valor fica guardado fora deles
+    valor = st.session_state[f'_filtro_global_{nome}']
+    if nome == 'ano':
+        ano_min, ano_max = _carregar_opcoes()['ano']
+        valor = None if tuple(valor) == (ano_min, ano_max) else tuple(valor)
+    obter_filtros()[nome] = valor
+
+
+def _limpar():
+    st.session_state.pop(CHAVE_ESTADO, None)
+
+
+def render_filtros_globais():
+    """
+    Desenha os filtros globais na barra lateral.
+
+    Returns:
+        dict: Filtros atuais (ver obter_filtros)
+    """
+    filtros = obter_filtros()
+    try:
+        opcoes = _carregar_opcoes()
+    except Exception as e:
+        st.sidebar.error(f"❌ Erro ao carregar filtros: {e}")
+        return filtros
+
+    ano_min, ano_max = opcoes['ano']
+    for nome, valor in (
+        ('ano', filtros['ano'] or (ano_min, ano_max)),
+        ('grande_area', filtros['grande_area']),
+        ('tipo_producao', filtros['tipo_producao']),
+        ('pesquisador', filtros['pesquisador']),
+    ):
+        st.session_state[f'_filtro_global_{nome}'] = valor
+
+    with st.sidebar:
+        st.markdown("### 🔍 Filtros globais")
+        st.caption("Valem para todas as páginas")
+        st.slider(
+            ROTULOS['ano'],
+            min_value=ano_min,
+            max_value=ano_max,
+            step=1,
+            key='_filtro_global_ano',
+            on_change=_guardar,
+            args=('ano',)
+        )
+        st.multiselect(
+            ROTULOS['grande_area'],
+            options=opcoes['grande_area'],
+            key='_filtro_global_grande_area',
+            on_change=_guardar,
+            args=('grande_area',)
+        )
+        st.multiselect(
+            ROTULOS['tipo_producao'],
+            options=opcoes['tipo_producao'],
+            key='_filtro_global_tipo_producao',
+            on_change=_guardar,
+            args=('tipo_producao',)
+        )
+        st.multiselect(
+            ROTULOS['pesquisador'],
+            options=list(opcoes['pesquisador']),
+            format_func=lambda id_pesquisador: opcoes['pesquisador'].get(id_pesquisador, str(id_pesquisador)),
+            key='_filtro_global_pesquisador',
+            on_change=_guardar,
+            args=('pesquisador',)
+        )
+        st.button("Limpar filtros", on_click=_limpar)
+
+    return obter_filtros()
+
+
+def filtros_ativos(filtros, dimensoes=None):
+    """
+    Nomes dos filtros com valor (opcionalmente só entre `dimensoes`).
+    """
+    return [
+        nome for nome, valor in filtros.items()
+        if valor and (dimensoes is None or nome in dimensoes)
+    ]
+
+
+def compilar_filtros(filtros, colunas):
+    """
+    Compila os filtros globais em predicados SQL parametrizados.
+
+    Args:
+        filtros (dict): Filtros (ver obter_filtros)
+        colunas (dict): Expressão SQL de cada dimensão disponível na
+            subconsulta: 'ano', 'tipo_producao', 'grande_area' e/ou
+            'id_pesquisador'. Dimensões ausentes são filtradas pelo
+            pesquisador, com EXISTS sobre id_pesquisador: grande área pelas
+            áreas de atuação, anos e tipos pelas produções (pesquisadores
+            com produção no período/tipo). Sem id_pesquisador, filtros de
+            dimensões ausentes são ignorados (ver filtros_ignorados).
+
+    Returns:
+        tuple: (trecho SQL começando com ' AND ' ou vazio, dict de parâmetros)
+    """
+    return sql_filtros(filtros_ativos(filtros), colunas), params_filtros(filtros)
+
+
+def filtros_ignorados(filtros, *colunas):
+    """
+    Filtros ativos que nenhuma das subconsultas consegue aplicar.
+
+    Args:
+        filtros (dict): Filtros (ver obter_filtros)
+        *colunas (dict): Colunas passadas a compilar_filtros em cada
+            subconsulta da mesma seção
+
+    Returns:
+        list: Nomes dos filtros ignorados
+    """
+    def aplicavel(nome, colunas):
+        # Com id_pesquisador, dimensões ausentes viram EXISTS (ver sql_filtros)
+        return 'id_pesquisador' in colunas or nome in colunas
+
+    return [
+        nome for nome in filtros_ativos(filtros)
+        if not any(aplicavel(nome, c) for c in colunas)
+    ]
+
+
+def avisar_filtros_ignorados(filtros, ignorados):
+    """
+    Avisa, na seção, quais filtros globais ativos não valem para ela.
+
+    Args:
+        filtros (dict): Filtros (ver obter_filtros)
+        ignorados (iterable): Nomes dos filtros não aplicados (ex: o
+            resultado de filtros_ignorados, ou filtros que a seção
+            substitui por controles próprios)
+    """
+    descricao = descrever_filtros(filtros, set(ignorados))
+    if descricao:
+        st.caption(f"⚠️ Filtros globais não aplicados nesta seção: {descricao}")
+
+
+def sql_filtros(ativos, colunas):
+    """
+    Predicados SQL dos filtros ativos (ver compilar_filtros).
+
+    Depende só de quais filtros estão ativos, não dos valores, e por isso
+    pode ser guardado junto com a consulta compilada.
+
+    Args:
+        ativos (iterable): Nomes dos filtros com valor (ver filtros_ativos)
+        colunas (dict): Expressão SQL de cada dimensão na subconsulta
+
+    Returns:
+        str: Trecho SQL começando com ' AND ' ou vazio
+    """
+    ativos = set(ativos)
+    predicados = []
+
+    if 'ano' in ativos and 'ano' in colunas:
+        predicados.append(f"{colunas['ano']} BETWEEN %(filtro_ano_inicio)s AND %(filtro_ano_fim)s")
+    if 'tipo_producao' in ativos and 'tipo_producao' in colunas:
+        predicados.append(f"{colunas['tipo_producao']} = ANY(%(filtro_tipo_producao)s)")
+
+    # Anos/tipos sem coluna própria na consulta: pesquisadores com produção no recorte
+    producao = []
+    if 'ano' in ativos and 'ano' not in colunas:
+        producao.append("filtro_f.id_tempo BETWEEN %(filtro_ano_inicio)s AND %(filtro_ano_fim)s")
+    if 'tipo_producao' in ativos and 'tipo_producao' not in colunas:
+        producao.append("filtro_dtp.tipo_producao = ANY(%(filtro_tipo_producao)s)")
+    if producao and 'id_pesquisador' in colunas:
+        condicoes_producao = '\n        AND '.join(producao)
+        predicados.append(f"""EXISTS (
+      SELECT 1
+      FROM dw.fato_pesquisador_producoes filtro_f
+      JOIN dw.dim_tipo_producao filtro_dtp ON filtro_dtp.id_tipo_producao = filtro_f.id_tipo_producao
+      WHERE filtro_f.id_pesquisador = {colunas['id_pesquisador']}
+        AND {condicoes_producao}
+    )""")
+
+    if 'grande_area' in ativos:
+        if 'grande_area' in colunas:
+            predicados.append(f"{colunas['grande_area']} = ANY(%(filtro_grande_area)s)")
+        elif 'id_pesquisador' in colunas:
+            predicados.append(f"""EXISTS (
+      SELECT 1
+      FROM dw.fato_pesquisador_area_atuacao filtro_fpa
+      JOIN dw.dim_area filtro_da ON filtro_da.id_area = filtro_fpa.id_area
+      WHERE filtro_fpa.id_pesquisador = {colunas['id_pesquisador']}
+        AND filtro_da.grande_area = ANY(%(filtro_grande_area)s)
+    )""")
+
+    if 'pesquisador' in ativos and 'id_pesquisador' in colunas:
+        predicados.append(f"{colunas['id_pesquisador']} = ANY(%(filtro_pesquisador)s)")
+
+    return ''.join(f"\n  AND {predicado}" for predicado in predicados)
+
+
+def params_filtros(filtros):
+    """
+    Parâmetros dos predicados gerados por sql_filtros.
+
+    Args:
+        filtros (dict): Filtros (ver obter_filtros)
+
+    Returns:
+        dict: Valores dos filtros ativos, pelo nome do parâmetro
+    """
+    params = {}
+    if filtros.get('ano'):
+        params['filtro_ano_inicio'], params['filtro_ano_fim'] = (int(a) for a in filtros['ano'])
+    if filtros.get('tipo_producao'):
+        params['filtro_tipo_producao'] = list(filtros['tipo_producao'])
+    if filtros.get('grande_area'):
+        params['filtro_grande_area'] = list(filtros['grande_area'])
+    if filtros.get('pesquisador'):
+        params['filtro_pesquisador'] = [int(p) for p in filtros['pesquisador']]
+    return params
+
+
+def descrever_filtros(filtros, dimensoes=None):
+    """
+    Texto curto com os filtros ativos, para exibir acima dos gráficos.
+    """
+    partes = []
+    for nome in filtros_ativos(filtros, dimensoes):
+        valor = filtros[nome]
+        if nome == 'ano':
+            partes.append(f"{ROTULOS[nome]}: {valor[0]}–{valor[1]}")
+        elif nome == 'pesquisador':
+            nomes = _carregar_opcoes()['pesquisador']
+            partes.append(f"{ROTULOS[nome]}: {', '.join(nomes.get(p, str(p)) for p in valor)}")
+        else:
+            partes.append(f"{ROTULOS[nome]}: {', '.join(valor)}")
+    return ' · '.join(partes)
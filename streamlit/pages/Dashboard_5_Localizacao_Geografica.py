@@ -13,6 +13,7 @@ from PIL import Image
 
 sys.path.append(str(Path(__file__).parent.parent))
 from db_utils import run_query
+from filtros_globais import render_filtros_globais, compilar_filtros, descrever_filtros, avisar_filtros_ignorados
 from ufes_theme import (
     load_css, 
     render_footer,
@@ -29,6 +30,7 @@ st.set_page_config(
 )
 
 load_css()
+filtros = render_filtros_globais()
 
 try:
     logo_path = Path(__file__).parent.parent / "logo_ufes.png"
@@ -43,21 +45,37 @@ except Exception as e:
     st.title("Localização Geográfica")
     st.markdown("**Análises sobre localização geográfica das produções científicas**")
 
+if descrever_filtros(filtros):
+    st.info(f"🔍 Filtros aplicados: {descrever_filtros(filtros)}")
+
 st.markdown("---")
 
+COLUNAS_FILTRO = {
+    'ano': 'f.id_tempo',
+    'tipo_producao': 'dtp.tipo_producao',
+    'id_pesquisador': 'f.id_pesquisador',
+}
+
+
+def intervalo_padrao(ano_min, ano_max, padrao):
+    """Intervalo inicial dos sliders da página: o filtro global de anos, se houver."""
+    if filtros['ano']:
+        inicio = min(max(filtros['ano'][0], ano_min), ano_max)
+        fim = max(min(filtros['ano'][1], ano_max), inicio)
+        return (inicio, fim)
+    return padrao
+
 # PERGUNTA 14: Apresentações de Trabalho na UFES
 st.header("14. Apresentações de Trabalho na UFES")
 st.markdown("*Quantas apresentações de trabalho ocorreram na UFES ao longo dos anos?*")
 
 query_anos = """
-SELECT DISTINCT dt.ano
+SELECT DISTINCT f.id_tempo AS ano
 FROM dw.fato_pesquisador_producao_localizacao f
-JOIN dw.dim_tempo dt
-  ON dt.id_tempo = f.id_tempo
 JOIN dw.dim_tipo_producao dtp
   ON dtp.id_tipo_producao = f.id_tipo_producao
 WHERE dtp.tipo_producao = 'Apresentação de Trabalho'
-ORDER BY dt.ano;
+ORDER BY ano;
 """
 
 try:
@@ -75,32 +93,46 @@ try:
                 "Selecione o intervalo de anos",
                 min_value=min(anos_disponiveis),
                 max_value=max(anos_disponiveis),
-                value=(min(anos_disponiveis), max(anos_disponiveis)),
+                value=intervalo_padrao(
+                    min(anos_disponiveis),
+                    max(anos_disponiveis),
+                    (min(anos_disponiveis), max(anos_disponiveis))
+                ),
                 step=1,
             )
         
+        # Tipo fixo (apresentações) e anos do slider da página: só o recorte por pesquisador é global
+        filtro_ufes_sql, params_ufes = compilar_filtros(
+            {**filtros, 'ano': None, 'tipo_producao': []},
+            COLUNAS_FILTRO
+        )
+        avisar_filtros_ignorados(filtros, ['ano', 'tipo_producao'])
+        params_ufes.update({
+            'termo_busca': f"%{termo_busca}%",
+            'ano_ini': int(ano_ini),
+            'ano_fim': int(ano_fim),
+        })
+        
         query_ufes = f"""
         SELECT
-          dt.ano,
+          f.id_tempo AS ano,
           SUM(f.qtd_producoes) AS total_apresentacoes
         FROM dw.fato_pesquisador_producao_localizacao f
-        JOIN dw.dim_tempo dt
-          ON dt.id_tempo = f.id_tempo
         JOIN dw.dim_tipo_producao dtp
           ON dtp.id_tipo_producao = f.id_tipo_producao
         JOIN dw.dim_localizacao_trabalhos dlt
           ON dlt.id_localizacao_trabalhos = f.id_localizacao_trabalhos
         WHERE dtp.tipo_producao = 'Apresentação de Trabalho'
           AND (
-            dlt.instituicao ILIKE '%{termo_busca}%' OR
-            dlt.instituicao ILIKE '%Universidade Federal do Espírito Santo%'
+            dlt.instituicao ILIKE %(termo_busca)s OR
+            dlt.instituicao ILIKE '%%Universidade Federal do Espírito Santo%%'
           )
-          AND dt.ano BETWEEN {int(ano_ini)} AND {int(ano_fim)}
-        GROUP BY dt.ano
-        ORDER BY dt.ano;
+          AND f.id_tempo BETWEEN %(ano_ini)s AND %(ano_fim)s {filtro_ufes_sql}
+        GROUP BY f.id_tempo
+        ORDER BY ano;
         """
         
-        df_ufes = run_query(query_ufes)
+        df_ufes = run_query(query_ufes, params_ufes)
         
         if not df_ufes.empty:
             total_geral = int(df_ufes["total_apresentacoes"].sum())
@@ -151,31 +183,36 @@ st.markdown("---")
 st.header("15. Pesquisadores com Mais Produções Internacionais")
 st.markdown("*Ranking de pesquisadores por volume de trabalhos em eventos e apresentações fora do Brasil*")
 
-query_internacional = """
+filtro_sql, params = compilar_filtros(filtros, COLUNAS_FILTRO)
+
+query_internacional = f"""
 SELECT
   dp.nome,
   SUM(f.qtd_producoes) AS total_internacional
 FROM dw.fato_pesquisador_producao_localizacao f
-JOIN dw.dim_pesquisador dp ON dp.id_pesquisador = f.id_pesquisador
+JOIN dw.dim_pesquisador dp ON dp.id_pesquisador = f.id_pesquisador AND dp.atual
 JOIN dw.dim_localizacao_trabalhos dlt ON dlt.id_localizacao_trabalhos = f.id_localizacao_trabalhos
-WHERE dlt.pais IS NOT NULL
-  AND dlt.pais <> 'Brasil'
+JOIN dw.dim_tipo_producao dtp ON dtp.id_tipo_producao = f.id_tipo_producao
+WHERE dlt.pais NOT IN ('Brasil', 'Não se aplica.') {filtro_sql}
 GROUP BY dp.nome
 ORDER BY total_internacional DESC;
 """
 
 try:
-    df_int = run_query(query_internacional)
+    df_int = run_query(query_internacional, params)
     
     if len(df_int) > 0:
         max_pesquisadores = len(df_int)
-        top_n = st.slider(
-            "Top pesquisadores (ranking)",
-            min_value=5,
-            max_value=min(50, max_pesquisadores),
-            value=20,
-            step=5
-        )
+        if max_pesquisadores > 5:
+            top_n = st.slider(
+                "Top pesquisadores (ranking)",
+                min_value=5,
+                max_value=min(50, max_pesquisadores),
+                value=min(20, max_pesquisadores),
+                step=5
+            )
+        else:
+            top_n = max_pesquisadores
         
         df_top = df_int.head(top_n)
         
@@ -246,11 +283,9 @@ st.header("16. Brasil vs Internacional (Anual)")
 st.markdown("*Comparação do total anual de produções no Brasil vs fora do Brasil*")
 
 query_anos_geral = """
-SELECT DISTINCT dt.ano
+SELECT DISTINCT f.id_tempo AS ano
 FROM dw.fato_pesquisador_producao_localizacao f
-JOIN dw.dim_tempo dt
-  ON dt.id_tempo = f.id_tempo
-ORDER BY dt.ano;
+ORDER BY ano;
 """
 
 try:
@@ -264,24 +299,34 @@ try:
             "Filtro de anos",
             min_value=ano_min,
             max_value=ano_max,
-            value=(max(ano_min, 2010), ano_max) if ano_max >= 2010 else (ano_min, ano_max),
+            value=intervalo_padrao(
+                ano_min,
+                ano_max,
+                (max(ano_min, 2010), ano_max) if ano_max >= 2010 else (ano_min, ano_max)
+            ),
             step=1,
         )
         
+        # Anos vêm do slider da página (iniciado com o filtro global)
+        filtro_brasil_sql, params_brasil = compilar_filtros({**filtros, 'ano': None}, COLUNAS_FILTRO)
+        avisar_filtros_ignorados(filtros, ['ano'])
+        params_brasil.update({'ano_ini': int(ano_ini), 'ano_fim': int(ano_fim)})
+        
         query_brasil_int = f"""
         SELECT
-          dt.ano,
+          f.id_tempo AS ano,
           CASE WHEN dlt.pais = 'Brasil' THEN 'Brasil' ELSE 'Internacional' END AS origem,
           SUM(f.qtd_producoes) AS total
         FROM dw.fato_pesquisador_producao_localizacao f
-        JOIN dw.dim_tempo dt ON dt.id_tempo = f.id_tempo
         JOIN dw.dim_localizacao_trabalhos dlt ON dlt.id_localizacao_trabalhos = f.id_localizacao_trabalhos
-        WHERE dt.ano BETWEEN {int(ano_ini)} AND {int(ano_fim)}
-        GROUP BY dt.ano, origem
-        ORDER BY dt.ano, origem;
+        JOIN dw.dim_tipo_producao dtp ON dtp.id_tipo_producao = f.id_tipo_producao
+        WHERE f.id_tempo BETWEEN %(ano_ini)s AND %(ano_fim)s
+          AND dlt.pais <> 'Não se aplica.' {filtro_brasil_sql}
+        GROUP BY f.id_tempo, origem
+        ORDER BY f.id_tempo, origem;
         """
         
-        df_brasil_int = run_query(query_brasil_int)
+        df_brasil_int = run_query(query_brasil_int, params_brasil)
         
         if not df_brasil_int.empty:
             total_geral = int(df_brasil_int["total"].sum())
@@ -0,0 +1,313 @@
+"""
+Dashboard 6: Rede de Coautoria
+Análises sobre quais pesquisadores da UFES publicam juntos
+
+As métricas de rede (grau, componentes, intermediação) são pré-calculadas
+pelo pipeline em dw.metricas_coautoria_pesquisador; esta página só lê as
+tabelas prontas.
+"""
+
+import math
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import sys
+from pathlib import Path
+from PIL import Image
+
+sys.path.append(str(Path(__file__).parent.parent))
+from db_utils import run_query
+from ufes_theme import (
+    load_css,
+    render_footer,
+    apply_plotly_theme,
+    get_plotly_config,
+    CHART_COLORS,
+    UFES_COLORS
+)
+
+st.set_page_config(
+    page_title="Rede de Coautoria - UFES",
+    page_icon="🤝",
+    layout="wide"
+)
+
+load_css()
+
+try:
+    logo_path = Path(__file__).parent.parent / "logo_ufes.png"
+    logo = Image.open(logo_path)
+    col_logo, col_title = st.columns([1, 4])
+    with col_logo:
+        st.image(logo, width=120)
+    with col_title:
+        st.title("Rede de Coautoria")
+        st.markdown("**Análises sobre colaboração entre pesquisadores da UFES**")
+except Exception as e:
+    st.title("Rede de Coautoria")
+    st.markdown("**Análises sobre colaboração entre pesquisadores da UFES**")
+
+st.markdown("---")
+
+# PERGUNTA 17: Visão geral da rede
+st.header("17. Rede de Coautoria")
+st.markdown("*Quais pesquisadores mais colaboram entre si?*")
+
+query_resumo = """
+SELECT
+  COUNT(*) FILTER (WHERE grau > 0) AS pesquisadores_conectados,
+  COUNT(*) FILTER (WHERE grau = 0) AS pesquisadores_isolados,
+  COUNT(DISTINCT id_componente) FILTER (WHERE grau > 0) AS componentes,
+  COALESCE(MAX(tamanho_componente) FILTER (WHERE grau > 0), 0) AS maior_componente
+FROM dw.metricas_coautoria_pesquisador;
+"""
+
+try:
+    df_resumo = run_query(query_resumo)
+    resumo = df_resumo.iloc[0]
+
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("Pesquisadores com Coautores", f"{int(resumo['pesquisadores_conectados']):,}")
+    k2.metric("Pesquisadores Isolados", f"{int(resumo['pesquisadores_isolados']):,}")
+    k3.metric("Grupos de Colaboração", f"{int(resumo['componentes']):,}")
+    k4.metric("Maior Grupo", f"{int(resumo['maior_componente']):,}")
+
+    st.markdown("---")
+
+    top_n = st.slider(
+        "Pesquisadores exibidos na rede (maior número de coautores)",
+        min_value=10,
+        max_value=100,
+        value=40,
+        step=10
+    )
+
+    query_nos = f"""
+    SELECT
+      m.id_pesquisador,
+      dp.nome,
+      m.grau,
+      m.grau_ponderado,
+      m.intermediacao
+    FROM dw.metricas_coautoria_pesquisador m
+    JOIN dw.dim_pesquisador dp
+      ON dp.id_pesquisador = m.id_pesquisador
+     AND dp.atual
+    WHERE m.grau > 0
+    ORDER BY m.grau DESC, m.grau_ponderado DESC
+    LIMIT {int(top_n)};
+    """
+
+    df_nos = run_query(query_nos)
+
+    if not df_nos.empty:
+        ids = ", ".join(str(int(x)) for x in df_nos["id_pesquisador"])
+        query_arestas = f"""
+        SELECT
+          id_pesquisador_a,
+          id_pesquisador_b,
+          SUM(qtd_producoes) AS total
+        FROM dw.fato_coautoria
+        WHERE id_pesquisador_a IN ({ids})
+          AND id_pesquisador_b IN ({ids})
+        GROUP BY id_pesquisador_a, id_pesquisador_b;
+        """
+        df_arestas = run_query(query_arestas)
+
+        # Layout circular: os mais conectados ficam lado a lado no topo
+        posicoes = {
+            int(id_pesq): (math.cos(2 * math.pi * i / len(df_nos)), math.sin(2 * math.pi * i / len(df_nos)))
+            for i, id_pesq in enumerate(df_nos["id_pesquisador"])
+        }
+
+        fig1 = go.Figure()
+        peso_max = df_arestas["total"].max() if not df_arestas.empty else 1
+        for _, aresta in df_arestas.iterrows():
+            x0, y0 = posicoes[int(aresta["id_pesquisador_a"])]
+            x1, y1 = posicoes[int(aresta["id_pesquisador_b"])]
+            fig1.add_trace(go.Scatter(
+                x=[x0, x1],
+                y=[y0, y1],
+                mode='lines',
+                line=dict(width=1 + 4 * aresta["total"] / peso_max, color='rgba(120, 120, 120, 0.4)'),
+                hoverinfo='skip',
+                showlegend=False
+            ))
+
+        fig1.add_trace(go.Scatter(
+            x=[posicoes[int(x)][0] for x in df_nos["id_pesquisador"]],
+            y=[posicoes[int(x)][1] for x in df_nos["id_pesquisador"]],
+            mode='markers',
+            marker=dict(
+                size=10 + 30 * df_nos["grau"] / df_nos["grau"].max(),
+                color=df_nos["intermediacao"],
+                colorscale='Blues',
+                showscale=True,
+                colorbar=dict(title='Intermediação'),
+                line=dict(width=1, color='white')
+            ),
+            text=df_nos["nome"],
+            customdata=df_nos[["grau", "grau_ponderado"]],
+            hovertemplate='<b>%{text}</b><br>Coautores: %{customdata[0]}<br>Produções em coautoria: %{customdata[1]}<extra></extra>',
+            showlegend=False
+        ))
+
+        fig1 = apply_plotly_theme(fig1)
+        fig1.update_layout(
+            title='Rede de Coautoria (tamanho: nº de coautores; cor: intermediação)',
+            height=650,
+            xaxis=dict(visible=False),
+            yaxis=dict(visible=False, scaleanchor='x')
+        )
+
+        st.plotly_chart(fig1, use_container_width=True, config=get_plotly_config())
+    else:
+        st.warning("⚠️ Nenhuma coautoria entre pesquisadores encontrada.")
+
+except Exception as e:
+    st.error(f"❌ Erro ao carregar dados: {e}")
+
+st.markdown("---")
+
+# PERGUNTA 18: Pesquisadores centrais
+st.header("18. Pesquisadores Centrais na Rede")
+st.markdown("*Quem conecta grupos de pesquisa diferentes?*")
+
+query_centrais = """
+SELECT
+  dp.nome,
+  m.grau AS coautores,
+  m.grau_ponderado AS producoes_coautoria,
+  m.intermediacao,
+  m.tamanho_componente
+FROM dw.metricas_coautoria_pesquisador m
+JOIN dw.dim_pesquisador dp
+  ON dp.id_pesquisador = m.id_pesquisador
+ AND dp.atual
+WHERE m.grau > 0
+ORDER BY m.intermediacao DESC
+LIMIT 20;
+"""
+
+try:
+    df_centrais = run_query(query_centrais)
+
+    if not df_centrais.empty:
+        fig2 = px.bar(
+            df_centrais,
+            x='intermediacao',
+            y='nome',
+            orientation='h',
+            title='Top 20 Pesquisadores por Intermediação',
+            labels={
+                'intermediacao': 'Intermediação (betweenness)',
+                'nome': 'Pesquisador'
+            },
+            hover_data=['coautores', 'producoes_coautoria', 'tamanho_componente'],
+            color_discrete_sequence=[UFES_COLORS['primary_blue']]
+        )
+
+        fig2 = apply_plotly_theme(fig2)
+        fig2.update_layout(height=600, yaxis={'categoryorder': 'total ascending'})
+
+        st.plotly_chart(fig2, use_container_width=True, config=get_plotly_config())
+
+        with st.expander("📋 Ver tabela"):
+            st.dataframe(df_centrais, use_container_width=True, hide_index=True)
+    else:
+        st.warning("⚠️ Nenhum dado encontrado.")
+
+except Exception as e:
+    st.error(f"❌ Erro ao carregar dados: {e}")
+
+st.markdown("---")
+
+# PERGUNTA 19: Pares de coautores
+st.header("19. Pares de Coautores Mais Frequentes")
+st.markdown("*Quais duplas de pesquisadores mais publicam juntas, por tipo de produção e período?*")
+
+query_filtros = """
+SELECT DISTINCT f.id_tempo AS ano, dtp.tipo_producao
+FROM dw.fato_coautoria f
+JOIN dw.dim_tipo_producao dtp
+  ON dtp.id_tipo_producao = f.id_tipo_producao;
+"""
+
+try:
+    df_filtros = run_query(query_filtros)
+
+    if not df_filtros.empty:
+        anos_disponiveis = sorted(int(x) for x in df_filtros["ano"].unique())
+        tipos_disponiveis = sorted(df_filtros["tipo_producao"].unique())
+
+        col_f1, col_f2 = st.columns([1, 2])
+
+        with col_f1:
+            tipos = st.multiselect("Tipos de produção", tipos_disponiveis, default=tipos_disponiveis)
+
+        with col_f2:
+            ano_ini, ano_fim = st.slider(
+                "Selecione o intervalo de anos",
+                min_value=min(anos_disponiveis),
+                max_value=max(anos_disponiveis),
+                value=(min(anos_disponiveis), max(anos_disponiveis)),
+                step=1,
+            )
+
+        if tipos:
+            lista_tipos = ", ".join("'" + t.replace("'", "''") + "'" for t in tipos)
+            query_pares = f"""
+            SELECT
+              dpa.nome || ' & ' || dpb.nome AS par,
+              SUM(f.qtd_producoes) AS total
+            FROM dw.fato_coautoria f
+            JOIN dw.dim_pesquisador dpa
+              ON dpa.id_pesquisador = f.id_pesquisador_a
+             AND dpa.atual
+            JOIN dw.dim_pesquisador dpb
+              ON dpb.id_pesquisador = f.id_pesquisador_b
+             AND dpb.atual
+            JOIN dw.dim_tipo_producao dtp
+              ON dtp.id_tipo_producao = f.id_tipo_producao
+            WHERE dtp.tipo_producao IN ({lista_tipos})
+              AND f.id_tempo BETWEEN {int(ano_ini)} AND {int(ano_fim)}
+            GROUP BY dpa.nome, dpb.nome
+            ORDER BY total DESC
+            LIMIT 20;
+            """
+
+            df_pares = run_query(query_pares)
+
+            if not df_pares.empty:
+                fig3 = px.bar(
+                    df_pares,
+                    x='total',
+                    y='par',
+                    orientation='h',
+                    title='Top 20 Pares de Coautores',
+                    labels={
+                        'total': 'Produções em Coautoria',
+                        'par': 'Pesquisadores'
+                    },
+                    color_discrete_sequence=[CHART_COLORS[1]]
+                )
+
+                fig3 = apply_plotly_theme(fig3)
+                fig3.update_layout(height=600, yaxis={'categoryorder': 'total ascending'})
+
+                st.plotly_chart(fig3, use_container_width=True, config=get_plotly_config())
+            else:
+                st.warning("⚠️ Nenhum dado encontrado para os filtros selecionados.")
+        else:
+            st.info("Selecione ao menos um tipo de produção.")
+    else:
+        st.error("❌ Não foram encontradas coautorias.")
+
+except Exception as e:
+    st.error(f"❌ Erro ao carregar dados: {e}")
+
+st.markdown("---")
+
+# FOOTER UFES
+render_footer()
@@ -0,0 +1,149 @@
+"""
+Dashboard 7: Busca de Produções
+Busca por tema ou título nas produções científicas dos pesquisadores
+"""
+
+import math
+import streamlit as st
+import pandas as pd
+import sys
+from pathlib import Path
+from PIL import Image
+
+sys.path.append(str(Path(__file__).parent.parent))
+from db_utils import buscar_producoes, run_query
+from ufes_theme import (
+    load_css,
+    render_footer
+)
+
+st.set_page_config(
+    page_title="Busca de Produções - UFES",
+    page_icon="🔎",
+    layout="wide"
+)
+
+load_css()
+
+try:
+    logo_path = Path(__file__).parent.parent / "logo_ufes.png"
+    logo = Image.open(logo_path)
+    col_logo, col_title = st.columns([1, 4])
+    with col_logo:
+        st.image(logo, width=120)
+    with col_title:
+        st.title("Busca de Produções")
+        st.markdown("**Encontre produções científicas por tema ou título**")
+except Exception as e:
+    st.title("Busca de Produções")
+    st.markdown("**Encontre produções científicas por tema ou título**")
+
+st.markdown("---")
+
+# PERGUNTA 20: Busca por tema
+st.header("20. Quais produções tratam de um tema?")
+st.markdown('*Use aspas para frases exatas ("aprendizado de máquina") e "-" para excluir termos*')
+
+TIPOS_PRODUCAO = [
+    'Artigo',
+    'Livro',
+    'Capítulo de Livro',
+    'Texto em Jornal',
+    'Trabalho em Evento',
+    'Apresentação de Trabalho',
+    'Outras Produções',
+]
+POR_PAGINA = 20
+
+# Anos com produção (dw.dim_tempo cobre todo o intervalo configurado)
+query_anos = """
+SELECT MIN(id_tempo) AS ano_min, MAX(id_tempo) AS ano_max
+FROM dw.fato_pesquisador_producoes;
+"""
+
+try:
+    df_anos = run_query(query_anos)
+    ano_min = int(df_anos['ano_min'].iloc[0])
+    ano_max = int(df_anos['ano_max'].iloc[0])
+
+    termo = st.text_input("Termo de busca", placeholder="ex: energia solar, covid-19, \"redes neurais\"")
+
+    col_f1, col_f2 = st.columns([2, 1])
+    with col_f1:
+        tipos = st.multiselect("Tipos de produção", TIPOS_PRODUCAO, default=TIPOS_PRODUCAO)
+    with col_f2:
+        ano_ini, ano_fim = st.slider(
+            "Intervalo de anos",
+            min_value=ano_min,
+            max_value=ano_max,
+            value=(ano_min, ano_max),
+            step=1,
+        )
+
+    # Volta para a primeira página sempre que a busca muda
+    chave_busca = (termo, tuple(tipos), ano_ini, ano_fim)
+    if st.session_state.get('busca_atual') != chave_busca:
+        st.session_state['busca_atual'] = chave_busca
+        st.session_state['busca_pagina'] = 1
+
+    if termo.strip() and tipos:
+        pagina = st.session_state['busca_pagina']
+        df_resultados, total = buscar_producoes(
+            termo.strip(),
+            pagina=pagina,
+            por_pagina=POR_PAGINA,
+            tipos=tipos,
+            # Intervalo completo não filtra: mantém produções sem ano de 4 dígitos
+            ano_inicio=ano_ini if ano_ini > ano_min else None,
+            ano_fim=ano_fim if ano_fim < ano_max else None
+        )
+
+        if total:
+            total_paginas = math.ceil(total / POR_PAGINA)
+            st.markdown(f"**{total:,} produções encontradas** — página {pagina} de {total_paginas}")
+
+            df_exibir = df_resultados.rename(columns={
+                'tipo_producao': 'Tipo',
+                'titulo': 'Título',
+                'veiculo': 'Periódico / Livro / Evento',
+                'ano': 'Ano',
+                'pesquisador': 'Pesquisador',
+                'relevancia': 'Relevância'
+            })
+            st.dataframe(
+                df_exibir,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'Relevância': st.column_config.ProgressColumn(
+                        'Relevância',
+                        min_value=0.0,
+                        max_value=float(max(df_resultados['relevancia'].max(), 1.0)),
+                        format="%.2f"
+                    )
+                }
+            )
+
+            col_ant, col_pag, col_prox = st.columns([1, 2, 1])
+            with col_ant:
+                if st.button("⬅️ Anterior", disabled=pagina <= 1):
+                    st.session_state['busca_pagina'] = pagina - 1
+                    st.rerun()
+            with col_prox:
+                if st.button("Próxima ➡️", disabled=pagina >= total_paginas):
+                    st.session_state['busca_pagina'] = pagina + 1
+                    st.rerun()
+        else:
+            st.warning("⚠️ Nenhuma produção encontrada para os filtros selecionados.")
+    elif not tipos:
+        st.info("Selecione ao menos um tipo de produção.")
+    else:
+        st.info("Digite um termo para buscar nos títulos das produções.")
+
+except Exception as e:
+    st.error(f"❌ Erro ao buscar produções: {e}")
+
+st.markdown("---")
+
+# FOOTER UFES
+render_footer()
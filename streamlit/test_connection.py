@@ -97,7 +97,8 @@ if st.button("🔄 Testar Conexão", type="primary"):
             try:
                 cursor.execute("""
                     SELECT COUNT(*) as total_pesquisadores
-                    FROM dw.dim_pesquisador;
+                    FROM dw.dim_pesquisador
+                    WHERE atual;
                 """)
                 total = cursor.fetchone()[0]
                 st.metric("Total de Pesquisadores", f"{total:,}")